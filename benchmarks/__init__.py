@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks
+    ==========
+
+    Benchmarks for printing device graphs, on synthetic graphs.
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from ._events import EventFeed
+
+from ._extract import ExtractionBenchmark
+
+from ._format import FormatBenchmark
+
+from ._generate import DAGGenerator
+from ._generate import StackConfig
+
+from ._incremental import IncrementalBenchmark
+
+from ._measure import Measure
+from ._measure import Measurement
+from ._measure import TraversalPhases
+
+from ._parallel import ParallelBenchmark
+
+from ._stream import StreamingBenchmark
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks.__main__
+    ===================
+
+    Run the benchmarks and print a table of results.
+
+    Run from the top directory, e.g.,
+    PYTHONPATH=src python -m benchmarks --sizes 100 1000 10000
+
+    .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import sys
+
+from collections import defaultdict
+
+import printdevDAG
+
+from ._generate import DAGGenerator
+from ._extract import ExtractionBenchmark
+from ._format import FormatBenchmark
+from ._incremental import IncrementalBenchmark
+from ._generate import StackConfig
+from ._measure import TraversalPhases
+from ._parallel import ParallelBenchmark
+from ._stream import StreamingBenchmark
+
+_HEADERS = [
+   'SUITE',
+   'TRAVERSAL',
+   'PHASE',
+   'NODES',
+   'EDGES',
+   'SECONDS',
+   'PEAK_KiB',
+   'LINES',
+   'LINES/SEC'
+]
+
+_SUITES = [
+   'phases',
+   'extraction',
+   'streaming',
+   'formatting',
+   'parallel',
+   'incremental'
+]
+
+def get_parser():
+    """
+    Generate an appropriate parser.
+
+    :returns: an argument parser
+    :rtype: `ArgumentParser`
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+       "--suite",
+       choices=_SUITES,
+       default=_SUITES[:1],
+       help="the benchmark suites to run",
+       nargs="+"
+    )
+    parser.add_argument(
+       "--sizes",
+       default=[100, 1000, 10000],
+       help="approximate number of nodes in each graph",
+       nargs="+",
+       type=int
+    )
+    parser.add_argument(
+       "--traversal",
+       choices=TraversalPhases.TRAVERSALS,
+       default=TraversalPhases.TRAVERSALS,
+       help="the traversals to measure",
+       nargs="+"
+    )
+    parser.add_argument(
+       "--paths",
+       default=4,
+       help="number of paths to each multipathed LUN",
+       type=int
+    )
+    parser.add_argument(
+       "--luns",
+       default=4,
+       help="number of LUNs in each MD RAID device",
+       type=int
+    )
+    parser.add_argument(
+       "--seed",
+       default=0,
+       help="seed for the graph generator",
+       type=int
+    )
+    parser.add_argument(
+       "--no-memory",
+       action="store_true",
+       help="do not measure peak memory"
+    )
+    return parser
+
+def measurements(suite, graph, args):
+    """
+    Run a suite of benchmarks on a graph.
+
+    :param str suite: the suite
+    :param `DiGraph` graph: the graph
+    :param `Namespace` args: the command line arguments
+
+    :returns: the measurements, with the traversal they belong to
+    :rtype: list of tuple of str * Measurement
+    """
+    memory = not args.no_memory
+    if suite == 'phases':
+        phases = TraversalPhases(graph, memory=memory)
+        return [
+           (t, m) for t in args.traversal for m in phases.measure(t)
+        ]
+    if suite == 'extraction':
+        benchmark = ExtractionBenchmark(graph, memory=memory)
+        return [('-', m) for m in benchmark.measure()]
+    if suite == 'streaming':
+        benchmark = StreamingBenchmark(graph, memory=memory)
+        return [('depth_first', m) for m in benchmark.measure()]
+    if suite == 'formatting':
+        benchmark = FormatBenchmark(graph, memory=memory)
+        return [('depth_first', m) for m in benchmark.measure()]
+    if suite == 'parallel':
+        benchmark = ParallelBenchmark(graph, memory=memory)
+        return [('-', m) for m in benchmark.measure()]
+    if suite == 'incremental':
+        benchmark = IncrementalBenchmark(graph, memory=memory)
+        return [('depth_first', m) for m in benchmark.measure()]
+    assert False
+
+def main():
+    """
+    Run benchmarks.
+    """
+    args = get_parser().parse_args()
+
+    results = []
+    for size in args.sizes:
+        graph = DAGGenerator(
+           seed=args.seed,
+           config=StackConfig(luns=args.luns, paths=args.paths)
+        ).graph(size)
+        for suite in args.suite:
+            for (traversal, measurement) in measurements(suite, graph, args):
+                results.append({
+                   'SUITE' : suite,
+                   'NODES' : str(len(graph)),
+                   'EDGES' : str(graph.number_of_edges()),
+                   'TRAVERSAL' : traversal,
+                   'PHASE' : measurement.name,
+                   'SECONDS' : "%.4f" % measurement.seconds,
+                   'PEAK_KiB' : "-" if measurement.peak is None else \
+                      str(measurement.peak // 1024),
+                   'LINES' : str(measurement.lines),
+                   'LINES/SEC' : "%.0f" % measurement.lines_per_second
+                })
+
+    alignment = defaultdict(lambda: '>')
+    alignment['SUITE'] = '<'
+    alignment['TRAVERSAL'] = '<'
+    alignment['PHASE'] = '<'
+    for line in printdevDAG.Print.lines(_HEADERS, results, 2, alignment):
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
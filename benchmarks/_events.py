@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._events
+    ==================
+
+    A synthetic feed of changes to a device graph.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import copy
+import random
+
+import pydevDAG
+
+import printdevDAG
+
+
+class EventFeed(object):
+    """
+    Generates plausible changes to a graph generated by DAGGenerator:
+    devices resized, partitions added to and removed from disks, and
+    edges added and removed.
+
+    The feed keeps its own copy of the graph, to which events() applies
+    every event it generates, so that every event is valid after the ones
+    before. The methods for each kind of change just return the events.
+    """
+
+    ACTIONS = ['change', 'add', 'remove', 'add-edge', 'remove-edge']
+
+    def __init__(self, graph, seed=0):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph, which is not modified
+        :param int seed: seed for random choices
+        """
+        self.graph = graph.copy()
+        self._random = random.Random(seed)
+        self._added = 0
+
+    def _devices(self, pred=lambda n: True):
+        """
+        Device nodes which satisfy ``pred``, in a deterministic order.
+
+        :param pred: a predicate on nodes
+        :type pred: `Node` -> bool
+        :rtype: list of `Node`
+        """
+        return sorted(
+           n for n in self.graph if \
+              self.graph.node[n].get('nodetype') == \
+                 pydevDAG.NodeTypes.DEVICE_PATH and pred(n)
+        )
+
+    def change(self):
+        """
+        Resize a device.
+        """
+        node = self._random.choice(self._devices())
+        attrs = copy.deepcopy(self.graph.node[node])
+        attrs['SYSFS']['size'] = str(self._random.randrange(2 ** 40))
+        return [printdevDAG.GraphEvent.change_node(node, attrs)]
+
+    def add(self):
+        """
+        Add a partition to a disk.
+        """
+        disk = self._random.choice(
+           self._devices(lambda n: self.graph.node[n]['UDEV']['DEVTYPE'] == \
+              'disk')
+        )
+        attrs = copy.deepcopy(self.graph.node[disk])
+        self._added += 1
+        name = "%sp%d" % (attrs['SYSNAME'], 100 + self._added)
+        node = "%s/%s" % (disk, name)
+        attrs['identifier'] = node
+        attrs['SYSNAME'] = name
+        attrs['UDEV'].update({
+           'DEVNAME' : "/dev/%s" % name,
+           'DEVPATH' : node,
+           'DEVTYPE' : 'partition',
+           'DM_NAME' : None,
+           'DM_UUID' : None
+        })
+        attrs['SYSFS']['size'] = str(self._random.randrange(2 ** 20))
+        return [
+           printdevDAG.GraphEvent.add_node(node, attrs),
+           printdevDAG.GraphEvent.add_edge(disk, node)
+        ]
+
+    def remove(self):
+        """
+        Remove a device with nothing on top of it.
+        """
+        leaves = self._devices(lambda n: not self.graph.succ[n])
+        return [printdevDAG.GraphEvent.remove_node(self._random.choice(leaves))]
+
+    def add_edge(self):
+        """
+        Add an edge from a root to a device, which can not make a cycle.
+        """
+        roots = sorted(n for n in self.graph if not self.graph.pred[n])
+        root = self._random.choice(roots)
+        devices = self._devices(lambda n: n not in self.graph.succ[root])
+        target = self._random.choice(devices)
+        if target == root:
+            return []
+        return [printdevDAG.GraphEvent.add_edge(root, target)]
+
+    def remove_edge(self):
+        """
+        Remove an edge to a device with more than one parent.
+        """
+        targets = self._devices(lambda n: len(self.graph.pred[n]) > 1)
+        if not targets:
+            return []
+        target = self._random.choice(targets)
+        source = self._random.choice(sorted(self.graph.pred[target]))
+        return [printdevDAG.GraphEvent.remove_edge(source, target)]
+
+    def events(self, count):
+        """
+        Generate events.
+
+        :param int count: the number of changes
+        :returns: the events, at least one for every change
+        :rtype: generator of GraphEvent
+        """
+        methods = {
+           'change' : self.change,
+           'add' : self.add,
+           'remove' : self.remove,
+           'add-edge' : self.add_edge,
+           'remove-edge' : self.remove_edge
+        }
+        for _ in range(count):
+            action = self._random.choice(self.ACTIONS)
+            for event in methods[action]():
+                event.apply(self.graph)
+                yield event
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._extract
+    ===================
+
+    Microbenchmark of extracting rows for the columns of PrintGraph.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import functools
+
+import printdevDAG
+
+from printdevDAG._utils import GeneralUtils
+
+from ._measure import Measure
+
+
+class ExtractionBenchmark(object):
+    """
+    Compare ways of extracting a row for every node.
+
+    The ways are:
+    * reduce - the original composition of getters with functools.reduce,
+      with a default lambda for every column and a generator-built dict
+    * extractor - a single compiled extractor for all columns
+    * info - GraphLineInfo.info, with caching disabled
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, graph, keys=None, memory=False):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param keys: the columns, if None, all of PrintGraph's columns
+        :type keys: list of str or NoneType
+        :param bool memory: whether to measure peak memory
+        """
+        self.graph = graph
+        self.keys = printdevDAG.PrintGraph.KEYS if keys is None else keys
+        self.memory = memory
+
+        getters = printdevDAG.PrintGraph.getters()
+        self.funcs = dict(
+           (k, [g.getter for g in getters[k]]) for k in self.keys
+        )
+
+    @staticmethod
+    def _reduce_composer(funcs):
+        """
+        The original composer, which calls reduce over every function.
+
+        :param funcs: the functions
+        :type funcs: list of (* -> (str or NoneType))
+        """
+        return lambda node: functools.reduce(
+           lambda v, f: v if v is not None else f(node),
+           funcs,
+           None
+        )
+
+    def _reduce(self):
+        """
+        Extract rows in the original way.
+
+        :returns: the rows
+        :rtype: list of dict
+        """
+        funcs = dict(
+           (k, self._reduce_composer(self.funcs[k])) for k in self.keys
+        )
+        def conv(_, value):
+            """
+            Convert a value to str.
+            """
+            return str(value)
+
+        return [
+           dict(
+              (k, conv(k, funcs.get(k, lambda n: None)(self.graph.node[n]))) \
+                 for k in self.keys
+           ) for n in self.graph
+        ]
+
+    def _extractor(self):
+        """
+        Extract rows with a compiled extractor.
+
+        :returns: the rows
+        :rtype: list of dict
+        """
+        extract = GeneralUtils.extractor(self.keys, self.funcs)
+        rows = []
+        for node in self.graph:
+            row = extract(self.graph.node[node])
+            rows.append(dict((k, str(v)) for (k, v) in row.items()))
+        return rows
+
+    def _info(self):
+        """
+        Extract rows with GraphLineInfo.info, without caching.
+
+        :returns: the rows
+        :rtype: list of dict
+        """
+        line_info = printdevDAG.GraphLineInfo(
+           self.graph,
+           self.keys,
+           dict(),
+           printdevDAG.PrintGraph.getters(),
+           cache_size=0
+        )
+        def conv(_, value):
+            """
+            Convert a value to str.
+            """
+            return str(value)
+
+        return [line_info.info(n, conv=conv) for n in self.graph]
+
+    def measure(self):
+        """
+        Measure every way of extracting rows.
+
+        :returns: a measurement for each way
+        :rtype: list of Measurement
+        """
+        return [
+           Measure.measure(name, func, len, self.memory)[1] for \
+              (name, func) in [
+                 ('reduce', self._reduce),
+                 ('extractor', self._extractor),
+                 ('info', self._info)
+              ]
+        ]
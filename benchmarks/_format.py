@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._format
+    ==================
+
+    Compare ways of formatting rows.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import printdevDAG
+
+from ._measure import Measure
+
+
+class FormatBenchmark(object):
+    """
+    Compare ways of formatting the rows of depth first output.
+
+    The ways are:
+    * format_str - str.format with named fields, from a dict for every row
+    * row_format_str - str.format with positional fields
+    * compiled - a RowFormatter, compiled for the layout
+
+    The rows are calculated in advance, so only formatting is measured.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, graph, memory=False):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param bool memory: whether to measure peak memory
+        """
+        self.memory = memory
+
+        line_info = printdevDAG.PrintGraph.line_info(graph)
+        self.keys = line_info.keys
+        self.alignment = line_info.alignment
+        self.rows = list(
+           printdevDAG.GraphXformLines.rows(
+              self.keys,
+              printdevDAG.GraphLineArrangements.node_strings_from_graph(
+                 printdevDAG.GraphLineArrangementsConfig(
+                    line_info.info,
+                    lambda k, v: str(v),
+                    'NAME'
+                 ),
+                 graph
+              )
+           )
+        )
+        self.dicts = [dict(zip(self.keys, r)) for r in self.rows]
+        self.widths = printdevDAG.Print.calculate_widths(
+           self.keys,
+           self.dicts,
+           2
+        )
+
+    def _format_str(self):
+        """
+        Format rows with named fields.
+
+        :rtype: list of str
+        """
+        fmt_str = printdevDAG.Print.format_str(
+           self.widths,
+           self.keys,
+           self.alignment
+        )
+        return [fmt_str.format(**row) for row in self.dicts]
+
+    def _row_format_str(self):
+        """
+        Format rows with positional fields.
+
+        :rtype: list of str
+        """
+        fmt_str = printdevDAG.Print.row_format_str(
+           self.widths,
+           self.keys,
+           self.alignment
+        )
+        return [fmt_str.format(*row) for row in self.rows]
+
+    def _compiled(self):
+        """
+        Format rows with a compiled formatter.
+
+        :rtype: list of str
+        """
+        format_row = printdevDAG.RowFormatter.get(
+           self.keys,
+           self.widths,
+           self.alignment
+        ).format_row
+        return [format_row(row) for row in self.rows]
+
+    def measure(self):
+        """
+        Measure every way of formatting rows.
+
+        :returns: a measurement for each way
+        :rtype: list of Measurement
+        """
+        return [
+           Measure.measure(name, func, len, self.memory)[1] for \
+              (name, func) in [
+                 ('format_str', self._format_str),
+                 ('row_format_str', self._row_format_str),
+                 ('compiled', self._compiled)
+              ]
+        ]
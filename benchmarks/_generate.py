@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._generate
+    ====================
+
+    Generate synthetic device graphs shaped like pydevDAG's decorated graphs.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import random
+import string
+
+import networkx as nx
+
+import pydevDAG
+
+
+class StackConfig(object):
+    """
+    The shape of a single synthetic storage stack.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, luns=4, paths=4, linear_lvs=3, thin_lvs=4):
+        """
+        Initializer.
+
+        :param int luns: number of multipathed LUNs, RAIDed together
+        :param int paths: number of paths to every LUN
+        :param int linear_lvs: number of linear LVs in the volume group
+        :param int thin_lvs: number of thin LVs in the thin pool
+        """
+        self.luns = luns
+        self.paths = paths
+        self.linear_lvs = linear_lvs
+        self.thin_lvs = thin_lvs
+
+    @property
+    def size(self):
+        """
+        The number of nodes in a single stack.
+
+        :returns: the number of nodes
+        :rtype: int
+
+        Each LUN contributes a drive, its paths, a multipath device and a
+        partition on it; the partitions are the members of an MD RAID
+        device, which holds a LUKS device, which is the PV for a volume
+        group. The thin pool consists of tmeta, tdata, tpool and pool LVs.
+        A local disk with two partitions completes the stack.
+        """
+        return self.luns * (self.paths + 3) + 2 + self.linear_lvs + \
+           4 + self.thin_lvs + 4
+
+
+class DAGGenerator(object):
+    """
+    Generates graphs of multipath, MD RAID, LVM-on-LUKS and thin pool
+    stacks.
+
+    The edges are in the direction that lsdev prints by default, from
+    drives to the devices stacked on top of them.
+    """
+
+    _SECTOR_COUNTS = [
+       2097152,
+       20971520,
+       209715200,
+       1953525168,
+       4294967296,
+       7814037168
+    ]
+
+    # major numbers
+    _SD_MAJOR = 8
+    _MD_MAJOR = 9
+    _DM_MAJOR = 253
+
+    def __init__(self, seed=0, config=None):
+        """
+        Initializer.
+
+        :param int seed: seed for random choices
+        :param config: the shape of each stack
+        :type config: StackConfig or NoneType
+        """
+        self._random = random.Random(seed)
+        self._config = config if config is not None else StackConfig()
+
+        self._sd_index = 0
+        self._dm_index = 0
+        self._md_index = 0
+        self._host = 0
+
+    def _hex(self, length):
+        """
+        Random hex str.
+
+        :param int length: the length of the str
+        :rtype: str
+        """
+        return "".join(
+           self._random.choice(string.hexdigits[:16]) for _ in range(length)
+        )
+
+    def _lvm_id(self):
+        """
+        Random LVM style uuid, without dashes.
+
+        :rtype: str
+        """
+        chars = string.ascii_letters + string.digits
+        return "".join(self._random.choice(chars) for _ in range(32))
+
+    @staticmethod
+    def _sd_name(index):
+        """
+        The sd name for an index, e.g., 0 -> sda, 26 -> sdaa.
+
+        :param int index: the index
+        :rtype: str
+        """
+        letters = ""
+        index += 1
+        while index > 0:
+            (index, rem) = divmod(index - 1, 26)
+            letters = string.ascii_lowercase[rem] + letters
+        return "sd" + letters
+
+    @staticmethod
+    def _add_device( # pylint: disable=too-many-arguments
+       graph,
+       identifier,
+       name,
+       devno,
+       devtype,
+       sectors,
+       udev=None
+    ):
+        """
+        Add a block device node to the graph.
+
+        :param `DiGraph` graph: the graph
+        :param str identifier: the sysfs device path
+        :param str name: the sysname
+        :param tuple devno: major and minor numbers
+        :param str devtype: the udev DEVTYPE
+        :param int sectors: the size in sectors
+        :param udev: additional udev properties
+        :type udev: dict of str * str or NoneType
+
+        :returns: the node
+        :rtype: str
+        """
+        properties = {
+           'DEVNAME' : "/dev/%s" % name,
+           'DEVPATH' : identifier,
+           'DEVTYPE' : devtype,
+           'DM_NAME' : None,
+           'DM_UUID' : None,
+           'ID_PATH' : None,
+           'ID_SAS_PATH' : None,
+           'SUBSYSTEM' : 'block'
+        }
+        properties.update(udev or dict())
+        graph.add_node(
+           identifier,
+           nodetype=pydevDAG.NodeTypes.DEVICE_PATH,
+           identifier=identifier,
+           DEVNO=os.makedev(*devno),
+           SYSNAME=name,
+           UDEV=properties,
+           SYSFS={'size' : str(sectors)}
+        )
+        return identifier
+
+    def _add_dm(self, graph, dm_name, dm_uuid, sectors):
+        """
+        Add a device-mapper device to the graph.
+
+        :param `DiGraph` graph: the graph
+        :param str dm_name: the DM_NAME
+        :param str dm_uuid: the DM_UUID
+        :param int sectors: the size in sectors
+
+        :returns: the node
+        :rtype: str
+        """
+        index = self._dm_index
+        self._dm_index += 1
+        name = "dm-%d" % index
+        return self._add_device(
+           graph,
+           "/devices/virtual/block/%s" % name,
+           name,
+           (self._DM_MAJOR, index),
+           'disk',
+           sectors,
+           {'DM_NAME' : dm_name, 'DM_UUID' : dm_uuid}
+        )
+
+    def _add_drive(self, graph, sectors, paths):
+        """
+        Add a drive and the paths to it.
+
+        :param `DiGraph` graph: the graph
+        :param int sectors: the size of the drive
+        :param int paths: the number of paths
+
+        :returns: the WWN and the path nodes
+        :rtype: tuple of str * (list of str)
+        """
+        wwn = "0x%s" % self._hex(16)
+        graph.add_node(
+           wwn,
+           nodetype=pydevDAG.NodeTypes.WWN,
+           identifier=wwn
+        )
+
+        nodes = []
+        for path in range(paths):
+            index = self._sd_index
+            self._sd_index += 1
+            name = self._sd_name(index)
+            id_path = "pci-0000:%02x:00.%d-fc-0x%s-lun-%d" % \
+               (self._host % 256, path % 8, self._hex(16), index % 256)
+            node = self._add_device(
+               graph,
+               "/devices/pci0000:00/0000:%02x:00.%d/host%d/rport-%d:0-%d/"
+               "target%d:0:0/%d:0:0:%d/block/%s" % (
+                  self._host % 256,
+                  path % 8,
+                  self._host,
+                  self._host,
+                  path,
+                  self._host,
+                  self._host,
+                  index,
+                  name
+               ),
+               name,
+               (self._SD_MAJOR, (index * 16) % 256),
+               'disk',
+               sectors,
+               {'ID_PATH' : id_path}
+            )
+            graph.add_edge(wwn, node)
+            nodes.append(node)
+        return (wwn, nodes)
+
+    def _add_local_disk(self, graph):
+        """
+        Add a single path local disk with two partitions.
+
+        :param `DiGraph` graph: the graph
+        """
+        sectors = self._random.choice(self._SECTOR_COUNTS)
+        (_, [disk]) = self._add_drive(graph, sectors, 1)
+        name = graph.node[disk]['SYSNAME']
+        devno = graph.node[disk]['DEVNO']
+        (major, minor) = (os.major(devno), os.minor(devno))
+        for number in (1, 2):
+            part_name = "%s%d" % (name, number)
+            part = self._add_device(
+               graph,
+               "%s/%s" % (disk, part_name),
+               part_name,
+               (major, minor + number),
+               'partition',
+               sectors // 2 - 2048
+            )
+            graph.add_edge(disk, part)
+
+    def _add_lvm(self, graph, pv_node, sectors):
+        """
+        Add a volume group with linear LVs and a thin pool on ``pv_node``.
+
+        :param `DiGraph` graph: the graph
+        :param str pv_node: the physical volume
+        :param int sectors: the size of the physical volume
+        """
+        # pylint: disable=too-many-locals
+        config = self._config
+        vg_name = "vg%d" % self._host
+        vg_uuid = self._lvm_id()
+
+        def lvm_uuid(suffix=None):
+            """
+            A DM_UUID for an LV.
+
+            :param suffix: a suffix for LVM private devices
+            :type suffix: str or NoneType
+            """
+            uuid = "LVM-%s%s" % (vg_uuid, self._lvm_id())
+            return uuid if suffix is None else "%s-%s" % (uuid, suffix)
+
+        lv_sectors = sectors // (2 * max(config.linear_lvs, 1))
+        for index in range(config.linear_lvs):
+            lv_node = self._add_dm(
+               graph,
+               "%s-lv%d" % (vg_name, index),
+               lvm_uuid(),
+               lv_sectors
+            )
+            graph.add_edge(pv_node, lv_node)
+
+        pool_sectors = sectors // 2
+        tmeta = self._add_dm(
+           graph,
+           "%s-pool_tmeta" % vg_name,
+           lvm_uuid('tmeta'),
+           8192
+        )
+        tdata = self._add_dm(
+           graph,
+           "%s-pool_tdata" % vg_name,
+           lvm_uuid('tdata'),
+           pool_sectors
+        )
+        tpool = self._add_dm(
+           graph,
+           "%s-pool-tpool" % vg_name,
+           lvm_uuid('tpool'),
+           pool_sectors
+        )
+        pool = self._add_dm(
+           graph,
+           "%s-pool" % vg_name,
+           lvm_uuid('pool'),
+           pool_sectors
+        )
+        graph.add_edges_from([
+           (pv_node, tmeta),
+           (pv_node, tdata),
+           (tmeta, tpool),
+           (tdata, tpool),
+           (tpool, pool)
+        ])
+
+        for index in range(config.thin_lvs):
+            thin_node = self._add_dm(
+               graph,
+               "%s-thin%d" % (vg_name, index),
+               lvm_uuid(),
+               self._random.choice(self._SECTOR_COUNTS)
+            )
+            graph.add_edge(tpool, thin_node)
+
+    def add_stack(self, graph):
+        """
+        Add a single storage stack to ``graph``.
+
+        :param `DiGraph` graph: the graph
+        """
+        # pylint: disable=too-many-locals
+        config = self._config
+        sectors = self._random.choice(self._SECTOR_COUNTS)
+
+        members = []
+        for _ in range(config.luns):
+            (wwn, paths) = self._add_drive(graph, sectors, config.paths)
+            wwid = "3%s" % wwn[2:]
+            mpath = self._add_dm(
+               graph,
+               "mpath%s" % self._hex(4),
+               "mpath-%s" % wwid,
+               sectors
+            )
+            graph.add_edges_from((p, mpath) for p in paths)
+            partition = self._add_dm(
+               graph,
+               "%sp1" % graph.node[mpath]['UDEV']['DM_NAME'],
+               "part1-mpath-%s" % wwid,
+               sectors - 2048
+            )
+            graph.add_edge(mpath, partition)
+            members.append(partition)
+
+        index = self._md_index
+        self._md_index += 1
+        md_name = "md%d" % index
+        md_sectors = (sectors - 2048) * max(config.luns - 1, 1)
+        md_node = self._add_device(
+           graph,
+           "/devices/virtual/block/%s" % md_name,
+           md_name,
+           (self._MD_MAJOR, index),
+           'disk',
+           md_sectors
+        )
+        graph.add_edges_from((m, md_node) for m in members)
+
+        luks_uuid = "-".join(self._hex(n) for n in (8, 4, 4, 4, 12))
+        luks = self._add_dm(
+           graph,
+           "luks-%s" % luks_uuid,
+           "CRYPT-LUKS1-%s-luks-%s" % (luks_uuid.replace('-', ''), luks_uuid),
+           md_sectors - 4096
+        )
+        graph.add_edge(md_node, luks)
+
+        self._add_lvm(graph, luks, md_sectors - 4096)
+        self._add_local_disk(graph)
+        self._host += 1
+
+    def graph(self, size, name="graph"):
+        """
+        Generate a graph with about ``size`` nodes.
+
+        :param int size: the approximate number of nodes
+        :param str name: the name of the graph
+
+        :returns: a graph
+        :rtype: `DiGraph`
+
+        Whole stacks are added until the graph has at least ``size`` nodes.
+        """
+        graph = nx.DiGraph(name=name)
+        graph.graph['reversed'] = True
+        while len(graph) < size:
+            self.add_stack(graph)
+        return graph
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._incremental
+    =======================
+
+    Compare rendering from scratch with incremental rendering.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import printdevDAG
+
+from ._events import EventFeed
+from ._measure import Measure
+
+
+class IncrementalBenchmark(object):
+    """
+    Compare ways of rendering depth first output after each of a number of
+    bursts of events.
+
+    The ways are:
+    * full - PrintGraph.depth_first, from scratch, after every burst
+    * incremental - IncrementalRenderer.render after every burst
+    * diff - IncrementalRenderer.diff after every burst
+    """
+    # pylint: disable=too-few-public-methods
+
+    BURSTS = 10
+    BURST_SIZE = 3
+
+    def __init__(self, graph, memory=False):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param bool memory: whether to measure peak memory
+        """
+        self.graph = graph
+        self.memory = memory
+        events = list(EventFeed(graph).events(self.BURSTS * self.BURST_SIZE))
+        self.bursts = [
+           events[i:i + self.BURST_SIZE] for \
+              i in range(0, len(events), self.BURST_SIZE)
+        ]
+
+    def _full(self):
+        """
+        Render from scratch after every burst.
+
+        :returns: the number of lines rendered
+        :rtype: int
+        """
+        graph = self.graph.copy()
+        count = 0
+        for burst in self.bursts:
+            for event in burst:
+                event.apply(graph)
+            line_info = printdevDAG.PrintGraph.line_info(graph)
+            count += len(list(printdevDAG.PrintGraph.depth_first(
+               graph,
+               line_info
+            )))
+        return count
+
+    def _incremental(self, method):
+        """
+        Render incrementally after every burst.
+
+        :param str method: the IncrementalRenderer method
+        :returns: the number of lines rendered
+        :rtype: int
+
+        The first rendering is done before timing starts.
+        """
+        renderer = printdevDAG.IncrementalRenderer(self.graph.copy())
+        renderer.render()
+
+        def run():
+            """
+            Apply every burst.
+            """
+            count = 0
+            for burst in self.bursts:
+                renderer.extend(burst)
+                count += len(getattr(renderer, method)())
+            return count
+        return run
+
+    def measure(self):
+        """
+        Measure every way of rendering.
+
+        :returns: a measurement for each way
+        :rtype: list of Measurement
+        """
+        return [
+           Measure.measure(name, func, lambda n: n, False)[1] for \
+              (name, func) in [
+                 ('full', self._full),
+                 ('incremental', self._incremental('render')),
+                 ('diff', self._incremental('diff'))
+              ]
+        ]
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._measure
+    ===================
+
+    Measure time and memory of the phases of printing a graph.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+import itertools
+import timeit
+
+from collections import defaultdict
+
+try:
+    import tracemalloc
+except ImportError: # pragma: no cover
+    tracemalloc = None
+
+import pydevDAG
+
+import printdevDAG
+
+from printdevDAG._traversal import ChildOrder
+from printdevDAG._traversal import DepthFirst
+from printdevDAG._utils import GeneralUtils
+
+
+class Measurement(object):
+    """
+    The result of measuring a single phase.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, name, seconds, lines, peak=None):
+        """
+        Initializer.
+
+        :param str name: the name of the phase
+        :param float seconds: wall time
+        :param int lines: number of lines or rows processed
+        :param peak: peak memory allocated, in bytes, if measured
+        :type peak: int or NoneType
+        """
+        self.name = name
+        self.seconds = seconds
+        self.lines = lines
+        self.peak = peak
+
+    @property
+    def lines_per_second(self):
+        """
+        Throughput.
+
+        :rtype: float
+        """
+        return self.lines / self.seconds if self.seconds else float('inf')
+
+
+class Measure(object):
+    """
+    Run a function and measure it.
+    """
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def _time(func):
+        """
+        Time ``func``.
+
+        :param func: a function of no arguments
+        :returns: the result of func and the time elapsed
+        :rtype: tuple of object * float
+        """
+        gc.collect()
+        start = timeit.default_timer()
+        result = func()
+        return (result, timeit.default_timer() - start)
+
+    @staticmethod
+    def _peak(func):
+        """
+        Find the peak memory allocated while running ``func``.
+
+        :param func: a function of no arguments
+        :returns: the peak memory in bytes or None if unmeasurable
+        :rtype: int or NoneType
+        """
+        if tracemalloc is None: # pragma: no cover
+            return None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            (_, peak) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    @classmethod
+    def measure(cls, name, func, count, memory=True):
+        """
+        Measure ``func``.
+
+        :param str name: the name of the phase
+        :param func: a function of no arguments
+        :param count: calculates the number of lines from func's result
+        :type count: object -> int
+        :param bool memory: whether to measure peak memory
+
+        :returns: the result of func and the measurement
+        :rtype: tuple of object * Measurement
+
+        Memory is measured in a separate run, since tracing allocations
+        distorts the timing.
+        """
+        (result, seconds) = cls._time(func)
+        peak = cls._peak(func) if memory else None
+        return (result, Measurement(name, seconds, count(result), peak))
+
+
+class TraversalPhases(object):
+    """
+    Measure the phases of each traversal of PrintGraph.
+
+    The phases are:
+    * traversal - ordering the nodes, including calculating sort keys
+    * info - extracting the row for each node via GraphLineInfo.info
+    * widths - Print.calculate_widths on each table
+    * format - formatting the lines of each table
+    * total - the PrintGraph method for the traversal, end to end
+    """
+    # pylint: disable=too-few-public-methods
+
+    TRAVERSALS = ['depth_first', 'breadth_first', 'layers']
+
+    def __init__(self, graph, memory=True):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param bool memory: whether to measure peak memory
+        """
+        self.graph = graph
+        self.memory = memory
+        self.line_info = printdevDAG.PrintGraph.line_info(graph)
+
+    def _order(self, traversal):
+        """
+        Order the nodes, starting with no cached values, with the engine
+        that PrintGraph uses for ``traversal``.
+
+        :param str traversal: the traversal
+        :returns: the nodes in order, with their depth
+        :rtype: list of tuple of int * str * bool
+        """
+        self.line_info.invalidate()
+        key_func = self._key_func()
+        if traversal == 'depth_first':
+            nodes = DepthFirst.nodes(ChildOrder(self.graph, key_func))
+            return [(depth, node, last) for (depth, node, last, _) in nodes]
+        return list(
+           pydevDAG.BreadthFirst.nodes(self.graph, key_func=key_func)
+        )
+
+    def _rows(self, tables):
+        """
+        Extract the rows for every table, starting with no cached values.
+
+        :param tables: tables of nodes
+        :type tables: list of list of str
+        :returns: tables of rows
+        :rtype: list of list of dict of str * str
+        """
+        line_info = self.line_info
+        line_info.invalidate()
+        return [
+           [line_info.info(n, conv=lambda k, v: str(v)) for n in t] \
+              for t in tables
+        ]
+
+    def _key_func(self):
+        """
+        The sort key function used by the traversals.
+        """
+        sort_key = printdevDAG.PrintGraph.SORT_KEY
+        return GeneralUtils.str_key_func_gen(
+           lambda n: self.line_info.info(n, [sort_key])[sort_key]
+        )
+
+    def _tables(self, traversal, order):
+        """
+        Group the nodes in ``order`` into the tables printed by
+        ``traversal``.
+
+        :param str traversal: the traversal
+        :param order: the nodes in traversal order, with their depth
+        :type order: list of tuple of int * str * bool
+
+        :returns: list of tables of nodes
+        :rtype: list of list of str
+        """
+        if traversal == 'depth_first':
+            return [[n for (_, n, _) in order]]
+
+        levels = itertools.groupby(order, lambda x: x[0])
+        tables = [list(set(x[1] for x in nodes)) for (_, nodes) in levels]
+        if traversal == 'breadth_first':
+            return tables
+
+        groups = defaultdict(list)
+        for (level, nodes) in enumerate(tables):
+            for node in nodes:
+                attrs = self.graph.node[node]
+                groups[(
+                   level,
+                   printdevDAG.NodeGetters.NODETYPE.getter(attrs),
+                   printdevDAG.NodeGetters.DEVTYPE.getter(attrs),
+                   printdevDAG.NodeGetters.DMUUIDSUBSYSTEM.getter(attrs),
+                   printdevDAG.NodeGetters.MAJOR.getter(attrs)
+                )].append(node)
+        return list(groups.values())
+
+    def _total(self, traversal):
+        """
+        Run the whole traversal.
+
+        :param str traversal: the traversal
+        :returns: the lines
+        :rtype: list of str
+        """
+        line_info = printdevDAG.PrintGraph.line_info(self.graph)
+        return list(getattr(printdevDAG.PrintGraph, traversal)(
+           self.graph,
+           line_info
+        ))
+
+    def measure(self, traversal):
+        """
+        Measure all phases of ``traversal``.
+
+        :param str traversal: the traversal
+        :returns: a measurement for each phase
+        :rtype: list of Measurement
+        """
+        line_info = self.line_info
+        keys = line_info.keys
+
+        (order, traversal_m) = Measure.measure(
+           'traversal',
+           lambda: self._order(traversal),
+           len,
+           self.memory
+        )
+
+        tables = self._tables(traversal, order)
+        (rows, info_m) = Measure.measure(
+           'info',
+           lambda: self._rows(tables),
+           lambda r: sum(len(t) for t in r),
+           self.memory
+        )
+
+        (_, widths_m) = Measure.measure(
+           'widths',
+           lambda: [printdevDAG.Print.calculate_widths(keys, t, 2) \
+              for t in rows],
+           lambda _: info_m.lines,
+           self.memory
+        )
+
+        (_, format_m) = Measure.measure(
+           'format',
+           lambda: [
+              list(printdevDAG.Print.lines(keys, t, 2, line_info.alignment))\
+                 for t in rows
+           ],
+           lambda r: sum(len(t) for t in r),
+           self.memory
+        )
+
+        (_, total_m) = Measure.measure(
+           'total',
+           lambda: self._total(traversal),
+           len,
+           self.memory
+        )
+
+        return [traversal_m, info_m, widths_m, format_m, total_m]
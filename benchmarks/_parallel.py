@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._parallel
+    ====================
+
+    Compare serial and parallel extraction of rows.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import multiprocessing
+
+import printdevDAG
+
+from ._measure import Measure
+
+
+class ParallelBenchmark(object):
+    """
+    Compare extracting the values of every node in this process with
+    extracting them in a pool of processes.
+
+    Running this suite over a range of sizes shows the number of nodes at
+    which parallel extraction starts to pay off, the crossover point
+    for ParallelExtraction.THRESHOLD. The parallel way always uses at least
+    two processes, so that on a single CPU it shows only the overhead.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, graph, memory=False):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param bool memory: whether to measure peak memory
+        """
+        self.memory = memory
+        self.attrs = [graph.node[n] for n in graph]
+        self.keys = printdevDAG.PrintGraph.KEYS
+        self.getters = printdevDAG.PrintGraph.getters()
+
+    def _extract(self, extraction):
+        """
+        Extract the values of every node.
+
+        :param ParallelExtraction extraction: the engine
+        :rtype: list of dict
+        """
+        return extraction.extract(self.attrs, self.keys, self.getters)
+
+    def measure(self):
+        """
+        Measure serial and parallel extraction.
+
+        :returns: a measurement for each way
+        :rtype: list of Measurement
+        """
+        serial = printdevDAG.ParallelExtraction(workers=1)
+        parallel = printdevDAG.ParallelExtraction(
+           workers=max(2, multiprocessing.cpu_count()),
+           threshold=0
+        )
+        return [
+           Measure.measure(name, func, len, self.memory)[1] for \
+              (name, func) in [
+                 ('serial', lambda: self._extract(serial)),
+                 ('parallel', lambda: self._extract(parallel))
+              ]
+        ]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    benchmarks._stream
+    ==================
+
+    Compare ways of streaming depth first output.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import printdevDAG
+
+from ._measure import Measure
+
+
+class StreamingBenchmark(object):
+    """
+    Compare the ways Print.lines can arrange the rows of depth first output.
+
+    The ways are:
+    * held - every row is held in memory while widths are calculated
+    * spill - rows are stored in a temporary file while widths are calculated
+    * widths - rows are printed as they are found, with fixed widths
+
+    Lines are counted and discarded, so that peak memory reflects only the
+    arrangement of the rows.
+    """
+    # pylint: disable=too-few-public-methods
+
+    # maximum width of values, for the widths way
+    WIDTH = 24
+
+    def __init__(self, graph, memory=False):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param bool memory: whether to measure peak memory
+        """
+        self.graph = graph
+        self.memory = memory
+
+    def _count(self, **kwargs):
+        """
+        Count the lines of depth first output.
+
+        :param kwargs: keyword arguments for PrintGraph.depth_first
+        :returns: the number of lines
+        :rtype: int
+        """
+        line_info = printdevDAG.PrintGraph.line_info(self.graph)
+        return sum(
+           1 for _ in
+           printdevDAG.PrintGraph.depth_first(self.graph, line_info, **kwargs)
+        )
+
+    def measure(self):
+        """
+        Measure every way of arranging the rows.
+
+        :returns: a measurement for each way
+        :rtype: list of Measurement
+        """
+        widths = dict((k, self.WIDTH) for k in printdevDAG.PrintGraph.KEYS)
+        return [
+           Measure.measure(name, func, lambda n: n, self.memory)[1] for \
+              (name, func) in [
+                 ('held', self._count),
+                 ('spill', lambda: self._count(spill=True)),
+                 ('widths', lambda: self._count(widths=widths))
+              ]
+        ]
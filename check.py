@@ -13,6 +13,13 @@ arg_map = {
       "--good-names=printdevDAG,_",
       "--msg-template='{path}:{line}: [{msg_id}({symbol}), {obj}] {msg}'"
    ],
+   "benchmarks" : [
+      "--reports=no",
+      "--disable=I",
+      "--disable=bad-continuation",
+      "--disable=duplicate-code",
+      "--msg-template='{path}:{line}: [{msg_id}({symbol}), {obj}] {msg}'"
+   ],
    "tests" : [
       "--reports=no",
       "--disable=I",
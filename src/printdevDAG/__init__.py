@@ -26,12 +26,36 @@
     .. moduleauthor::  Anne Mulhern  <amulhern@redhat.com>
 """
 
+import sys
+
 from ._graph import PrintGraph
 
+from ._incremental import GraphEvent
+from ._incremental import IncrementalRenderer
+
 from ._depth import GraphLineArrangements
 from ._depth import GraphLineArrangementsConfig
 from ._depth import GraphXformLines
 
+from ._item_str import NodeGetters
+
+from ._levels import GraphLevels
+
+from ._reach import GraphReachability
+
+from ._window import DepthFirstWindow
+
 from ._print import GraphLineInfo
 
+from ._print import ParallelExtraction
 from ._print import Print
+from ._print import RecordFormat
+from ._print import RowFilter
+from ._print import RowFormatter
+from ._print import Snapshot
+from ._print import Table
+from ._print import WidthTracker
+from ._print import LineWriter
+
+if sys.version_info >= (3, 7):
+    from ._async import AsyncPrintGraph
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._async
+    ==================
+
+    Rendering graphs from asyncio code.
+
+    This module requires Python 3.7 or later, for asynchronous generators
+    and asyncio.get_running_loop().
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+import asyncio
+import functools
+import itertools
+
+from ._graph import PrintGraph
+
+
+def _take(iterator, count):
+    """
+    Take up to ``count`` items from ``iterator``.
+
+    :param iterator: the iterator
+    :param int count: the maximum number of items
+    :rtype: list
+    """
+    return list(itertools.islice(iterator, count))
+
+
+def _lines(traversal, graph, line_info, **kwargs):
+    """
+    Begin ``traversal`` of ``graph``.
+
+    :param traversal: a PrintGraph traversal
+    :param `DiGraph` graph: the graph
+    :param GraphLineInfo line_info: the line info object
+    :param kwargs: additional keyword arguments for the traversal
+
+    :returns: the lines
+    :rtype: iterator of str
+    """
+    return iter(traversal(graph, line_info, **kwargs))
+
+
+class _SharedRendering(object):
+    """
+    The batches of lines of a rendering in progress, which any number of
+    readers may read, each at its own pace.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, graph):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph being rendered
+        """
+        # hold a reference, so that the graph's id is not reused
+        self.graph = graph
+        self.batches = []
+        self.done = False
+        self.error = None
+        self._changed = asyncio.Event()
+
+        # the task rendering the graph, and the number of readers
+        self.task = None
+        self.readers = 0
+        self.cancelled = False
+
+    def _notify(self):
+        """
+        Wake every reader waiting for a change.
+        """
+        (changed, self._changed) = (self._changed, asyncio.Event())
+        changed.set()
+
+    def append(self, batch):
+        """
+        Add a batch of lines.
+
+        :param batch: the lines
+        :type batch: list of str
+        """
+        self.batches.append(batch)
+        self._notify()
+
+    def finish(self, error=None):
+        """
+        Mark the rendering complete.
+
+        :param error: the exception that ended the rendering, if any
+        :type error: Exception or NoneType
+        """
+        self.done = True
+        self.error = error
+        self._notify()
+
+    async def read(self):
+        """
+        Read every batch, waiting for batches not yet rendered.
+
+        :returns: the batches
+        :rtype: async generator of list of str
+
+        If the last reader stops reading before the rendering is complete,
+        the rendering is cancelled.
+        """
+        self.readers += 1
+        try:
+            index = 0
+            while True:
+                while index < len(self.batches):
+                    yield self.batches[index]
+                    index += 1
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._changed.wait()
+        finally:
+            self.readers -= 1
+            if self.readers == 0 and not self.done and self.task is not None:
+                self.cancelled = True
+                self.task.cancel()
+
+
+class AsyncPrintGraph(object):
+    """
+    Asynchronous counterparts of the PrintGraph traversals.
+
+    Lines are rendered in batches in an executor, so that the event loop
+    is free between batches. If an extraction engine is given, the values
+    for every node are extracted all at once in advance, also in the
+    executor.
+
+    Concurrent renderings of the same graph with the same traversal and
+    arguments by the same AsyncPrintGraph share a single rendering; each
+    reader reads its batches at its own pace, so a slow reader does not
+    hold up the others.
+    """
+
+    # number of lines in a batch
+    BATCH_SIZE = 512
+
+    def __init__(self, executor=None, extraction=None, batch_size=BATCH_SIZE):
+        """
+        Initializer.
+
+        :param executor: the executor, if None, the loop's default executor
+        :type executor: `concurrent.futures.Executor` or NoneType
+        :param extraction: an engine to extract all values in advance
+        :type extraction: ParallelExtraction or NoneType
+        :param int batch_size: number of lines in a batch
+        """
+        self.executor = executor
+        self.extraction = extraction
+        self.batch_size = batch_size
+
+        # renderings in progress, indexed by graph, traversal and arguments
+        self._renderings = dict()
+
+    async def _produce(self, key, shared, traversal, kwargs):
+        """
+        Render the graph into ``shared``.
+
+        :param key: the key of the rendering
+        :param _SharedRendering shared: the shared rendering
+        :param str traversal: the PrintGraph traversal
+        :param kwargs: additional keyword arguments for the traversal
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            line_info = await loop.run_in_executor(
+               self.executor,
+               PrintGraph.line_info,
+               shared.graph,
+               self.extraction
+            )
+            # a traversal may do much of its work before returning
+            lines = await loop.run_in_executor(
+               self.executor,
+               functools.partial(
+                  _lines,
+                  getattr(PrintGraph, traversal),
+                  shared.graph,
+                  line_info,
+                  **kwargs
+               )
+            )
+            while True:
+                batch = await loop.run_in_executor(
+                   self.executor,
+                   _take,
+                   lines,
+                   self.batch_size
+                )
+                if not batch:
+                    break
+                shared.append(batch)
+        # on Python 3.7, CancelledError is a subclass of Exception
+        except asyncio.CancelledError: # pylint: disable=try-except-raise
+            raise
+        except Exception as err: # pylint: disable=broad-except
+            shared.finish(err)
+        else:
+            shared.finish()
+        finally:
+            if self._renderings.get(key) is shared:
+                del self._renderings[key]
+
+    async def batches(self, graph, traversal, **kwargs):
+        """
+        Render ``graph``.
+
+        :param `DiGraph` graph: the graph
+        :param str traversal: the PrintGraph traversal
+        :param kwargs: additional keyword arguments for the traversal
+
+        :returns: the lines, in batches
+        :rtype: async generator of list of str
+        """
+        if traversal not in ('depth_first', 'breadth_first', 'layers'):
+            raise ValueError("unknown traversal %s" % traversal)
+
+        key = (
+           id(graph),
+           traversal,
+           tuple(sorted((k, repr(v)) for (k, v) in kwargs.items()))
+        )
+        shared = self._renderings.get(key)
+        if shared is None or shared.cancelled:
+            shared = _SharedRendering(graph)
+            self._renderings[key] = shared
+            shared.task = asyncio.ensure_future(
+               self._produce(key, shared, traversal, kwargs)
+            )
+
+        reader = shared.read()
+        try:
+            async for batch in reader:
+                yield batch
+        finally:
+            await reader.aclose()
+
+    async def lines(self, graph, traversal, **kwargs):
+        """
+        Render ``graph``.
+
+        :param `DiGraph` graph: the graph
+        :param str traversal: the PrintGraph traversal
+        :param kwargs: additional keyword arguments for the traversal
+
+        :returns: the lines
+        :rtype: async generator of str
+        """
+        async for batch in self.batches(graph, traversal, **kwargs):
+            for line in batch:
+                yield line
+
+    def depth_first(self, graph, **kwargs):
+        """
+        Yield lines for depth first output, see PrintGraph.depth_first.
+
+        :rtype: async generator of str
+        """
+        return self.lines(graph, 'depth_first', **kwargs)
+
+    def breadth_first(self, graph, **kwargs):
+        """
+        Yield lines for breadth first output, see PrintGraph.breadth_first.
+
+        :rtype: async generator of str
+        """
+        return self.lines(graph, 'breadth_first', **kwargs)
+
+    def layers(self, graph, **kwargs):
+        """
+        Yield lines for a layered view, see PrintGraph.layers.
+
+        :rtype: async generator of str
+        """
+        return self.lines(graph, 'layers', **kwargs)
+
+    async def write(self, writer, graph, traversal, **kwargs):
+        """
+        Render ``graph`` to ``writer``, a batch at a time, waiting for the
+        writer to drain after every batch.
+
+        :param `asyncio.StreamWriter` writer: the writer
+        :param `DiGraph` graph: the graph
+        :param str traversal: the PrintGraph traversal
+        :param kwargs: additional keyword arguments for the traversal
+
+        :returns: the number of lines, bytes, and writes to writer
+        :rtype: dict of str * int
+        """
+        report = {'lines' : 0, 'bytes' : 0, 'writes' : 0}
+        async for batch in self.batches(graph, traversal, **kwargs):
+            data = ("\n".join(batch) + "\n").encode('utf-8')
+            writer.write(data)
+            await writer.drain()
+            report['lines'] += len(batch)
+            report['bytes'] += len(data)
+            report['writes'] += 1
+        return report
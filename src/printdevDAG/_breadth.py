@@ -35,6 +35,8 @@ import itertools
 
 import pydevDAG
 
+from printdevDAG._levels import GraphLevels
+from printdevDAG._print import Table
 from printdevDAG._utils import GeneralUtils
 
 
@@ -44,7 +46,14 @@ class GraphLineArrangementsConfig(object):
     """
     # pylint: disable=too-few-public-methods
 
-    def __init__(self, info_func, conversion_func, sort_key):
+    def __init__( # pylint: disable=too-many-arguments
+       self,
+       info_func,
+       conversion_func,
+       sort_key,
+       levels=None,
+       node_filter=None
+    ):
         """
         Initializer.
 
@@ -53,10 +62,20 @@ class GraphLineArrangementsConfig(object):
         :param conversion_func: converts info_func values to str
         :type conversion_func: (str * object) -> str
         :param str sort_key: the key/column name to sort on
+        :param levels: level semantics, see GraphLevels, or None
+        :type levels: str or NoneType
+        :param node_filter: whether to show a node, None shows all
+        :type node_filter: (`Node` -> bool) or NoneType
+
+        If levels is None, a node is shown at the end of every path to it
+        from a root, otherwise it is shown once, at the level given by
+        GraphLevels.
         """
         self.info_func = info_func
         self.conversion_func = conversion_func
         self.sort_key = sort_key
+        self.levels = levels
+        self.node_filter = node_filter
 
 
 class GraphLineArrangements(object):
@@ -76,26 +95,34 @@ class GraphLineArrangements(object):
         :param `DiGraph` graph: the graph
 
         :returns: a table of information to be used for further display
-        :rtype: tuple of int * (list of dict of str * object)
+        :rtype: tuple of int * Table
 
+        A level with no nodes that config.node_filter accepts is omitted.
         """
-        nodes = pydevDAG.BreadthFirst.nodes(
-           graph,
-           key_func=GeneralUtils.str_key_func_gen(
-              lambda n: config.info_func(n, [config.sort_key])[config.sort_key]
-           )
+        key_func = GeneralUtils.str_key_func_gen(
+           lambda n: config.info_func(n, [config.sort_key])[config.sort_key]
         )
-
-        levels = itertools.groupby(nodes, lambda x: x[0])
-
-        for (level, level_nodes) in levels:
-            yield (
-               level,
-               [
-                  config.info_func(
-                     n,
-                     keys=None,
-                     conv=config.conversion_func
-                  ) for n in set(x[1] for x in level_nodes)
-               ]
-            )
+        if config.levels is None:
+            nodes = pydevDAG.BreadthFirst.nodes(graph, key_func=key_func)
+        else:
+            nodes = GraphLevels.nodes(graph, key_func, config.levels)
+
+        for (level, level_nodes) in itertools.groupby(nodes, lambda x: x[0]):
+            level_nodes = (x[1] for x in level_nodes)
+            if config.levels is None:
+                # a node may be reached along several paths of this length
+                level_nodes = set(level_nodes)
+            if config.node_filter is not None:
+                level_nodes = [n for n in level_nodes if config.node_filter(n)]
+
+            table = Table()
+            for node in level_nodes:
+                table.append_row(
+                   config.info_func(
+                      node,
+                      keys=None,
+                      conv=config.conversion_func
+                   )
+                )
+            if len(table) != 0:
+                yield (level, table)
@@ -31,9 +31,8 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import pydevDAG
-
-from printdevDAG._utils import GeneralUtils
+from printdevDAG._traversal import ChildOrder
+from printdevDAG._traversal import DepthFirst
 
 
 class GraphLineArrangementsConfig(object):
@@ -41,8 +40,19 @@ class GraphLineArrangementsConfig(object):
     Class that represents the configuration for LineArrangements methods.
     """
     # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, info_func, conversion_func, sort_key):
+    def __init__( # pylint: disable=too-many-arguments
+       self,
+       info_func,
+       conversion_func,
+       sort_key,
+       back_references=False,
+       roots=None,
+       order=None,
+       node_filter=None,
+       cache_size=None
+    ):
         """
         Initializer.
 
@@ -51,10 +61,37 @@ class GraphLineArrangementsConfig(object):
         :param conversion_func: converts info_func values to str
         :type conversion_func: (str * object) -> str
         :param str sort_key: the key/column name to sort on
+        :param bool back_references: if True, expand every node just once
+        :param roots: the nodes to start from, if None, the graph's roots
+        :type roots: list of `Node` or NoneType
+        :param order: the order of children, if None, calculated from info
+        :type order: ChildOrder or NoneType
+        :param node_filter: whether to show a node, None shows all
+        :type node_filter: (`Node` -> bool) or NoneType
+        :param cache_size: if set, a bound on the nodes to remember
+        :type cache_size: int or NoneType
+
+        An order may be shared by several traversals of the same graph, so
+        that children are sorted only once; it must be invalidated when
+        the graph or the values for sort_key change. It must have been made
+        with node_filter, which is otherwise ignored.
+
+        A node that node_filter rejects is not shown, and its children
+        take its place, see ChildOrder.
+
+        If cache_size is set, the order of children is cached for at most
+        cache_size nodes, and in depth first output without back references
+        no subtree is recorded to be replayed, so that the memory used does
+        not depend on the size of the graph, see node_strings_from_graph.
         """
         self.info_func = info_func
         self.conversion_func = conversion_func
         self.sort_key = sort_key
+        self.back_references = back_references
+        self.roots = roots
+        self.order = order
+        self.node_filter = node_filter
+        self.cache_size = cache_size
 
 
 class GraphLineArrangements(object):
@@ -63,11 +100,45 @@ class GraphLineArrangements(object):
     """
     # pylint: disable=too-few-public-methods
 
+    @staticmethod
+    def _child_order(config, graph):
+        """
+        Get the order of the children of each node.
+
+        :param LineArrangementsConfig: config
+        :param `DiGraph` graph: the graph
+
+        :returns: config.order, or a new order by config.sort_key
+        :rtype: ChildOrder
+        """
+        if config.order is not None:
+            return config.order
+
+        (info_func, sort_key) = (config.info_func, config.sort_key)
+        keys = [sort_key]
+
+        def key_func(node):
+            """
+            Sort key for node.
+
+            :param node: the node
+            :rtype: str
+            """
+            res = info_func(node, keys)[sort_key]
+            return '' if res is None else str(res)
+
+        return ChildOrder(
+           graph,
+           key_func,
+           config.node_filter,
+           config.cache_size
+        )
+
     @classmethod
-    def node_strings_from_graph(cls, config, graph):
+    def _node_strings_once(cls, config, graph):
         """
-        Generates print information about nodes in graph.
-        Starts from the roots of the graph.
+        Generates print information about nodes in graph, expanding every
+        node once, and yielding a back reference on subsequent visits.
 
         :param LineArrangementsConfig: config
         :param `DiGraph` graph: the graph
@@ -75,20 +146,54 @@ class GraphLineArrangements(object):
         :returns: a table of information to be used for further display
         :rtype: list of dict of str * object
 
-        Fields in table:
-        * indent - the level of indentation
-        * last - whether this node is the last child of its parent
-        * node - the table of information about the node itself
-        * orphan - whether this node has no parents
+        Every node is expanded at most once, so every edge is followed at
+        most once, and the whole traversal is O(V + E).
         """
-        nodes = pydevDAG.DepthFirst.nodes(
-           graph,
-           key_func=GeneralUtils.str_key_func_gen(
-              lambda n: config.info_func(n, [config.sort_key])[config.sort_key]
-           )
-        )
+        order = cls._child_order(config, graph)
+        expanded = set()
 
-        for (depth, node, last) in nodes:
+        def expand(_, node):
+            """
+            Whether to expand node, i.e., it is visited for the first time.
+            """
+            if node in expanded:
+                return False
+            expanded.add(node)
+            return True
+
+        nodes = DepthFirst.nodes(order, config.roots, expand)
+        for (depth, node, last, expanded_node) in nodes:
+            yield {
+               'indent' : depth,
+               'last' : last,
+               'node' :
+                  config.info_func(
+                     node,
+                     keys=None,
+                     conv=config.conversion_func
+                  ) if expanded_node else None,
+               'orphan' : depth == 0,
+               'reference' : None if expanded_node else order.key(node)
+            }
+
+    @classmethod
+    def _node_strings_unrecorded(cls, config, graph):
+        """
+        Generates print information about nodes in graph, expanding every
+        node every time it is visited, and recording nothing.
+
+        :param LineArrangementsConfig: config
+        :param `DiGraph` graph: the graph
+
+        :returns: a table of information to be used for further display
+        :rtype: list of dict of str * object
+
+        The row of a node is requested from config.info_func on every visit,
+        so that the rows of a subtree are calculated again on every visit
+        that the info function does not cache them for.
+        """
+        order = cls._child_order(config, graph)
+        for (depth, node, last, _) in DepthFirst.nodes(order, config.roots):
             yield {
                'indent' : depth,
                'last' : last,
@@ -98,9 +203,153 @@ class GraphLineArrangements(object):
                      keys=None,
                      conv=config.conversion_func
                   ),
-               'orphan' : depth == 0
+               'orphan' : depth == 0,
+               'reference' : None
             }
 
+    @classmethod
+    def _node_strings_full(cls, config, graph):
+        """
+        Generates print information about nodes in graph, expanding every
+        node every time it is visited.
+
+        :param LineArrangementsConfig: config
+        :param `DiGraph` graph: the graph
+
+        :returns: a table of information to be used for further display
+        :rtype: list of dict of str * object
+
+        The rows of the subtree of every node with more than one parent are
+        recorded on its first expansion, as a fragment of tuples of
+        relative depth * node * bool * row. A node with more than one
+        parent within the subtree is recorded in its own fragment, and its
+        row in the enclosing fragment is None, a reference to its fragment,
+        so that every row is recorded just once, and the fragments take
+        O(V + E) space. Subsequent visits replay the fragment, shifting the
+        depth, so that neither the traversal nor the calculation of the
+        rows is repeated. Every visit to a node yields the same row, which
+        must not be modified.
+        """
+        # pylint: disable=too-many-locals
+        order = cls._child_order(config, graph)
+
+        # fragments of completed subtrees, indexed by node
+        fragments = dict()
+
+        # fragments of subtrees currently being expanded
+        recorders = []
+
+        def expand(depth, node):
+            """
+            Whether to expand node, i.e., its subtree is not yet recorded.
+            """
+            # every subtree rooted at or below depth has been completed
+            while recorders and recorders[-1][0] >= depth:
+                (_, done, fragment) = recorders.pop()
+                fragments[done] = fragment
+            return node not in fragments
+
+        def record(depth, node, last, row):
+            """
+            Record a visit to a node in the innermost active recorder.
+            """
+            if recorders:
+                (base, _, fragment) = recorders[-1]
+                fragment.append((depth - base, node, last, row))
+
+        def replay(depth, node, last):
+            """
+            Yield the rows of the recorded subtree of node.
+
+            :returns: the depth, whether the last child, and row of each
+            :rtype: generator of tuple of int * bool * (dict of str * str)
+            """
+            stack = [(depth, last, iter(fragments[node]))]
+            while stack:
+                (base, base_last, entries) = stack[-1]
+                entry = next(entries, None)
+                if entry is None:
+                    stack.pop()
+                    continue
+                (offset, frag_node, frag_last, row) = entry
+                if offset == 0:
+                    frag_last = base_last
+                if row is None:
+                    stack.append(
+                       (base + offset, frag_last, iter(fragments[frag_node]))
+                    )
+                else:
+                    yield (base + offset, frag_last, row)
+
+        def line(depth, last, row):
+            """
+            Print information for a visit.
+
+            :rtype: dict of str * object
+            """
+            return {
+               'indent' : depth,
+               'last' : last,
+               'node' : row,
+               'orphan' : depth == 0,
+               'reference' : None
+            }
+
+        pred = graph.pred
+        for (depth, node, last, expanded) in \
+           DepthFirst.nodes(order, config.roots, expand):
+            if not expanded:
+                record(depth, node, last, None)
+                for (row_depth, row_last, row) in replay(depth, node, last):
+                    yield line(row_depth, row_last, row)
+                continue
+
+            row = config.info_func(
+               node,
+               keys=None,
+               conv=config.conversion_func
+            )
+            if len(pred[node]) > 1:
+                record(depth, node, last, None)
+                recorders.append((depth, node, []))
+            record(depth, node, last, row)
+            yield line(depth, last, row)
+
+    @classmethod
+    def node_strings_from_graph(cls, config, graph):
+        """
+        Generates print information about nodes in graph.
+        Starts from the roots of the graph, or from config.roots.
+
+        :param LineArrangementsConfig: config
+        :param `DiGraph` graph: the graph
+
+        :returns: a table of information to be used for further display
+        :rtype: list of dict of str * object
+
+        Fields in table:
+        * indent - the level of indentation
+        * last - whether this node is the last child of its parent
+        * node - the table of information about the node itself
+        * orphan - whether this node has no parents
+        * reference - the name of a node already shown, or None
+
+        If config.back_references is set, every node is shown only once,
+        with all its descendants. Subsequent visits yield a reference to the
+        node, and node is None.
+
+        Otherwise, if config.cache_size is set, nothing is recorded but the
+        order of children of at most config.cache_size nodes, and the path
+        to the current node, so that the memory used does not depend on
+        the number of nodes or rows. Back references require remembering
+        every node expanded, and the roots are always sorted all at once.
+        """
+        if config.back_references:
+            return cls._node_strings_once(config, graph)
+        if config.cache_size is not None:
+            return cls._node_strings_unrecorded(config, graph)
+        return cls._node_strings_full(config, graph)
+
 
 class GraphXformLines(object):
     """
@@ -109,6 +358,7 @@ class GraphXformLines(object):
 
     _EDGE_STR = "|-"
     _LAST_STR = "`-"
+    _REFERENCE_STR = "(see %s)"
 
     @classmethod
     def indentation(cls):
@@ -145,10 +395,37 @@ class GraphXformLines(object):
         :type column_headers: list of str
         :param lines: information about each line
         :type lines: dict of str * str
+
+        A line that is a back reference to a node already shown has an
+        empty value in every column except the first.
+        """
+        for row in cls.rows(column_headers, lines):
+            yield dict(zip(column_headers, row))
+
+    @classmethod
+    def rows(cls, column_headers, lines):
+        """
+        Transform column values and yield just the values, in the order of
+        the column headers.
+
+        :param column_headers: the column headers
+        :type column_headers: list of str
+        :param lines: information about each line
+        :type lines: dict of str * str
+
+        :returns: the values of each line
+        :rtype: generator of list of str
+
+        The information about each line is not modified.
         """
         key = column_headers[0]
+        rest = column_headers[1:]
+        empty = [''] * len(rest)
 
         for line in lines:
-            line_info = line['node']
-            line_info[key] = cls.calculate_prefix(line) + line_info[key]
-            yield line_info
+            prefix = cls.calculate_prefix(line)
+            if line.get('reference') is not None:
+                yield [prefix + cls._REFERENCE_STR % line['reference']] + empty
+            else:
+                node = line['node']
+                yield [prefix + node[key]] + [node[k] for k in rest]
@@ -33,12 +33,15 @@ from __future__ import unicode_literals
 
 from collections import defaultdict
 
-import pydevDAG
+import six
 
 from . import _breadth
 from . import _depth
 from . import _layers
 from . import _print
+from ._item_str import NodeGetters
+from ._reach import GraphReachability
+from ._utils import GeneralUtils
 
 
 class PrintGraph(object):
@@ -47,141 +50,401 @@ class PrintGraph(object):
     """
     # pylint: disable=too-few-public-methods
 
+    KEYS = [
+       'NAME',
+       'NODETYPE',
+       'DEVNAME',
+       'SUBSYSTEM',
+       'DEVTYPE',
+       'DM_SUBSYSTEM',
+       'ID_PATH',
+       'MAJOR',
+       'SIZE'
+    ]
+
     @staticmethod
-    def line_info(graph):
+    def getters():
+        """
+        Get the getters for every column.
+
+        :returns: the getters, indexed by column name
+        :rtype: dict of str * (list of NodeGetter)
+        """
+        name_funcs = [
+           NodeGetters.DMNAME,
+           NodeGetters.DEVNAME,
+           NodeGetters.SYSNAME,
+           NodeGetters.IDENTIFIER
+        ]
+        path_funcs = [
+           NodeGetters.IDSASPATH,
+           NodeGetters.IDPATH
+        ]
+        return {
+           'NAME' : name_funcs,
+           'NODETYPE' : [NodeGetters.NODETYPE],
+           'DEVNAME' : [NodeGetters.DEVNAME],
+           'DEVTYPE': [NodeGetters.DEVTYPE],
+           'DM_SUBSYSTEM' : [NodeGetters.DMUUIDSUBSYSTEM],
+           'ID_PATH' : path_funcs,
+           'MAJOR': [NodeGetters.MAJOR],
+           'SIZE': [NodeGetters.SIZE],
+           'SUBSYSTEM': [NodeGetters.SUBSYSTEM]
+        }
+
+    @classmethod
+    def find(cls, graph, names):
+        """
+        Find nodes by the value in their NAME column.
+
+        :param `DiGraph` graph: the graph
+        :param names: the names
+        :type names: iterable of str
+
+        :returns: the nodes, indexed by name, missing names are omitted
+        :rtype: dict of str * (list of `Node`)
+
+        A name matches a node's whole NAME value, e.g., "/dev/sdq", or its
+        last component, e.g., "sdq".
+        """
+        names = set(names)
+        name_func = GeneralUtils.composer(
+           f.getter for f in cls.getters()['NAME']
+        )
+        found = defaultdict(list)
+        for node in graph:
+            name = name_func(graph.node[node])
+            if name is None:
+                continue
+            for candidate in (name, name.rsplit('/', 1)[-1]):
+                if candidate in names:
+                    found[candidate].append(node)
+                    break
+        return dict(found)
+
+    @staticmethod
+    def select(
+       graph,
+       seeds,
+       direction=GraphReachability.DOWN,
+       reachability=None
+    ):
+        """
+        Select the part of ``graph`` reachable from ``seeds``.
+
+        :param `DiGraph` graph: the graph
+        :param seeds: the nodes to start from
+        :type seeds: iterable of `Node`
+        :param str direction: see GraphReachability
+        :param reachability: an index to use, and to add to, or None
+        :type reachability: GraphReachability or NoneType
+
+        :returns: the subgraph, sharing the graph's node attributes
+        :rtype: `DiGraph`
+
+        Every traversal can print the subgraph. With an index shared by
+        several selections from the same graph, only the part of the graph
+        not already indexed is searched.
+        """
+        if reachability is None:
+            reachability = GraphReachability(graph)
+        return reachability.subgraph(seeds, direction)
+
+    # the column that rows are sorted on
+    SORT_KEY = 'NAME'
+
+    # maximum number of nodes to cache values and children for, if the
+    # memory used must not depend on the size of the graph
+    STREAM_CACHE_SIZE = 2 ** 10
+
+    @classmethod
+    def _extracted_keys(cls, line_info):
+        """
+        The keys whose values are extracted in advance.
+
+        :param GraphLineInfo line_info: the line info object
+        :returns: the columns which are not lazy, and the sort key
+        :rtype: list of str
+        """
+        keys = [c for c in line_info.keys if c not in line_info.lazy]
+        if cls.SORT_KEY not in keys:
+            keys.append(cls.SORT_KEY)
+        return keys
+
+    @classmethod
+    def line_info( # pylint: disable=too-many-arguments
+       cls,
+       graph,
+       extraction=None,
+       columns=None,
+       lazy=(),
+       snapshot=None,
+       cache_size=_print.GraphLineInfo.CACHE_SIZE
+    ):
         """
         Get a line info object.
 
         :param DiGraph graph: the graph
+        :param extraction: an engine to extract all values in advance
+        :type extraction: ParallelExtraction or NoneType
+        :param columns: the columns to show, in order, if None, KEYS
+        :type columns: list of str or NoneType
+        :param lazy: columns not to extract in advance
+        :type lazy: iterable of str
+        :param snapshot: a snapshot to take unchanged values from
+        :type snapshot: Snapshot or NoneType
+        :param cache_size: maximum number of nodes to cache values for
+        :type cache_size: int or NoneType
 
         :returns: a line info object
         :rtype: GraphLineInfo
+
+        :raises ValueError: if a column is not one of KEYS
+
+        Only the values for columns, and for the sort key, are calculated.
+
+        If extraction is specified, the values for every node for columns
+        which are not lazy, and for the sort key, are extracted at once, and
+        the line info object's cache is unbounded, whatever cache_size. The
+        values for lazy columns are calculated only for the rows which are
+        shown. If neither extraction nor snapshot is specified, nothing is
+        calculated in advance, so that lazy makes no difference.
+
+        If snapshot is specified, the cache is unbounded, and the values of
+        every node whose attributes are unchanged are taken from the
+        snapshot, so that only the values of the other nodes, and of keys
+        not in the snapshot, are extracted.
         """
+        columns = cls.KEYS[:] if columns is None else list(columns)
+        unknown = [c for c in columns if c not in cls.KEYS]
+        if unknown:
+            raise ValueError("unknown columns %s" % ", ".join(unknown))
+
         justification = defaultdict(lambda: '<')
         justification['SIZE'] = '>'
-        name_funcs = [
-           pydevDAG.NodeGetters.DMNAME,
-           pydevDAG.NodeGetters.DEVNAME,
-           pydevDAG.NodeGetters.SYSNAME,
-           pydevDAG.NodeGetters.IDENTIFIER
-        ]
-        path_funcs = [
-           pydevDAG.NodeGetters.IDSASPATH,
-           pydevDAG.NodeGetters.IDPATH
-        ]
-        return _print.GraphLineInfo(
+        getters = cls.getters()
+        if extraction is None and snapshot is None:
+            return _print.GraphLineInfo(
+               graph,
+               columns,
+               justification,
+               getters,
+               cache_size=cache_size,
+               lazy=lazy
+            )
+
+        line_info = _print.GraphLineInfo(
            graph,
-           [
-              'NAME',
-              'NODETYPE',
-              'DEVNAME',
-              'SUBSYSTEM',
-              'DEVTYPE',
-              'DM_SUBSYSTEM',
-              'ID_PATH',
-              'MAJOR',
-              'SIZE'
-           ],
+           columns,
            justification,
-           {
-              'NAME' : name_funcs,
-              'NODETYPE' : [pydevDAG.NodeGetters.NODETYPE],
-              'DEVNAME' : [pydevDAG.NodeGetters.DEVNAME],
-              'DEVTYPE': [pydevDAG.NodeGetters.DEVTYPE],
-              'DM_SUBSYSTEM' : [pydevDAG.NodeGetters.DMUUIDSUBSYSTEM],
-              'ID_PATH' : path_funcs,
-              'MAJOR': [pydevDAG.NodeGetters.MAJOR],
-              'SIZE': [pydevDAG.NodeGetters.SIZE],
-              'SUBSYSTEM': [pydevDAG.NodeGetters.SUBSYSTEM]
-           }
+           getters,
+           cache_size=None,
+           lazy=lazy
         )
+        keys = cls._extracted_keys(line_info)
+        if snapshot is None:
+            line_info.prefetch(extraction, keys=keys)
+            return line_info
+
+        stale = line_info.restore(snapshot)
+        if extraction is not None:
+            missing = [k for k in keys if k not in snapshot.keys]
+            if missing:
+                line_info.prefetch(extraction, keys=missing)
+            present = [k for k in keys if k not in missing]
+            if stale and present:
+                line_info.prefetch(extraction, nodes=stale, keys=present)
+        return line_info
 
     @staticmethod
-    def depth_first(graph, line_info):
+    def _selector(line_info, row_filter):
+        """
+        Get a node filter for ``row_filter``.
+
+        :param GraphLineInfo line_info: the line info object
+        :param row_filter: the filter, or None
+        :type row_filter: RowFilter or NoneType
+
+        :returns: a function that returns True if a node is shown, or None
+        :rtype: (`Node` -> bool) or NoneType
+        """
+        if row_filter is None:
+            return None
+        return line_info.selector(row_filter)
+
+    @staticmethod
+    def depth_first( # pylint: disable=too-many-arguments
+       graph,
+       line_info,
+       back_references=False,
+       widths=None,
+       spill=False,
+       row_filter=None
+    ):
         """
         Yield lines for depth first output.
 
         :param DiGraph graph: the graph
         :param GraphLineInfo line_info: the line info object
+        :param bool back_references: if True, show each subtree only once
+        :param widths: maximum width of the values in each column
+        :type widths: dict of str * int or NoneType
+        :param bool spill: whether to store rows in a temporary file
+        :param row_filter: if set, show only the rows that it accepts
+        :type row_filter: RowFilter or NoneType
 
         :returns: generates lines as str
         :rtype: a generator of str
+
+        If back_references is True, a node that has already been shown is
+        displayed as a reference to its earlier line, and its descendants
+        are omitted, so that the number of lines is O(V + E).
+
+        A node whose row is not accepted is omitted, and its children are
+        shown in its place.
+
+        See Print.row_lines for the meaning of widths and spill.
+
+        By default, the rows of a subtree that is shown more than once are
+        calculated once and kept, see GraphLineArrangements. If widths or
+        spill is set, nothing is kept, and the children of at most
+        STREAM_CACHE_SIZE nodes are cached, so that, if line_info's cache
+        is also bounded, as print_graph arranges, the memory used does not
+        depend on the size of the graph, unless back_references is set.
+        The rows of a subtree are then calculated again on every visit.
         """
+        streaming = widths is not None or spill
         infos = _depth.GraphLineArrangements.node_strings_from_graph(
            _depth.GraphLineArrangementsConfig(
               line_info.info,
               lambda k, v: str(v),
-              'NAME'
+              PrintGraph.SORT_KEY,
+              back_references=back_references,
+              node_filter=PrintGraph._selector(line_info, row_filter),
+              cache_size=PrintGraph.STREAM_CACHE_SIZE if streaming else None
            ),
            graph
         )
 
-        items = list(_depth.GraphXformLines.xform(line_info.keys, infos))
-        return _print.Print.lines(
+        rows = _depth.GraphXformLines.rows(line_info.keys, infos)
+        return _print.Print.row_lines(
            line_info.keys,
-           items,
+           rows,
            2,
-           line_info.alignment
+           line_info.alignment,
+           widths=widths,
+           spill=spill
         )
 
     @staticmethod
-    def layers(graph, line_info):
+    def layer_title(layer):
+        """
+        The title of a layer.
+
+        :param layer: node type, device type, dm subsystem, major number
+        :type layer: tuple of object, as designated by _layers
+
+        :returns: the title
+        :rtype: str
+        """
+        (node_type, dev_type, dm_subsystem, _) = layer
+
+        fmt_str = "".join([
+           '%(dm)s',
+           '%(dm_space)s',
+           '%(devtype)s',
+           '%(devtype_space)s',
+           '%(nodetype)s',
+           's'
+        ])
+
+        value = {
+           'dm' : dm_subsystem if dm_subsystem is not None else '',
+           'dm_space' : ' ' if dm_subsystem is not None else '',
+           'devtype' : dev_type if dev_type is not None else '',
+           'devtype_space' : ' ' if dev_type is not None else '',
+           'nodetype' : node_type
+        }
+
+        return fmt_str % value
+
+    @staticmethod
+    def layers( # pylint: disable=too-many-arguments
+       graph,
+       line_info,
+       widths=None,
+       spill=False,
+       row_filter=None
+    ):
         """
         Yield data for a layered view of the storage stack.
 
         :param DiGraph graph: the graph
         :param GraphLineInfo line_info: the line info object
+        :param widths: maximum width of the values in each column
+        :type widths: dict of str * int or NoneType
+        :param bool spill: whether to store rows in a temporary file
+        :param row_filter: if set, show only the rows that it accepts
+        :type row_filter: RowFilter or NoneType
         """
         infos = _layers.GraphLineArrangements.node_strings_from_graph(
            _layers.GraphLineArrangementsConfig(
               line_info.info,
               lambda k, v: str(v),
-              'NAME'
+              PrintGraph.SORT_KEY,
+              node_filter=PrintGraph._selector(line_info, row_filter)
            ),
            graph
         )
 
-        for ((node_type, dev_type, dm_subsystem, major_number), items) in infos:
+        for (layer, items) in infos:
             yield ""
-
-            fmt_str = "".join([
-               '%(dm)s',
-               '%(dm_space)s',
-               '%(devtype)s',
-               '%(devtype_space)s',
-               '%(nodetype)s',
-               's'
-            ])
-
-            value = {
-               'dm' : dm_subsystem if dm_subsystem is not None else '',
-               'dm_space' : ' ' if dm_subsystem is not None else '',
-               'devtype' : dev_type if dev_type is not None else '',
-               'devtype_space' : ' ' if dev_type is not None else '',
-               'nodetype' : node_type
-            }
-
-            yield fmt_str % value
+            yield PrintGraph.layer_title(layer)
 
             lines = _print.Print.lines(
               line_info.keys,
               items,
               2,
-              line_info.alignment
+              line_info.alignment,
+              widths=widths,
+              spill=spill
             )
             for line in lines:
                 yield line
 
     @staticmethod
-    def breadth_first(graph, line_info):
+    def breadth_first( # pylint: disable=too-many-arguments
+       graph,
+       line_info,
+       widths=None,
+       spill=False,
+       levels=None,
+       row_filter=None
+    ):
         """
         Yield data for a breadth first search
+
+        :param DiGraph graph: the graph
+        :param GraphLineInfo line_info: the line info object
+        :param widths: maximum width of the values in each column
+        :type widths: dict of str * int or NoneType
+        :param bool spill: whether to store rows in a temporary file
+        :param levels: level semantics, see GraphLevels, or None
+        :type levels: str or NoneType
+        :param row_filter: if set, show only the rows that it accepts
+        :type row_filter: RowFilter or NoneType
+
+        If levels is None, a node is shown at every level at which there
+        is a path to it from a root. Otherwise, every node is shown exactly
+        once, at its GraphLevels level, in a deterministic order.
         """
         infos = _breadth.GraphLineArrangements.node_strings_from_graph(
            _breadth.GraphLineArrangementsConfig(
               line_info.info,
               lambda k, v: str(v),
-              'NAME'
+              PrintGraph.SORT_KEY,
+              levels=levels,
+              node_filter=PrintGraph._selector(line_info, row_filter)
            ),
            graph
         )
@@ -193,21 +456,302 @@ class PrintGraph(object):
               line_info.keys,
               items,
               2,
-              line_info.alignment
+              line_info.alignment,
+              widths=widths,
+              spill=spill
             )
             for line in lines:
                 yield line
 
+    @staticmethod
+    def _record_value(_, value):
+        """
+        Convert a value for a record, keeping None and ints.
+
+        :param object value: the value
+        :rtype: NoneType or int or str
+        """
+        if value is None or isinstance(value, six.integer_types):
+            return value
+        return six.text_type(value)
+
     @classmethod
-    def print_graph(cls, out, graph, traversal):
+    def _depth_first_records(
+       cls,
+       graph,
+       line_info,
+       back_references=False,
+       row_filter=None
+    ):
+        """
+        Records for depth first output, see records().
+        """
+        keys = line_info.keys
+        sort_key = cls.SORT_KEY
+        row_keys = keys if sort_key in keys else keys + [sort_key]
+
+        def info_func(node, keys=None, conv=lambda k, v: v):
+            """
+            The row for node, always including the sort key.
+            """
+            if keys is None:
+                keys = row_keys
+            return line_info.info(node, keys, conv)
+
+        infos = _depth.GraphLineArrangements.node_strings_from_graph(
+           _depth.GraphLineArrangementsConfig(
+              info_func,
+              cls._record_value,
+              sort_key,
+              back_references=back_references,
+              node_filter=cls._selector(line_info, row_filter),
+              cache_size=cls.STREAM_CACHE_SIZE
+           ),
+           graph
+        )
+
+        def records():
+            """
+            Generate the records, tracking the names of the ancestors of
+            the current row.
+            """
+            empty = [None] * len(keys)
+            path = []
+            for line in infos:
+                depth = line['indent']
+                del path[depth:]
+                parent = path[-1] if path else None
+                reference = line['reference']
+                if reference is not None:
+                    path.append(reference)
+                    yield [depth, line['last'], parent, reference] + empty
+                else:
+                    row = line['node']
+                    path.append(row[sort_key])
+                    yield [depth, line['last'], parent, None] + \
+                       [row[k] for k in keys]
+
+        return (['depth', 'last', 'parent', 'reference'] + keys, records())
+
+    @classmethod
+    def _breadth_first_records(
+       cls,
+       graph,
+       line_info,
+       levels=None,
+       row_filter=None
+    ):
+        """
+        Records for breadth first output, see records().
+        """
+        infos = _breadth.GraphLineArrangements.node_strings_from_graph(
+           _breadth.GraphLineArrangementsConfig(
+              line_info.info,
+              cls._record_value,
+              cls.SORT_KEY,
+              levels=levels,
+              node_filter=cls._selector(line_info, row_filter)
+           ),
+           graph
+        )
+        keys = line_info.keys
+        records = (
+           [level] + list(row) for (level, items) in infos \
+              for row in items.rows(keys)
+        )
+        return (['level'] + keys, records)
+
+    @classmethod
+    def _layers_records(cls, graph, line_info, row_filter=None):
+        """
+        Records for layers output, see records().
+        """
+        infos = _layers.GraphLineArrangements.node_strings_from_graph(
+           _layers.GraphLineArrangementsConfig(
+              line_info.info,
+              cls._record_value,
+              cls.SORT_KEY,
+              node_filter=cls._selector(line_info, row_filter)
+           ),
+           graph
+        )
+        keys = line_info.keys
+        records = (
+           [cls.layer_title(layer)] + list(row) for (layer, items) in infos \
+              for row in items.rows(keys)
+        )
+        return (['layer'] + keys, records)
+
+    @classmethod
+    def records(cls, graph, line_info, traversal, **kwargs):
+        """
+        Get records, rather than lines, for a traversal.
+
+        :param DiGraph graph: the graph
+        :param GraphLineInfo line_info: the line info object
+        :param str traversal: the traversal
+        :param kwargs: back_references, levels, or row_filter, as for the
+           traversal
+
+        :returns: the names of the fields, and the records
+        :rtype: tuple of list of str * (generator of list)
+
+        The fields are the columns of line_info, preceded by:
+        * depth_first - depth, last, the NAME value of the parent, and the
+          NAME value of the node referred to, if a back reference
+        * breadth_first - level
+        * layers - the title of the layer
+
+        Column values are None, int, or str. The depth and parent replace
+        the indentation of the text output; a row's parent is the nearest
+        earlier row with a smaller depth. Records are generated as they are
+        found.
+
+        For depth first output, no subtree's records are kept to be
+        replayed, and the children of at most STREAM_CACHE_SIZE nodes are
+        cached, so that the rows of a subtree shown more than once are
+        requested from line_info again on every visit; the memory used does
+        not depend on the size of the graph if line_info's cache is also
+        bounded, as emit() arranges, and back_references is not set.
+        """
+        if traversal == 'depth_first':
+            func = cls._depth_first_records
+        elif traversal == 'breadth_first':
+            func = cls._breadth_first_records
+        elif traversal == 'layers':
+            func = cls._layers_records
+        else:
+            raise ValueError("unknown traversal %s" % traversal)
+        return func(graph, line_info, **kwargs)
+
+    @classmethod
+    def _prepare( # pylint: disable=too-many-arguments
+       cls,
+       graph,
+       extraction,
+       seeds,
+       direction,
+       columns,
+       lazy,
+       snapshot,
+       cache_size=_print.GraphLineInfo.CACHE_SIZE
+    ):
+        """
+        The graph to print, and a line info object for it.
+
+        See print_graph() for the meaning of the arguments, and line_info()
+        for cache_size.
+
+        :rtype: tuple of `DiGraph` * GraphLineInfo
+        """
+        if seeds is not None:
+            graph = cls.select(graph, seeds, direction)
+        if snapshot is None:
+            return (
+               graph,
+               cls.line_info(
+                  graph,
+                  extraction,
+                  columns,
+                  lazy,
+                  cache_size=cache_size
+               )
+            )
+
+        try:
+            previous = _print.Snapshot.load(snapshot)
+        except (EnvironmentError, ValueError):
+            previous = None
+        try:
+            line_info = \
+               cls.line_info(graph, extraction, columns, lazy, previous)
+        finally:
+            if previous is not None:
+                previous.close()
+        return (graph, line_info)
+
+    @classmethod
+    def _save(cls, snapshot, graph, line_info):
+        """
+        Replace the snapshot, if any, with one for this graph.
+
+        :param snapshot: the snapshot file, or None
+        :type snapshot: str or NoneType
+        :param `DiGraph` graph: the graph
+        :param GraphLineInfo line_info: the line info object
+        """
+        if snapshot is not None:
+            _print.Snapshot.write(
+               snapshot,
+               graph,
+               line_info,
+               cls._extracted_keys(line_info)
+            )
+
+    @classmethod
+    def print_graph( # pylint: disable=too-many-arguments
+       cls,
+       out,
+       graph,
+       traversal,
+       extraction=None,
+       seeds=None,
+       direction=GraphReachability.DOWN,
+       columns=None,
+       lazy=(),
+       snapshot=None,
+       **kwargs
+    ):
         """
         Print a graph.
 
-        :param `file` out: print destination
+        :param out: print destination
+        :type out: text file, binary file, or file descriptor
         :param `DiGraph` graph: the graph
         :param str traversal: the type of graph to print
+        :param extraction: an engine to extract all values in advance
+        :type extraction: ParallelExtraction or NoneType
+        :param seeds: if set, print only the part reachable from these
+        :type seeds: iterable of `Node` or NoneType
+        :param str direction: the direction to reach in, see select()
+        :param columns: the columns to show, see line_info()
+        :type columns: list of str or NoneType
+        :param lazy: columns not to extract in advance, see line_info()
+        :type lazy: iterable of str
+        :param snapshot: a snapshot file, or None
+        :type snapshot: str or NoneType
+        :param kwargs: additional keyword arguments for the traversal
+
+        :returns: the number of lines, bytes, and writes to out
+        :rtype: dict of str * int
+
+        Lines are written in large chunks, see LineWriter.
+
+        If snapshot is set, the values of nodes whose attributes are
+        unchanged are taken from the file, if it is a snapshot, and the
+        file is then replaced by a snapshot of this graph, see Snapshot.
+        If seeds is also set, the file is left as it is, since a snapshot
+        of just the part reachable from the seeds would lose the values of
+        every other node.
+
+        If depth first output is streamed, i.e., widths or spill is set,
+        and neither extraction nor snapshot is, the values of at most
+        STREAM_CACHE_SIZE nodes are cached, so that the memory used does
+        not depend on the size of the graph, see depth_first().
         """
-        line_info = cls.line_info(graph)
+        streaming = traversal == 'depth_first' and \
+           (kwargs.get('widths') is not None or kwargs.get('spill', False))
+        (graph, line_info) = cls._prepare(
+           graph,
+           extraction,
+           seeds,
+           direction,
+           columns,
+           lazy,
+           snapshot,
+           cls.STREAM_CACHE_SIZE if streaming else \
+              _print.GraphLineInfo.CACHE_SIZE
+        )
 
         if traversal == 'depth_first':
             func = cls.depth_first
@@ -218,5 +762,68 @@ class PrintGraph(object):
         else:
             assert False
 
-        for line in func(graph, line_info):
-            print(line, end="\n", file=out)
+        with _print.LineWriter(out) as writer:
+            writer.write_lines(func(graph, line_info, **kwargs))
+        if seeds is None:
+            cls._save(snapshot, graph, line_info)
+        return writer.report()
+
+    @classmethod
+    def emit( # pylint: disable=too-many-arguments
+       cls,
+       out,
+       graph,
+       traversal,
+       fmt=_print.RecordFormat.JSONL,
+       extraction=None,
+       seeds=None,
+       direction=GraphReachability.DOWN,
+       columns=None,
+       lazy=(),
+       snapshot=None,
+       **kwargs
+    ):
+        """
+        Write records for a traversal of a graph, for other programs.
+
+        :param out: destination
+        :type out: text file, binary file, or file descriptor
+        :param `DiGraph` graph: the graph
+        :param str traversal: the type of traversal
+        :param str fmt: one of RecordFormat.FORMATS
+        :param kwargs: additional keyword arguments for records()
+
+        :returns: the number of lines, bytes, and writes to out
+        :rtype: dict of str * int
+
+        :raises ValueError: if fmt or traversal is unknown
+
+        See print_graph() for the meaning of the other arguments, and
+        records() for the fields of each record.
+
+        For depth first records, unless extraction or snapshot is set, the
+        values of at most STREAM_CACHE_SIZE nodes are cached, see records().
+        """
+        if fmt not in _print.RecordFormat.FORMATS:
+            raise ValueError("unknown format %s" % fmt)
+        (graph, line_info) = cls._prepare(
+           graph,
+           extraction,
+           seeds,
+           direction,
+           columns,
+           lazy,
+           snapshot,
+           cls.STREAM_CACHE_SIZE if traversal == 'depth_first' else \
+              _print.GraphLineInfo.CACHE_SIZE
+        )
+        lines = _print.RecordFormat.lines(
+           fmt,
+           *cls.records(graph, line_info, traversal, **kwargs)
+        )
+
+        with _print.LineWriter(out) as writer:
+            writer.write_lines(lines)
+        if seeds is None:
+            cls._save(snapshot, graph, line_info)
+        return writer.report()
@@ -0,0 +1,477 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._incremental
+    ========================
+
+    Rendering a graph again after it changes, recomputing only what the
+    changes affect.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import difflib
+
+from . import _depth
+from . import _print
+from ._graph import PrintGraph
+from ._traversal import ChildOrder
+from ._utils import GeneralUtils
+
+
+class GraphEvent(object):
+    """
+    A change to a graph: a node added, removed, or changed, or an edge
+    added or removed.
+    """
+
+    ADD_NODE = 'add-node'
+    REMOVE_NODE = 'remove-node'
+    CHANGE_NODE = 'change-node'
+    ADD_EDGE = 'add-edge'
+    REMOVE_EDGE = 'remove-edge'
+
+    def __init__(self, action, node, attrs=None, target=None):
+        """
+        Initializer.
+
+        :param str action: the kind of change
+        :param `Node` node: the node, or the source of the edge
+        :param attrs: the node's attributes, for an added or changed node
+        :type attrs: dict or NoneType
+        :param target: the target of the edge, for an edge
+        :type target: `Node` or NoneType
+        """
+        self.action = action
+        self.node = node
+        self.attrs = attrs
+        self.target = target
+
+    def __repr__(self):
+        if self.target is None:
+            return "GraphEvent(%r, %r)" % (self.action, self.node)
+        return "GraphEvent(%r, %r, target=%r)" % \
+           (self.action, self.node, self.target)
+
+    @classmethod
+    def add_node(cls, node, attrs):
+        """
+        A node added, with its attributes.
+        """
+        return cls(cls.ADD_NODE, node, attrs=attrs)
+
+    @classmethod
+    def remove_node(cls, node):
+        """
+        A node, and all its edges, removed.
+        """
+        return cls(cls.REMOVE_NODE, node)
+
+    @classmethod
+    def change_node(cls, node, attrs):
+        """
+        A node's attributes replaced.
+        """
+        return cls(cls.CHANGE_NODE, node, attrs=attrs)
+
+    @classmethod
+    def add_edge(cls, source, target):
+        """
+        An edge added.
+        """
+        return cls(cls.ADD_EDGE, source, target=target)
+
+    @classmethod
+    def remove_edge(cls, source, target):
+        """
+        An edge removed.
+        """
+        return cls(cls.REMOVE_EDGE, source, target=target)
+
+    @property
+    def nodes(self):
+        """
+        The nodes that the event touches.
+
+        :rtype: list of `Node`
+        """
+        if self.target is None:
+            return [self.node]
+        return [self.node, self.target]
+
+    def apply(self, graph):
+        """
+        Apply the change to ``graph``.
+
+        :param `DiGraph` graph: the graph
+        """
+        if self.action == self.ADD_NODE:
+            graph.add_node(self.node)
+            graph.node[self.node].update(self.attrs)
+        elif self.action == self.REMOVE_NODE:
+            graph.remove_node(self.node)
+        elif self.action == self.CHANGE_NODE:
+            graph.node[self.node].clear()
+            graph.node[self.node].update(self.attrs)
+        elif self.action == self.ADD_EDGE:
+            graph.add_edge(self.node, self.target)
+        elif self.action == self.REMOVE_EDGE:
+            graph.remove_edge(self.node, self.target)
+        else:
+            raise ValueError("unknown action %s" % self.action)
+
+
+class IncrementalRenderer(object):
+    """
+    Renders a graph with PrintGraph, and renders it again after changes,
+    recomputing only what the changes affect.
+
+    Events are queued, and all queued events are applied at the next
+    rendering, so that a burst of events costs a single rendering.
+
+    For depth first output, the lines below each root are kept as a
+    separate block, with its own column widths, and only the blocks of
+    roots above a touched node are recomputed. If the column widths do not
+    change, the other blocks are not even formatted again. For the other
+    traversals, the whole output is arranged again, but only the values of
+    touched nodes are extracted again.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    _PADDING = 2
+
+    def __init__(self, graph, traversal='depth_first'):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph, which events will modify
+        :param str traversal: the PrintGraph traversal
+        """
+        if traversal not in ('depth_first', 'breadth_first', 'layers'):
+            raise ValueError("unknown traversal %s" % traversal)
+
+        self.graph = graph
+        self.traversal = traversal
+        self.line_info = PrintGraph.line_info(graph)
+
+        # the order of children, shared by the blocks, kept across events
+        sort_key = PrintGraph.SORT_KEY
+        self._order = ChildOrder(
+           graph,
+           GeneralUtils.str_key_func_gen(
+              lambda n: self.line_info.info(n, [sort_key])[sort_key]
+           )
+        )
+
+        # events not yet applied
+        self._events = []
+
+        # rows of each root's block, and the layout, number, and lines
+        # they were last formatted with, indexed by root
+        self._blocks = dict()
+        self._formatted = dict()
+
+        # widths of all rows of all blocks
+        self._widths = _print.WidthTracker(self.line_info.keys)
+
+        # a number for each formatting of a block, for its key
+        self._serial = 0
+
+        # the last rendering, as blocks of lines, None if not yet rendered
+        self._rendering = None
+
+    def push(self, event):
+        """
+        Queue an event.
+
+        :param GraphEvent event: the event
+        """
+        self._events.append(event)
+
+    def extend(self, events):
+        """
+        Queue several events.
+
+        :param events: the events
+        :type events: iterable of GraphEvent
+        """
+        self._events.extend(events)
+
+    def _roots_above(self, nodes):
+        """
+        The roots from which any of ``nodes`` can be reached.
+
+        :param nodes: the nodes, which need not be in the graph
+        :type nodes: iterable of `Node`
+        :rtype: set of `Node`
+        """
+        pred = self.graph.pred
+        seen = set(n for n in nodes if n in pred)
+        stack = list(seen)
+        roots = set()
+        while stack:
+            node = stack.pop()
+            if not pred[node]:
+                roots.add(node)
+            for parent in pred[node]:
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return roots
+
+    def _apply(self):
+        """
+        Apply all queued events, discarding the state that they affect.
+        """
+        events = self._events
+        if not events:
+            return
+        self._events = []
+
+        touched = set(n for e in events for n in e.nodes)
+        dirty = self._roots_above(touched)
+        self._order.invalidate(touched)
+
+        for event in events:
+            event.apply(self.graph)
+
+        dirty.update(self._roots_above(touched))
+        self._order.invalidate(touched)
+
+        changed = set(
+           e.node for e in events if e.action not in \
+              (GraphEvent.ADD_EDGE, GraphEvent.REMOVE_EDGE)
+        )
+        for node in changed:
+            self.line_info.invalidate(node)
+
+        for root in dirty:
+            self._discard(root)
+
+    def _discard(self, root):
+        """
+        Discard the block for ``root``, if any.
+
+        :param `Node` root: the root
+        """
+        rows = self._blocks.pop(root, None)
+        if rows is not None:
+            for row in rows:
+                self._widths.remove(row)
+        self._formatted.pop(root, None)
+
+    def _block(self, root):
+        """
+        The rows of the block for ``root``, calculated if necessary.
+
+        :param `Node` root: the root
+        :rtype: list of list of str
+        """
+        try:
+            return self._blocks[root]
+        except KeyError:
+            pass
+
+        line_info = self.line_info
+        infos = _depth.GraphLineArrangements.node_strings_from_graph(
+           _depth.GraphLineArrangementsConfig(
+              line_info.info,
+              lambda k, v: str(v),
+              PrintGraph.SORT_KEY,
+              roots=[root],
+              order=self._order
+           ),
+           self.graph
+        )
+        rows = list(_depth.GraphXformLines.rows(line_info.keys, infos))
+        for row in rows:
+            self._widths.add(row)
+        self._blocks[root] = rows
+        return rows
+
+    def _depth_first(self):
+        """
+        Render depth first output from the blocks.
+
+        :returns: the rendering, as blocks of lines, each with a key
+        :rtype: list of tuple of object * (list of str)
+
+        Two blocks with equal keys have equal lines.
+        """
+        line_info = self.line_info
+        keys = line_info.keys
+
+        roots = [r for (r, _) in self._order.roots()]
+
+        for root in set(self._blocks) - set(roots):
+            self._discard(root)
+        blocks = [(r, self._block(r)) for r in roots]
+
+        column_widths = self._widths.widths(self._PADDING)
+        layout = _print.RowFormatter.layout(
+           keys,
+           column_widths,
+           line_info.alignment
+        )
+        formatter = _print.RowFormatter.get(
+           keys,
+           column_widths,
+           line_info.alignment
+        )
+
+        rendering = [(formatter.header, [formatter.header])]
+        for (root, rows) in blocks:
+            formatted = self._formatted.get(root)
+            if formatted is None or formatted[0] != layout:
+                self._serial += 1
+                formatted = (
+                   layout,
+                   self._serial,
+                   [formatter.format_row(r) for r in rows]
+                )
+                self._formatted[root] = formatted
+            rendering.append(((root, formatted[1]), formatted[2]))
+        return rendering
+
+    def _render(self):
+        """
+        Apply all queued events, and render the graph.
+
+        :returns: the rendering, as blocks of lines, each with a key
+        :rtype: list of tuple of object * (list of str)
+        """
+        self._apply()
+        if self.traversal == 'depth_first':
+            rendering = self._depth_first()
+        else:
+            lines = list(
+               getattr(PrintGraph, self.traversal)(self.graph, self.line_info)
+            )
+            rendering = [(None, lines)]
+        previous = self._rendering
+        self._rendering = rendering
+        return (previous, rendering)
+
+    def render(self):
+        """
+        Apply all queued events, and render the graph.
+
+        :returns: the lines of the rendering
+        :rtype: list of str
+        """
+        (_, rendering) = self._render()
+        return [line for (_, lines) in rendering for line in lines]
+
+    @staticmethod
+    def _range(start, length):
+        """
+        A range of lines, as in a unified diff hunk header.
+
+        :param int start: the index of the first line
+        :param int length: the number of lines
+        :rtype: str
+        """
+        if length == 1:
+            return "%d" % (start + 1)
+        if length == 0:
+            return "%d,0" % start
+        return "%d,%d" % (start + 1, length)
+
+    @classmethod
+    def _hunks(cls, old, new, old_start, new_start):
+        """
+        Hunks, without context, that change ``old`` into ``new``.
+
+        :param old: the old lines
+        :type old: list of str
+        :param new: the new lines
+        :type new: list of str
+        :param int old_start: the index of the first old line
+        :param int new_start: the index of the first new line
+
+        :returns: the lines of the hunks
+        :rtype: generator of str
+        """
+        matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+        for (tag, i1, i2, j1, j2) in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            yield "@@ -%s +%s @@" % (
+               cls._range(old_start + i1, i2 - i1),
+               cls._range(new_start + j1, j2 - j1)
+            )
+            for line in old[i1:i2]:
+                yield '-' + line
+            for line in new[j1:j2]:
+                yield '+' + line
+
+    def diff(self):
+        """
+        Apply all queued events, render the graph, and compare the
+        rendering with the previous one.
+
+        :returns: the differences, in unified diff format, without context
+        :rtype: list of str
+
+        If the graph has not been rendered before, the difference is from
+        no lines at all.
+
+        The blocks of the renderings are compared first, and lines are
+        compared only within blocks that differ.
+        """
+        (previous, rendering) = self._render()
+        previous = previous or []
+
+        old_keys = [k for (k, _) in previous]
+        new_keys = [k for (k, _) in rendering]
+        old_starts = [0]
+        for (_, lines) in previous:
+            old_starts.append(old_starts[-1] + len(lines))
+        new_starts = [0]
+        for (_, lines) in rendering:
+            new_starts.append(new_starts[-1] + len(lines))
+
+        hunks = []
+        matcher = difflib.SequenceMatcher(
+           None,
+           old_keys,
+           new_keys,
+           autojunk=False
+        )
+        for (tag, i1, i2, j1, j2) in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            hunks.extend(
+               self._hunks(
+                  [l for (_, lines) in previous[i1:i2] for l in lines],
+                  [l for (_, lines) in rendering[j1:j2] for l in lines],
+                  old_starts[i1],
+                  new_starts[j1]
+               )
+            )
+
+        if not hunks:
+            return []
+        return ['--- before', '+++ after'] + hunks
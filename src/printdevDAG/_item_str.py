@@ -18,8 +18,8 @@
 # Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
 
 """
-    pydevDAG._print._helpers
-    ========================
+    printdevDAG._item_str
+    =====================
 
     Little snippets of code to print stuff.
 
@@ -32,6 +32,10 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import abc
+import os
+import re
+
+from collections import OrderedDict
 
 import six
 
@@ -41,8 +45,371 @@ import parseudev
 
 from pydevDAG import NodeTypes
 
-from pydevDAG._errors import DAGValueError
-from pydevDAG._utils import Dict
+from printdevDAG._utils import GeneralUtils
+from printdevDAG._utils import Memo
+
+
+class Lookup(object):
+    """
+    Look up values in arbitrarily nested dicts of node attributes, without
+    raising exceptions.
+
+    A path is a tuple of keys. The value of a path that can not be followed
+    to the end is None.
+    """
+
+    # functions for resolving tuples of paths, indexed by tuple of paths
+    _RESOLVERS = dict()
+
+    @staticmethod
+    def get_value(tree, path):
+        """
+        Get the value at ``path``.
+
+        :param dict tree: arbitrarily nested dict
+        :param path: the path
+        :type path: tuple of str
+
+        :returns: the value or None if there is none
+        :rtype: object
+        """
+        for key in path:
+            if not isinstance(tree, dict):
+                return None
+            tree = tree.get(key)
+        return tree
+
+    @classmethod
+    def _plan(cls, paths, depth=0):
+        """
+        Make a plan for looking up all ``paths``, which share the first
+        ``depth`` keys.
+
+        :param paths: the paths
+        :type paths: list of tuple of str
+        :param int depth: the length of the shared prefix
+
+        :returns: a plan
+        :rtype: list of tuple of str * (list of tuple of str) * list
+
+        Each element of the plan consists of the next key, the paths
+        that end with that key, and the plan for the paths that continue.
+        """
+        groups = OrderedDict()
+        for path in paths:
+            groups.setdefault(path[depth], []).append(path)
+
+        return [
+           (
+              key,
+              [p for p in group if len(p) == depth + 1],
+              cls._plan([p for p in group if len(p) > depth + 1], depth + 1)
+           ) for (key, group) in groups.items()
+        ]
+
+    @classmethod
+    def _compile(cls, paths):
+        """
+        Compile a function that looks up all ``paths``.
+
+        :param paths: the paths
+        :type paths: tuple of (tuple of str)
+
+        :returns: a function that returns the values, indexed by path
+        :rtype: dict -> (dict of (tuple of str) * object)
+
+        The generated function looks up every key of the plan exactly once,
+        without loops or recursion.
+        """
+        namespace = dict()
+        body = []
+        items = []
+
+        def generate(plan, parent, indent):
+            """
+            Generate lines for every element of ``plan``.
+
+            :param plan: the plan
+            :param str parent: the variable for the dict being looked up
+            :param str indent: the indentation
+            """
+            for (key, ends, rest) in plan:
+                index = len(namespace)
+                namespace['k_%d' % index] = key
+                var = 'v_%d' % index
+                body.append(
+                   "%s%s = %s.get(k_%d) if isinstance(%s, dict) else None" %
+                   (indent, var, parent, index, parent)
+                )
+                for path in ends:
+                    namespace['p_%d' % len(namespace)] = path
+                    items.append("p_%d: %s" % (len(namespace) - 1, var))
+                generate(rest, var, indent)
+
+        generate(cls._plan([p for p in paths if p != ()]), "tree", "    ")
+        source = "\n".join(
+           ["def resolve(tree):"] + body + \
+              ["    return {%s}" % ", ".join(items)]
+        )
+        six.exec_(compile(source, "<lookup>", "exec"), namespace)
+        return namespace['resolve']
+
+    @classmethod
+    def get_values(cls, tree, paths):
+        """
+        Get the values for all ``paths`` in a single pass over ``tree``.
+
+        :param dict tree: arbitrarily nested dict
+        :param paths: the paths
+        :type paths: tuple of (tuple of str)
+
+        :returns: the values, indexed by path
+        :rtype: dict of (tuple of str) * object
+
+        Every key along the way is looked up just once, no matter how many
+        paths it is shared by.
+        """
+        return cls.resolver(paths)(tree)
+
+    @classmethod
+    def resolver(cls, paths):
+        """
+        Get a function which does a batch lookup of ``paths``.
+
+        :param paths: the paths
+        :type paths: tuple of (tuple of str)
+
+        :returns: a function that returns the values, indexed by path
+        :rtype: dict -> (dict of (tuple of str) * object)
+        """
+        try:
+            return cls._RESOLVERS[paths]
+        except KeyError:
+            resolver = cls._compile(paths)
+            cls._RESOLVERS[paths] = resolver
+            return resolver
+
+
+class DMUUIDs(object):
+    """
+    Parse DM_UUIDs with a single shared parser, remembering the results.
+    """
+
+    # default maximum number of DM_UUIDs to remember
+    CACHE_SIZE = 2 ** 14
+
+    _PARSER = parseudev.DMUUIDParse()
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        """
+        Initializer.
+
+        :param int cache_size: maximum number of DM_UUIDs to remember
+
+        If the cache is full, the least recently used DM_UUID is evicted.
+        """
+        self._memo = Memo(self._parse, cache_size)
+
+    @classmethod
+    def _parse(cls, dm_uuid):
+        """
+        Parse ``dm_uuid``.
+
+        :param str dm_uuid: the DM_UUID
+        :returns: the fields of the DM_UUID or None if it can not be parsed
+        :rtype: dict of str * str or NoneType
+        """
+        try:
+            fields = cls._PARSER.parse(dm_uuid)
+        except parseudev.ParseError:
+            return None
+
+        # parseudev returns a pair if the DM_UUID has only a subsystem
+        if not isinstance(fields, dict):
+            (subsystem, rest) = fields
+            fields = {'subsystem' : subsystem, 'rest' : rest}
+        return fields
+
+    def parse(self, dm_uuid):
+        """
+        Get the fields of ``dm_uuid``.
+
+        :param str dm_uuid: the DM_UUID
+        :returns: the fields of the DM_UUID or None if it can not be parsed
+        :rtype: dict of str * str or NoneType
+
+        The fields are "subsystem", e.g., "LVM", "CRYPT", or "mpath", and
+        "rest", the remainder of the DM_UUID. The result is shared by every
+        caller, and must not be modified.
+        """
+        return self._memo(dm_uuid)
+
+    def cache_info(self):
+        """
+        Get statistics about the cache.
+
+        :returns: hits, misses, current and maximum size of the cache
+        :rtype: dict of str * int
+        """
+        return self._memo.cache_info()
+
+    def clear(self):
+        """
+        Forget all DM_UUIDs and reset the statistics.
+        """
+        self._memo.clear()
+
+
+class Sizes(object):
+    """
+    Format sizes in sectors, remembering the results.
+
+    Formatting is done by integer arithmetic when the justbytes
+    configuration is one for which the results are identical to justbytes'
+    results, otherwise by justbytes.
+    """
+
+    # default maximum number of distinct sizes to remember
+    CACHE_SIZE = 2 ** 12
+
+    _SECTOR = 512
+
+    _UNITS = ['B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB', 'EiB', 'ZiB', 'YiB']
+
+    # sizes in sectors for checking the configuration, chosen to include
+    # every unit, exact whole and fractional values, values which round
+    # up and down, a tie, and a value that rounds up to 1024.
+    _SAMPLES = [
+       0,
+       1,
+       2,
+       3,
+       2047,
+       2304,
+       3000,
+       4093,
+       2 ** 21 + 1,
+       1953525168,
+       2 ** 40 + 3,
+       2 ** 70 - 1,
+       2 ** 75 + 2 ** 74
+    ]
+
+    _DIGITS = re.compile(r'[0-9]+$')
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        """
+        Initializer.
+
+        :param int cache_size: maximum number of sizes to remember
+        """
+        self._memo = Memo(self._format, cache_size)
+        self._config = None
+        self._fast = False
+
+    @classmethod
+    def justbytes_str(cls, value):
+        """
+        Format ``value`` with justbytes.
+
+        :param value: a number of sectors
+        :type value: str or int
+        :rtype: str
+        """
+        return str(justbytes.Range(value, justbytes.Range(cls._SECTOR)))
+
+    @classmethod
+    def fast_str(cls, sectors):
+        """
+        Format ``sectors`` with integer arithmetic only.
+
+        :param int sectors: a non-negative number of sectors
+        :rtype: str
+
+        The result is the same as justbytes' for its default
+        configuration: binary units, the largest unit in which the value
+        is less than 1024, and two decimal places, rounding half to zero,
+        with "<" or ">" indicating the relation of the actual value to an
+        approximate one. Whole, exact values have no decimal places.
+        """
+        num_bytes = sectors * cls._SECTOR
+
+        exponent = 0
+        while exponent < len(cls._UNITS) - 1 and \
+           num_bytes >> (10 * (exponent + 1)) > 0:
+            exponent += 1
+        unit = cls._UNITS[exponent]
+
+        divisor = 1 << (10 * exponent)
+        (hundredths, remainder) = divmod(num_bytes * 100, divisor)
+        if remainder == 0:
+            (whole, fraction) = divmod(hundredths, 100)
+            if fraction == 0:
+                return "%d %s" % (whole, unit)
+            return "%d.%02d %s" % (whole, fraction, unit)
+
+        if 2 * remainder > divisor:
+            (hundredths, approx) = (hundredths + 1, "<")
+        else:
+            approx = ">"
+        (whole, fraction) = divmod(hundredths, 100)
+        return "%s %d.%02d %s" % (approx, whole, fraction, unit)
+
+    def _format(self, value):
+        """
+        Format ``value``.
+
+        :param value: a number of sectors
+        :type value: str or int
+        :rtype: str
+        """
+        if self._fast:
+            if isinstance(value, six.integer_types) and value >= 0:
+                return self.fast_str(value)
+            if isinstance(value, six.string_types) and \
+               self._DIGITS.match(value):
+                return self.fast_str(int(value))
+        return self.justbytes_str(value)
+
+    def _check_config(self):
+        """
+        Check whether justbytes' configuration has changed, and if so,
+        forget all sizes and decide whether integer arithmetic gives the
+        same results as justbytes.
+        """
+        config = justbytes.Config.STRING_CONFIG
+        if config is not self._config:
+            self._config = config
+            self._memo.clear()
+            self._fast = all(
+               self.fast_str(s) == self.justbytes_str(s) for s in self._SAMPLES
+            )
+
+    def format(self, value):
+        """
+        Format ``value``.
+
+        :param value: a number of sectors
+        :type value: str or int
+        :rtype: str
+        """
+        self._check_config()
+        return self._memo(value)
+
+    def cache_info(self):
+        """
+        Get statistics about the cache.
+
+        :returns: hits, misses, current and maximum size of the cache
+        :rtype: dict of str * int
+        """
+        return self._memo.cache_info()
+
+    def clear(self):
+        """
+        Forget all sizes and reset the statistics.
+        """
+        self._memo.clear()
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -52,9 +419,14 @@ class NodeGetter(object):
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    @abc.abstractmethod
-    def getter(node):
+    # the paths of the attributes that the getter requires
+    PATHS = ()
+
+    # relative cost of calculating the value, beyond looking it up
+    COST = 0
+
+    @classmethod
+    def getter(cls, node):
         """
         Get a function that obtains a string from a node.
 
@@ -62,201 +434,221 @@ class NodeGetter(object):
         :returns: a string to print for this node
         :rtype: str
         """
+        return cls.from_values(Lookup.get_values(node, cls.PATHS))
+
+    @staticmethod
+    @abc.abstractmethod
+    def from_values(values):
+        """
+        Obtain a string from the node's values for PATHS.
+
+        :param values: the values, indexed by path
+        :type values: dict of (tuple of str) * object
+        :returns: a string to print for this node
+        :rtype: str
+        """
         raise NotImplementedError()
 
 
-class ByPath(NodeGetter):
+class PathGetter(NodeGetter):
+    """
+    Abstract parent class of getters which require a single value.
+    """
+    # pylint: disable=too-few-public-methods, abstract-method
+
+    @classmethod
+    def getter(cls, node):
+        return cls.convert(Lookup.get_value(node, cls.PATHS[0]))
+
+    @classmethod
+    def from_values(cls, values):
+        # pylint: disable=arguments-differ
+        return cls.convert(values[cls.PATHS[0]])
+
+    @staticmethod
+    def convert(value):
+        """
+        Convert the value to a value to print.
+
+        :param object value: the value, None if missing
+        :returns: a string to print for this node
+        :rtype: str
+        """
+        return value
+
+
+class ByPath(PathGetter):
     """
     Get the value of the path devlink for the node.
     """
     # pylint: disable=too-few-public-methods
 
+    PATHS = (('DEVLINK', 'by-path'),)
+
+    COST = 1
+
     @staticmethod
-    def getter(node):
-        try:
-            links = Dict.get_value(node, ['DEVLINK', 'by-path'])
-            if links is None:
-                return None
-            else:
-                return "; ".join(str(link.value) for link in links)
-        except DAGValueError:
+    def convert(value):
+        if value is None:
             return None
+        else:
+            return "; ".join(str(link.value) for link in value)
 
 
-class Devname(NodeGetter):
+class Devname(PathGetter):
     """
     Get a name for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DEVNAME'])
-        except DAGValueError:
-            return None
+    PATHS = (('UDEV', 'DEVNAME'),)
 
 
-class Devpath(NodeGetter):
+class Devpath(PathGetter):
     """
     Get a name for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DEVPATH'])
-        except DAGValueError:
-            return None
+    PATHS = (('UDEV', 'DEVPATH'),)
 
 
-class Devtype(NodeGetter):
+class Devtype(PathGetter):
     """
     Get a device type for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DEVTYPE'])
-        except DAGValueError:
-            return None
+    PATHS = (('UDEV', 'DEVTYPE'),)
 
 
-class Dmname(NodeGetter):
+class Dmname(PathGetter):
     """
     Get a size for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'DM_NAME'])
-        except DAGValueError:
-            return None
+    PATHS = (('UDEV', 'DM_NAME'),)
 
 
-class DmUuidSubsystem(NodeGetter):
+class DmUuidSubsystem(PathGetter):
     """
     Get the subsystem prefix from the DM_UUID.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            dmuuid = Dict.get_value(node, ['UDEV', 'DM_UUID'])
-            if dmuuid is None:
-                return None
-            match_dict = parseudev.DMUUIDParse().parse(dmuuid)
-            return match_dict.get('subsystem')
-        except DAGValueError:
+    PATHS = (('UDEV', 'DM_UUID'),)
+
+    COST = 2
+
+    # parsed DM_UUIDs, shared by all getters that require DM_UUID fields
+    DM_UUIDS = DMUUIDs()
+
+    @classmethod
+    def convert(cls, value):
+        # pylint: disable=arguments-differ
+        if value is None:
             return None
+        fields = cls.DM_UUIDS.parse(value)
+        return None if fields is None else fields.get('subsystem')
 
 
-class Identifier(NodeGetter):
+class Identifier(PathGetter):
     """
     Get a name for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        return Dict.get_value(node, ['identifier'])
+    PATHS = (('identifier',),)
 
 
-class IdPath(NodeGetter):
+class IdPath(PathGetter):
     """
     Get an ID_PATH value for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'ID_PATH'])
-        except DAGValueError:
-            return None
+    PATHS = (('UDEV', 'ID_PATH'),)
 
 
-class IdSasPath(NodeGetter):
+class IdSasPath(PathGetter):
     """
     Get an ID_SAS_PATH value for a node.
     """
     # pylint: disable=too-few-public-methods
 
+    PATHS = (('UDEV', 'ID_SAS_PATH'),)
+
+
+class Major(PathGetter):
+    """
+    Get the major number for the device.
+    """
+    # pylint: disable=too-few-public-methods
+
+    PATHS = (('DEVNO',),)
+
     @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'ID_SAS_PATH'])
-        except DAGValueError:
-            return None
+    def convert(value):
+        return None if value is None else os.major(value)
 
 
-class NodeType(NodeGetter):
+class NodeType(PathGetter):
     """
     Get the type of the node.
     """
     # pylint: disable=too-few-public-methods
 
+    PATHS = (('nodetype',),)
+
     @staticmethod
-    def getter(node):
-        nodetype = node['nodetype']
-        if nodetype == NodeTypes.WWN:
+    def convert(value):
+        if value == NodeTypes.WWN:
             return "Drive"
-        elif nodetype == NodeTypes.DEVICE_PATH:
+        elif value == NodeTypes.DEVICE_PATH:
             return 'Device'
         else:
             return None
 
 
-class Size(NodeGetter):
+class Size(PathGetter):
     """
     Get a size for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            size = Dict.get_value(node, ['SYSFS', 'size'])
-            if size is None:
-                return None
-            else:
-                return str(justbytes.Range(size, justbytes.Range(512)))
-        except DAGValueError:
+    PATHS = (('SYSFS', 'size'),)
+
+    COST = 2
+
+    # formatted sizes, shared by all getters that format sizes
+    SIZES = Sizes()
+
+    @classmethod
+    def convert(cls, value):
+        # pylint: disable=arguments-differ
+        if value is None:
             return None
+        else:
+            return cls.SIZES.format(value)
 
 
-class Subsystem(NodeGetter):
+class Subsystem(PathGetter):
     """
     Get a SUBSYSTEM value for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['UDEV', 'SUBSYSTEM'])
-        except DAGValueError:
-            return None
+    PATHS = (('UDEV', 'SUBSYSTEM'),)
 
 
-class Sysname(NodeGetter):
+class Sysname(PathGetter):
     """
     Get a sysname value for a node.
     """
     # pylint: disable=too-few-public-methods
 
-    @staticmethod
-    def getter(node):
-        try:
-            return Dict.get_value(node, ['SYSNAME'])
-        except DAGValueError:
-            return None
+    PATHS = (('SYSNAME',),)
 
 
 class NodeGetters(object):
@@ -274,7 +666,51 @@ class NodeGetters(object):
     IDENTIFIER = Identifier
     IDPATH = IdPath
     IDSASPATH = IdSasPath
+    MAJOR = Major
     NODETYPE = NodeType
     SIZE = Size
     SUBSYSTEM = Subsystem
     SYSNAME = Sysname
+
+    DM_UUIDS = DmUuidSubsystem.DM_UUIDS
+    SIZES = Size.SIZES
+
+    @staticmethod
+    def is_batchable(getter):
+        """
+        Whether ``getter`` can obtain its value from a batch lookup.
+
+        :param getter: any getter
+        :rtype: bool
+        """
+        return isinstance(getter, type) and issubclass(getter, NodeGetter)
+
+    @staticmethod
+    def extractor(keys, getters):
+        """
+        Get a function that resolves every attribute path that any getter
+        requires in a single pass over the node, and then calculates the
+        values for every key from the results.
+
+        :param keys: the keys to extract values for
+        :type keys: list of str
+        :param getters: getters for each key, indexed by key
+        :type getters: dict of str * (list of NodeGetter)
+
+        :returns: a function that returns a mapping of keys to values
+        :rtype: dict -> (dict of str * (str or NoneType))
+        """
+        paths = []
+        for key in keys:
+            for getter in getters.get(key, []):
+                paths.extend(p for p in getter.PATHS if p not in paths)
+        paths = tuple(paths)
+
+        extract = GeneralUtils.extractor(
+           keys,
+           dict(
+              (k, [g.from_values for g in getters.get(k, [])]) for k in keys
+           )
+        )
+        resolve = Lookup.resolver(paths)
+        return lambda node: extract(resolve(node))
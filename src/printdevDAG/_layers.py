@@ -35,6 +35,8 @@ import itertools
 
 import pydevDAG
 
+from printdevDAG._item_str import NodeGetters
+from printdevDAG._print import Table
 from printdevDAG._utils import GeneralUtils
 
 
@@ -44,7 +46,7 @@ class GraphLineArrangementsConfig(object):
     """
     # pylint: disable=too-few-public-methods
 
-    def __init__(self, info_func, conversion_func, sort_key):
+    def __init__(self, info_func, conversion_func, sort_key, node_filter=None):
         """
         Initializer.
 
@@ -53,10 +55,13 @@ class GraphLineArrangementsConfig(object):
         :param conversion_func: converts info_func values to str
         :type conversion_func: (str * object) -> str
         :param str sort_key: the key/column name to sort on
+        :param node_filter: whether to show a node, None shows all
+        :type node_filter: (`Node` -> bool) or NoneType
         """
         self.info_func = info_func
         self.conversion_func = conversion_func
         self.sort_key = sort_key
+        self.node_filter = node_filter
 
 
 class GraphLineArrangements(object):
@@ -65,60 +70,88 @@ class GraphLineArrangements(object):
     """
     # pylint: disable=too-few-public-methods
 
+    @staticmethod
+    def layer_key(attrs):
+        """
+        The key of the layer a node belongs to, in a form that sorts, in
+        which None, which can not be compared with other values, precedes
+        every other value.
+
+        :param attrs: the attributes of the node
+        :type attrs: dict of str * object
+
+        :returns: a key for the node's layer
+        :rtype: tuple of (tuple of bool * object)
+        """
+        return tuple((v is not None, v) for v in (
+           NodeGetters.NODETYPE.getter(attrs),
+           NodeGetters.DEVTYPE.getter(attrs),
+           NodeGetters.DMUUIDSUBSYSTEM.getter(attrs),
+           NodeGetters.MAJOR.getter(attrs)
+        ))
+
     @classmethod
     def node_strings_from_graph(cls, config, graph):
         """
         Generates print information about nodes in graph.
         Starts from the roots of the graph.
-        Yields a value for each level in the graph.
+        Yields a value for each layer in each level in the graph.
 
         :param LineArrangementsConfig: config
         :param `DiGraph` graph: the graph
 
         :returns: a table of information to be used for further display
-        :rtype: tuple of int * (list of dict of str * object)
+        :rtype: tuple of tuple * Table
 
+        The layer key and the sort key of each node are calculated only
+        once, and the nodes of each level are put in their layers in a
+        single pass. Nodes that config.node_filter rejects are omitted.
         """
-        node_key_func = GeneralUtils.str_key_func_gen(
+        name_key = GeneralUtils.str_key_func_gen(
            lambda n: config.info_func(n, [config.sort_key])[config.sort_key]
         )
-        nodes = pydevDAG.BreadthFirst.nodes(
-           graph,
-           key_func=node_key_func
-        )
+        names = dict()
+        layers = dict()
 
-        levels = itertools.groupby(nodes, lambda x: x[0])
-
-        def key_func(node):
+        def node_key_func(node):
             """
-            The key for each node.
+            The sort key for each node.
 
             :param str node: the node
-
-            :returns: a key for the node
-            :rtype: tuple of object * object * object
+            :rtype: str
             """
-            attrs = graph.node[node]
-            return (
-               pydevDAG.NodeGetters.NODETYPE.getter(attrs),
-               pydevDAG.NodeGetters.DEVTYPE.getter(attrs),
-               pydevDAG.NodeGetters.DMUUIDSUBSYSTEM.getter(attrs),
-               pydevDAG.NodeGetters.MAJOR.getter(attrs)
-            )
-
-        for (_, level_nodes) in levels:
-            level_node_names = \
-               sorted(set(x[1] for x in level_nodes), key=key_func)
-            level_node_groups = itertools.groupby(level_node_names, key_func)
-
-            for (desig, node_group) in level_node_groups:
-                yield (
-                   desig,
-                   [
-                      config.info_func(
-                         n,
-                         keys=None,
-                         conv=config.conversion_func
-                      ) for n in sorted(node_group, key=node_key_func)
-                   ]
-                )
+            try:
+                return names[node]
+            except KeyError:
+                key = names[node] = name_key(node)
+                return key
+
+        nodes = pydevDAG.BreadthFirst.nodes(
+           graph,
+           key_func=node_key_func
+        )
+
+        node_filter = config.node_filter
+        for (_, level_nodes) in itertools.groupby(nodes, lambda x: x[0]):
+            groups = dict()
+            for (_, node, _) in level_nodes:
+                if node_filter is not None and not node_filter(node):
+                    continue
+                try:
+                    key = layers[node]
+                except KeyError:
+                    key = layers[node] = cls.layer_key(graph.node[node])
+                # a dict, rather than a set, so that the order is stable
+                groups.setdefault(key, dict())[node] = None
+
+            for key in sorted(groups):
+                table = Table()
+                for node in sorted(groups[key], key=node_key_func):
+                    table.append_row(
+                       config.info_func(
+                          node,
+                          keys=None,
+                          conv=config.conversion_func
+                       )
+                    )
+                yield (tuple(v for (_, v) in key), table)
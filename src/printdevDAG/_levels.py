@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._levels
+    ===================
+
+    Assign each node of a DAG to a single level.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import deque
+
+
+class GraphLevels(object):
+    """
+    Levels of the nodes in a DAG, calculated in a single topological pass.
+
+    The roots are at level 0. With SHORTEST, a node's level is the length
+    of the shortest path to it from any root, with LONGEST, the length of
+    the longest such path, so that every node is below all its parents.
+    """
+
+    SHORTEST = 'shortest'
+    LONGEST = 'longest'
+    SEMANTICS = (SHORTEST, LONGEST)
+
+    @classmethod
+    def levels(cls, graph, semantics=SHORTEST):
+        """
+        Calculate the level of every node.
+
+        :param `DiGraph` graph: the graph
+        :param str semantics: SHORTEST or LONGEST
+
+        :returns: the nodes at each level, in topological order
+        :rtype: list of list of str
+
+        :raises ValueError: if semantics is unknown or graph has a cycle
+
+        Time is O(V + E).
+        """
+        if semantics not in cls.SEMANTICS:
+            raise ValueError("unknown level semantics %s" % semantics)
+        choose = min if semantics == cls.SHORTEST else max
+
+        in_degrees = dict(graph.in_degree())
+        queue = deque(n for (n, d) in in_degrees.items() if d == 0)
+        level = dict((n, 0) for n in queue)
+        levels = []
+
+        while queue:
+            node = queue.popleft()
+            node_level = level[node]
+            # nodes are not dequeued in order of level
+            while node_level >= len(levels):
+                levels.append([])
+            levels[node_level].append(node)
+
+            for succ in graph.successors(node):
+                succ_level = level.get(succ)
+                level[succ] = node_level + 1 if succ_level is None else \
+                   choose(succ_level, node_level + 1)
+                in_degrees[succ] -= 1
+                if in_degrees[succ] == 0:
+                    queue.append(succ)
+
+        if sum(len(l) for l in levels) != len(in_degrees):
+            raise ValueError("graph has a cycle")
+
+        return levels
+
+    @classmethod
+    def nodes(cls, graph, key_func, semantics=SHORTEST):
+        """
+        Yield the nodes in order, along with their level.
+
+        :param `DiGraph` graph: the graph
+        :param key_func: key function to allow sorting of nodes
+        :type key_func: str -> object
+        :param str semantics: SHORTEST or LONGEST
+
+        :returns: the level and the node
+        :rtype: generator of tuple of int * str
+
+        Each node is yielded exactly once. Nodes are ordered by level and,
+        within a level, by key_func, and then by the node itself, so that
+        the order does not depend on the order of the nodes in the graph.
+        key_func is called once for each node.
+        """
+        for (level, level_nodes) in enumerate(cls.levels(graph, semantics)):
+            for node in sorted(level_nodes, key=lambda n: (key_func(n), n)):
+                yield (level, node)
@@ -27,4 +27,20 @@
 """
 from ._graph import GraphLineInfo
 
+from ._filter import RowFilter
+
+from ._format import RowFormatter
+
+from ._parallel import ParallelExtraction
+
 from ._print import Print
+
+from ._table import Table
+
+from ._widths import WidthTracker
+
+from ._writer import LineWriter
+
+from ._emit import RecordFormat
+
+from ._snapshot import Snapshot
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._emit
+    ========================
+
+    Formatting records for programs rather than people.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import csv
+import json
+
+from collections import OrderedDict
+
+import six
+
+
+class RecordFormat(object):
+    """
+    Formats records as lines, one line per record.
+
+    Unlike Print, no widths are calculated, so every line is produced as
+    soon as its record is, and no record is held here; whether records are
+    held elsewhere is up to their producer, see PrintGraph.records.
+
+    A record's values are None, bool, int, or str. In JSON Lines, each
+    record is an object, with the fields as its keys. In CSV and TSV, the
+    first line is the header, None is the empty string, and bools are
+    "true" and "false".
+    """
+    # pylint: disable=too-few-public-methods
+
+    JSONL = 'jsonl'
+    CSV = 'csv'
+    TSV = 'tsv'
+    FORMATS = (JSONL, CSV, TSV)
+
+    _TSV_ESCAPES = {
+       ord('\\'): '\\\\',
+       ord('\t'): '\\t',
+       ord('\n'): '\\n',
+       ord('\r'): '\\r'
+    }
+
+    @staticmethod
+    def _text(value):
+        """
+        The text for a value in CSV or TSV.
+
+        :param value: the value
+        :type value: NoneType or bool or int or str
+        :rtype: str
+        """
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        return six.text_type(value)
+
+    @classmethod
+    def _tsv_field(cls, value):
+        """
+        A TSV field, with backslash, tab, and line endings escaped.
+
+        :param value: the value
+        :type value: NoneType or bool or int or str
+        :rtype: str
+        """
+        return cls._text(value).translate(cls._TSV_ESCAPES)
+
+    @staticmethod
+    def _jsonl(fields, records):
+        """
+        Yield a JSON object for every record.
+        """
+        encode = json.JSONEncoder(separators=(',', ':')).encode
+        for record in records:
+            yield encode(OrderedDict(zip(fields, record)))
+
+    @classmethod
+    def _csv(cls, fields, records):
+        """
+        Yield a header line, then a line for every record, written by
+        csv.writer, so that fields are quoted only if they have to be.
+        """
+        text = cls._text
+        out = six.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+
+        def line(values):
+            """
+            The line for ``values``, without its line ending.
+            """
+            writer.writerow(values)
+            result = out.getvalue()[:-1]
+            out.seek(0)
+            out.truncate()
+            return result
+
+        yield line(fields)
+        for record in records:
+            yield line([text(v) for v in record])
+
+    @classmethod
+    def _tsv(cls, fields, records):
+        """
+        Yield a header line, then a line of fields for every record.
+        """
+        field = cls._tsv_field
+        join = '\t'.join
+        yield join(field(f) for f in fields)
+        for record in records:
+            yield join([field(v) for v in record])
+
+    @classmethod
+    def lines(cls, fmt, fields, records):
+        """
+        Yield a line for every record.
+
+        :param str fmt: one of FORMATS
+        :param fields: the names of the values in each record
+        :type fields: list of str
+        :param records: the records, each with a value for every field
+        :type records: iterable of list
+
+        :returns: the lines, without line endings
+        :rtype: generator of str
+
+        :raises ValueError: if fmt is not one of FORMATS
+        """
+        if fmt == cls.JSONL:
+            return cls._jsonl(fields, records)
+        if fmt == cls.CSV:
+            return cls._csv(fields, records)
+        if fmt == cls.TSV:
+            return cls._tsv(fields, records)
+        raise ValueError("unknown format %s" % fmt)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._filter
+    ==========================
+
+    Selecting rows by the values in their columns.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+class RowFilter(object):
+    """
+    A conjunction of predicates, each on the value in a single column.
+
+    A predicate is applied to the value as GraphLineInfo.info returns it,
+    without conversion to str; None if the value is missing.
+    """
+
+    def __init__(self, clauses=()):
+        """
+        Initializer.
+
+        :param clauses: pairs of a column name and a predicate on its value
+        :type clauses: iterable of (tuple of str * (object -> bool))
+        """
+        self.clauses = list(clauses)
+
+    def add(self, key, predicate):
+        """
+        Add a clause.
+
+        :param str key: the column name
+        :param predicate: the predicate
+        :type predicate: object -> bool
+
+        :returns: the filter
+        :rtype: RowFilter
+        """
+        self.clauses.append((key, predicate))
+        return self
+
+    @classmethod
+    def equal(cls, values):
+        """
+        A filter that requires that the value in every column is equal to
+        the given str, when converted to a str.
+
+        :param values: the values, indexed by column name
+        :type values: dict of str * str
+
+        :returns: the filter
+        :rtype: RowFilter
+        """
+        return cls(
+           (k, lambda v, value=value: str(v) == value) for \
+              (k, value) in sorted(values.items())
+        )
+
+    @property
+    def keys(self):
+        """
+        The columns that the filter uses, each just once, in order.
+
+        :rtype: list of str
+        """
+        keys = []
+        for (key, _) in self.clauses:
+            if key not in keys:
+                keys.append(key)
+        return keys
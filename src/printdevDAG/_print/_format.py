@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._format
+    ==========================
+
+    Compiled formatting of the rows of a table.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from printdevDAG._utils import Memo
+
+
+class RowFormatter(object):
+    """
+    Formats the header and rows of a table with a particular layout.
+
+    The rows are formatted with a single %-format string for the layout,
+    which pads and truncates every value and joins them all at once,
+    and which is faster than str.format with either named or positional
+    fields.
+    """
+    # pylint: disable=too-few-public-methods
+
+    # maximum number of layouts to remember formatters for
+    CACHE_SIZE = 2 ** 8
+
+    _CONVERSIONS = {'<' : '%%-%d%ss', '>' : '%%%d%ss'}
+
+    def __init__(self, layout):
+        """
+        Initializer.
+
+        :param layout: the layout
+        :type layout: see layout()
+        """
+        (column_headers, column_widths, alignment, max_widths) = layout
+        self.header = "".join(
+           '{:%s%d}' % (a, w) for (a, w) in zip(alignment, column_widths)
+        ).format(*column_headers)
+        self.format_row = self._format_row_func(
+           column_widths,
+           alignment,
+           max_widths
+        )
+
+    @classmethod
+    def _format_row_func(cls, column_widths, alignment, max_widths):
+        """
+        Get a function that formats a single row.
+
+        :param column_widths: the width of each column
+        :type column_widths: tuple of int
+        :param alignment: the alignment of each column
+        :type alignment: tuple of str
+        :param max_widths: the maximum width of each value or None
+        :type max_widths: tuple of int or NoneType
+
+        :returns: a function that formats a row
+        :rtype: (sequence of str) -> str
+
+        %-format strings can not center a value, so if any column is
+        aligned other than to the left or right, rows are formatted with
+        a positional str.format string instead.
+        """
+        precisions = [""] * len(column_widths) if max_widths is None else \
+           [".%d" % m for m in max_widths]
+
+        if all(a in cls._CONVERSIONS for a in alignment):
+            pattern = "".join(
+               cls._CONVERSIONS[a] % (w, p) for \
+                  (a, w, p) in zip(alignment, column_widths, precisions)
+            )
+            return lambda row: pattern % tuple(row)
+
+        fmt_str = "".join(
+           '{%d:%s%d%s}' % (i, a, w, p) for \
+              (i, (a, w, p)) in \
+              enumerate(zip(alignment, column_widths, precisions))
+        )
+        return lambda row: fmt_str.format(*row)
+
+    @staticmethod
+    def layout(column_headers, column_widths, alignment, max_widths=None):
+        """
+        The layout of a table, a hashable value.
+
+        :param column_headers: column headers
+        :type column_headers: list of str
+        :param column_widths: map of widths of each column
+        :type column_widths: dict of str * int
+        :param alignment: alignment for column headers
+        :type alignment: dict of str * str {'<', '>', '^'}
+        :param max_widths: maximum width of each value, if any
+        :type max_widths: dict of str * int or NoneType
+
+        :returns: the layout
+        :rtype: tuple
+        """
+        return (
+           tuple(column_headers),
+           tuple(column_widths[k] for k in column_headers),
+           tuple(alignment[k] for k in column_headers),
+           None if max_widths is None else \
+              tuple(max_widths[k] for k in column_headers)
+        )
+
+    @classmethod
+    def get(cls, column_headers, column_widths, alignment, max_widths=None):
+        """
+        Get a formatter for a layout, compiling it only if necessary.
+
+        :param column_headers: column headers
+        :type column_headers: list of str
+        :param column_widths: map of widths of each column
+        :type column_widths: dict of str * int
+        :param alignment: alignment for column headers
+        :type alignment: dict of str * str {'<', '>', '^'}
+        :param max_widths: maximum width of each value, if any
+        :type max_widths: dict of str * int or NoneType
+
+        :returns: the formatter
+        :rtype: RowFormatter
+
+        If max_widths is specified, longer values are truncated.
+        """
+        return _FORMATTERS(
+           cls.layout(column_headers, column_widths, alignment, max_widths)
+        )
+
+
+# formatters, indexed by layout
+_FORMATTERS = Memo(RowFormatter, RowFormatter.CACHE_SIZE)
@@ -31,16 +31,33 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from collections import OrderedDict
+
+from printdevDAG._item_str import NodeGetters
 from printdevDAG._utils import GeneralUtils
 
 
 class GraphLineInfo(object):
     """
     Class that generates info for a single line that represents a graph.
+
+    Values are calculated for each node and column just once and cached,
+    so that the cache must be invalidated if the graph changes.
     """
-    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, graph, keys, alignment, getters):
+    # default maximum number of nodes for which values are cached
+    CACHE_SIZE = 2 ** 17
+
+    def __init__( # pylint: disable=too-many-arguments
+       self,
+       graph,
+       keys,
+       alignment,
+       getters,
+       cache_size=CACHE_SIZE,
+       lazy=()
+    ):
         """
         Initializer.
 
@@ -50,17 +67,228 @@ class GraphLineInfo(object):
         :type alignment: dict of str * str {'<', '>', '^'}
         :param getters: getters for each column, indexed by column name
         :type getters: map of str * NodeGetter
+        :param cache_size: maximum number of nodes to cache values for
+        :type cache_size: int or NoneType
+        :param lazy: keys whose values are never prefetched
+        :type lazy: iterable of str
+
+        If cache_size is None, the cache is unbounded, if 0, nothing is
+        cached. If the cache is full, the least recently used node's values
+        are evicted.
+
+        getters may have getters for columns which are not in keys, e.g.,
+        the sort key. Their values are calculated only when requested
+        explicitly, and only for the nodes they are requested for.
+
+        The values for lazy keys are calculated only when a node's row is,
+        so that the values for rows which are never shown, because they are
+        filtered out or outside a window, are never calculated. Only
+        prefetch() calculates values in advance, so lazy makes a difference
+        only if it is used; otherwise every key's values are calculated when
+        a node's row is. Lazy values are calculated with the rest of the
+        row; they are not passed on to be calculated when formatted.
         """
         self.keys = keys
         self.alignment = alignment
         self.graph = graph
+        self.lazy = frozenset(lazy)
+
+        # getters, indexed by column name
+        self._getters = dict(getters)
+
+        # compiled extractors, indexed by tuple of column names
+        self._extractors = dict()
+
+        # values, indexed by node, then column name, least recent first
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    def invalidate(self, node=None):
+        """
+        Invalidate cached values.
+
+        :param node: the node to invalidate values for, or None for all
+        :type node: `Node` or NoneType
+        """
+        if node is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(node, None)
+
+    def _values(self, node, keys):
+        """
+        Get the values for ``node``, calculating any not already cached.
+
+        :param `Node` node: the node
+        :param keys: list of keys for values
+        :type keys: list of str
+
+        :returns: a mapping of keys to values, including at least keys
+        :rtype: dict of str * object
+        """
+        cache = self._cache
+        try:
+            values = cache.pop(node)
+        except KeyError:
+            values = dict()
+            if self._cache_size is not None and \
+               len(cache) >= self._cache_size > 0:
+                cache.popitem(last=False)
+
+        if self._cache_size != 0:
+            cache[node] = values
+
+        missing = tuple(k for k in keys if k not in values)
+        if missing:
+            try:
+                extractor = self._extractors[missing]
+            except KeyError:
+                extractor = self._extractor(missing)
+                self._extractors[missing] = extractor
+            values.update(extractor(self.graph.node[node]))
+        return values
+
+    def _extractor(self, keys):
+        """
+        Get a function that extracts the values for ``keys`` from a node.
+
+        :param keys: the keys
+        :type keys: tuple of str
 
-        # functions, indexed by column name
-        self._funcs = dict(
-           (k, GeneralUtils.composer([g.getter for g in getters[k]])) \
-              for k in keys
+        :returns: a function that returns a mapping of keys to values
+        :rtype: dict -> (dict of str * (str or NoneType))
+        """
+        return self.extractor(
+           keys,
+           dict((k, self._getters.get(k, [])) for k in keys)
         )
 
+    @staticmethod
+    def extractor(keys, getters):
+        """
+        Get a function that extracts the values for ``keys`` from a node.
+
+        :param keys: the keys
+        :type keys: tuple of str
+        :param getters: getters for each column, indexed by column name
+        :type getters: map of str * NodeGetter
+
+        :returns: a function that returns a mapping of keys to values
+        :rtype: dict -> (dict of str * (str or NoneType))
+
+        If every getter can get its values from a batch lookup, all the
+        attributes that the getters need are looked up in a single pass.
+        """
+        if all(
+           NodeGetters.is_batchable(g) for k in keys for g in getters[k]
+        ):
+            return NodeGetters.extractor(keys, getters)
+        return GeneralUtils.extractor(
+           keys,
+           dict((k, [g.getter for g in getters[k]]) for k in keys)
+        )
+
+    def prefetch(self, extraction, nodes=None, keys=None):
+        """
+        Calculate the values for ``keys`` for ``nodes``, all at once.
+
+        :param ParallelExtraction extraction: the extraction engine
+        :param nodes: the nodes, or None for every node in the graph
+        :type nodes: list of `Node` or NoneType
+        :param keys: the keys, or None for every key that is not lazy
+        :type keys: list of str or NoneType
+
+        At most cache_size nodes' values are kept, so that prefetching is
+        only useful if the cache is unbounded or large enough.
+        """
+        if nodes is None:
+            nodes = list(self.graph)
+        if keys is None:
+            keys = [k for k in self.keys if k not in self.lazy]
+        values = extraction.extract(
+           [self.graph.node[n] for n in nodes],
+           keys,
+           self._getters
+        )
+        for (node, node_values) in zip(nodes, values):
+            self._values(node, []).update(node_values)
+
+    def restore(self, snapshot, nodes=None):
+        """
+        Take the values for ``nodes`` from ``snapshot``, for every node
+        whose attributes are unchanged since the snapshot was written.
+
+        :param Snapshot snapshot: the snapshot
+        :param nodes: the nodes, or None for every node in the graph
+        :type nodes: list of `Node` or NoneType
+
+        :returns: the nodes whose values were not in the snapshot
+        :rtype: list of `Node`
+
+        As with prefetch, only the values of at most cache_size nodes are
+        kept.
+        """
+        if nodes is None:
+            nodes = list(self.graph)
+        stale = []
+        attrs = self.graph.node
+        for node in nodes:
+            values = snapshot.values(node, attrs[node])
+            if values is None:
+                stale.append(node)
+            else:
+                self._values(node, []).update(values)
+        return stale
+
+    def cost(self, key):
+        """
+        The relative cost of calculating the value for ``key``.
+
+        :param str key: the column name
+        :rtype: int
+
+        Every getter costs 1 for looking up its value, plus its COST; a
+        getter which is not a NodeGetter is assumed to cost 2.
+        """
+        return sum(
+           1 + getattr(g, 'COST', 1) for g in self._getters.get(key, [])
+        )
+
+    def selector(self, row_filter):
+        """
+        Get a function that determines whether a node's row is accepted by
+        ``row_filter``.
+
+        :param RowFilter row_filter: the filter
+        :returns: a function that returns True if the row is accepted
+        :rtype: `Node` -> bool
+
+        The clauses are applied in order of the cost of their column, the
+        cheapest first, and the value for a column is calculated only when
+        a clause requires it, so that if a node's row is rejected, the
+        values for the other columns are never calculated.
+        """
+        clauses = [
+           (key, [key], [p for (k, p) in row_filter.clauses if k == key]) \
+              for key in sorted(row_filter.keys, key=self.cost)
+        ]
+
+        def accepts(node):
+            """
+            Whether the row for ``node`` is accepted.
+
+            :param `Node` node: the node
+            :rtype: bool
+            """
+            for (key, keys, predicates) in clauses:
+                value = self._values(node, keys)[key]
+                for predicate in predicates:
+                    if not predicate(value):
+                        return False
+            return True
+
+        return accepts
+
     def info(self, node, keys=None, conv=lambda k, v: v):
         """
         Function to generate information to be printed for ``node``.
@@ -83,9 +311,5 @@ class GraphLineInfo(object):
         if keys is None:
             keys = self.keys
 
-        return dict(
-           (
-              k,
-              conv(k, self._funcs.get(k, lambda n: None)(self.graph.node[node]))
-           ) for k in keys
-        )
+        values = self._values(node, keys)
+        return dict((k, conv(k, values[k])) for k in keys)
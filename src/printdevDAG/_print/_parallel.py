@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._parallel
+    ============================
+
+    Extracting the values for many nodes in parallel.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import multiprocessing
+import os
+import threading
+
+try:
+    from concurrent import futures
+except ImportError: # pragma: no cover
+    futures = None
+
+import pydevDAG
+
+from ._graph import GraphLineInfo
+
+
+# pydevDAG's node types are singletons which can not be pickled, so they
+# are sent to other processes as their index in this list.
+_NODETYPES = pydevDAG.NodeTypes.values()
+
+
+def _pack(attrs):
+    """
+    Make the attributes of a node picklable.
+
+    :param dict attrs: the attributes
+    :returns: the attributes, with the node type replaced by an index
+    :rtype: dict
+    """
+    nodetype = attrs.get('nodetype')
+    if nodetype is None:
+        return attrs
+    packed = dict(attrs)
+    packed['nodetype'] = _NODETYPES.index(nodetype)
+    return packed
+
+
+def _unpack(attrs):
+    """
+    Restore the attributes of a node after pickling.
+
+    :param dict attrs: the attributes, as packed by _pack
+    :returns: the attributes
+    :rtype: dict
+    """
+    if attrs.get('nodetype') is not None:
+        attrs['nodetype'] = _NODETYPES[attrs['nodetype']]
+    return attrs
+
+
+def _extract_chunk(keys, getters, chunk):
+    """
+    Extract the values for a chunk of nodes.
+
+    :param keys: the keys
+    :type keys: tuple of str
+    :param getters: getters for each column, indexed by column name
+    :type getters: map of str * NodeGetter
+    :param chunk: the attributes of each node
+    :type chunk: list of dict
+
+    :returns: the values for each node, indexed by key
+    :rtype: list of dict of str * object
+    """
+    extract = GraphLineInfo.extractor(keys, getters)
+    return [extract(attrs) for attrs in chunk]
+
+
+# the attributes of every node, inherited by forked processes
+_ATTRS = []
+
+# held from setting _ATTRS until the processes which inherit it are forked
+_ATTRS_LOCK = threading.Lock()
+
+
+def _extract_range(keys, getters, start, end):
+    """
+    Extract the values for a range of nodes in a forked process.
+
+    :param keys: the keys
+    :type keys: tuple of str
+    :param getters: getters for each column, indexed by column name
+    :type getters: map of str * NodeGetter
+    :param int start: the index of the first node
+    :param int end: the index after the last node
+
+    :returns: the values for each node, indexed by key
+    :rtype: list of dict of str * object
+
+    The attributes are those inherited from the parent process in _ATTRS,
+    so that they need not be pickled.
+    """
+    return _extract_chunk(keys, getters, _ATTRS[start:end])
+
+
+def _extract_packed_chunk(keys, getters, chunk):
+    """
+    Extract the values for a chunk of nodes in another process.
+
+    :param keys: the keys
+    :type keys: tuple of str
+    :param getters: getters for each column, indexed by column name
+    :type getters: map of str * NodeGetter
+    :param chunk: the packed attributes of each node
+    :type chunk: list of dict
+
+    :returns: the values for each node, indexed by key
+    :rtype: list of dict of str * object
+
+    This is a module level function, so that it can be run in another
+    process.
+    """
+    return _extract_chunk(keys, getters, [_unpack(a) for a in chunk])
+
+
+class ParallelExtraction(object):
+    """
+    Extracts the values for many nodes, in a pool of processes if there
+    are enough nodes for that to pay off.
+
+    The nodes are divided into chunks of consecutive nodes, and the values
+    are returned in the order of the nodes. If processes are forked, each
+    inherits the attributes of all the nodes and is sent just the bounds
+    of its chunks; otherwise, it is sent the attributes of the nodes of its
+    chunks, which must be picklable, except for the node type. The
+    values, in turn, must be picklable.
+
+    Parallel extraction requires concurrent.futures; without it, or with
+    fewer than two workers, the values are extracted in this process.
+    """
+    # pylint: disable=too-few-public-methods
+
+    # number of nodes in a chunk
+    CHUNK_SIZE = 2 ** 11
+
+    # minimum number of nodes for which to extract in parallel
+    THRESHOLD = 2 ** 13
+
+    def __init__(self, workers=None, chunk_size=CHUNK_SIZE, threshold=THRESHOLD):
+        """
+        Initializer.
+
+        :param workers: number of processes, if None, the number of CPUs
+        :type workers: int or NoneType
+        :param int chunk_size: number of nodes in a chunk
+        :param int threshold: minimum number of nodes to use processes for
+        """
+        self.workers = multiprocessing.cpu_count() if workers is None \
+           else workers
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+
+    def parallel(self, num_nodes):
+        """
+        Whether to extract the values for ``num_nodes`` nodes in parallel.
+
+        :param int num_nodes: the number of nodes
+        :rtype: bool
+        """
+        return futures is not None and self.workers > 1 and \
+           num_nodes >= self.threshold
+
+    def extract(self, attrs, keys, getters):
+        """
+        Extract the values for every node.
+
+        :param attrs: the attributes of every node
+        :type attrs: list of dict
+        :param keys: the keys
+        :type keys: list of str
+        :param getters: getters for each column, indexed by column name
+        :type getters: map of str * NodeGetter
+
+        :returns: the values for each node, indexed by key, in order
+        :rtype: list of dict of str * object
+
+        The getters must be picklable, e.g., NodeGetter classes, in order
+        for values to be extracted in parallel.
+        """
+        keys = tuple(keys)
+        getters = dict((k, list(getters.get(k, []))) for k in keys)
+
+        if not self.parallel(len(attrs)):
+            return _extract_chunk(keys, getters, attrs)
+
+        starts = list(range(0, len(attrs), self.chunk_size))
+        ends = starts[1:] + [len(attrs)]
+        if self._forks():
+            func = _extract_range
+            args = [starts, ends]
+        else: # pragma: no cover
+            func = _extract_packed_chunk
+            args = [[[_pack(a) for a in attrs[s:e]] for (s, e) in \
+               zip(starts, ends)]]
+
+        global _ATTRS # pylint: disable=global-statement
+        with futures.ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # map submits every chunk at once, and the processes are forked
+            # as the chunks are submitted, so each inherits these attributes
+            with _ATTRS_LOCK:
+                _ATTRS = attrs
+                try:
+                    results = pool.map(
+                       func,
+                       [keys] * len(starts),
+                       [getters] * len(starts),
+                       *args
+                    )
+                finally:
+                    _ATTRS = []
+            return [values for chunk in results for values in chunk]
+
+    @staticmethod
+    def _forks():
+        """
+        Whether new processes are forked, and so inherit the attributes.
+
+        :rtype: bool
+        """
+        try:
+            return multiprocessing.get_start_method() == 'fork'
+        except AttributeError: # pragma: no cover
+            return os.name == 'posix'
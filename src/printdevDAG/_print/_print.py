@@ -31,7 +31,10 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import functools
+from ._format import RowFormatter
+from ._spill import RowSpill
+from ._table import Table
+from ._widths import WidthTracker
 
 
 class Print(object):
@@ -53,13 +56,10 @@ class Print(object):
         :returns: a table of key/length pairs
         :rtype: dict of str * int
         """
-        widths = functools.reduce(
-           lambda d, l: dict((k, max(len(l[k]), d[k])) for k in l),
-           lines,
-           dict((k, len(k)) for k in column_headers)
-        )
-
-        return dict((k, widths[k] + padding) for k in widths)
+        tracker = WidthTracker(column_headers)
+        for line in lines:
+            tracker.add_row(line)
+        return tracker.widths(padding)
 
     @staticmethod
     def header_str(column_widths, column_headers, alignment):
@@ -82,7 +82,7 @@ class Print(object):
         return format_str.format(*column_headers)
 
     @staticmethod
-    def format_str(column_widths, column_headers, alignment):
+    def format_str(column_widths, column_headers, alignment, max_widths=None):
         """
         Format string for every data value.
 
@@ -92,32 +92,240 @@ class Print(object):
         :type column_headers: list of str
         :param alignment: alignment for column headers
         :type alignment: dict of str * str {'<', '>', '^'}
+        :param max_widths: maximum width of each value, if any
+        :type max_widths: dict of str * int or NoneType
 
         :returns: a format string
         :rtype: str
+
+        If max_widths is specified, longer values are truncated.
         """
+        if max_widths is None:
+            return "".join(
+               '{%s:%s%d}' % (k, alignment[k], column_widths[k]) \
+                  for k in column_headers
+            )
         return "".join(
-           '{%s:%s%d}' % (k, alignment[k], column_widths[k]) \
+           '{%s:%s%d.%d}' % (k, alignment[k], column_widths[k], max_widths[k])\
               for k in column_headers
         )
 
+    @staticmethod
+    def row_format_str(
+       column_widths,
+       column_headers,
+       alignment,
+       max_widths=None
+    ):
+        """
+        Format string for every row, with values given by position.
+
+        :param column_widths: map of widths of each column
+        :type column_widths: dict of str * int
+        :param column_headers: column headers
+        :type column_headers: list of str
+        :param alignment: alignment for column headers
+        :type alignment: dict of str * str {'<', '>', '^'}
+        :param max_widths: maximum width of each value, if any
+        :type max_widths: dict of str * int or NoneType
+
+        :returns: a format string
+        :rtype: str
+
+        If max_widths is specified, longer values are truncated.
+        """
+        if max_widths is None:
+            return "".join(
+               '{%d:%s%d}' % (i, alignment[k], column_widths[k]) \
+                  for (i, k) in enumerate(column_headers)
+            )
+        return "".join(
+           '{%d:%s%d.%d}' % (i, alignment[k], column_widths[k], max_widths[k])\
+              for (i, k) in enumerate(column_headers)
+        )
+
+    @classmethod
+    def _table_lines(cls, column_headers, table, padding, alignment):
+        """
+        Yield lines to be printed from a table.
+
+        :param column_headers: column headers
+        :type column_headers: list of str
+        :param Table table: the table
+        :param int padding: number of spaces to pad on right
+        :param alignment: alignment for column headers
+        :type alignment: dict of str * str {'<', '>', '^'}
+        """
+        column_widths = table.widths(column_headers, padding)
+
+        formatter = RowFormatter.get(column_headers, column_widths, alignment)
+        yield formatter.header
+
+        format_row = formatter.format_row
+        for row in table.rows(column_headers):
+            yield format_row(row)
+
+    @classmethod
+    def _spilled_lines(cls, column_headers, rows, padding, alignment):
+        """
+        Yield lines to be printed, storing rows in a temporary file while
+        calculating column widths.
+
+        :param column_headers: column headers
+        :type column_headers: list of str
+        :param rows: rows, with values in the order of column_headers
+        :type rows: iterable of sequence of str
+        :param int padding: number of spaces to pad on right
+        :param alignment: alignment for column headers
+        :type alignment: dict of str * str {'<', '>', '^'}
+        """
+        tracker = WidthTracker(column_headers)
+        with RowSpill() as spill:
+            for row in rows:
+                spill.write(row)
+                tracker.add(row)
+
+            column_widths = tracker.widths(padding)
+            formatter = RowFormatter.get(
+               column_headers,
+               column_widths,
+               alignment
+            )
+            yield formatter.header
+
+            format_row = formatter.format_row
+            for row in spill.rows():
+                yield format_row(row)
+
+    @classmethod
+    def _streamed_lines( # pylint: disable=too-many-arguments
+       cls,
+       column_headers,
+       rows,
+       padding,
+       alignment,
+       widths
+    ):
+        """
+        Yield lines to be printed, each as soon as its row is available.
+
+        :param column_headers: column headers
+        :type column_headers: list of str
+        :param rows: rows, with values in the order of column_headers
+        :type rows: iterable of sequence of str
+        :param int padding: number of spaces to pad on right
+        :param alignment: alignment for column headers
+        :type alignment: dict of str * str {'<', '>', '^'}
+        :param widths: maximum width of the values in each column
+        :type widths: dict of str * int
+        """
+        max_widths = dict((k, max(widths[k], len(k))) for k in column_headers)
+        column_widths = dict((k, max_widths[k] + padding) for k in max_widths)
+
+        formatter = RowFormatter.get(
+           column_headers,
+           column_widths,
+           alignment,
+           max_widths
+        )
+        yield formatter.header
+
+        format_row = formatter.format_row
+        for row in rows:
+            yield format_row(row)
+
     @classmethod
-    def lines(cls, column_headers, lines, padding, alignment):
+    def row_lines( # pylint: disable=too-many-arguments
+       cls,
+       column_headers,
+       rows,
+       padding,
+       alignment,
+       widths=None,
+       spill=False
+    ):
         """
         Yield lines to be printed.
 
         :param column_headers: column headers
         :type column_headers: list of str
-        :param lines: line infos
-        :type lines: list of dict
+        :param rows: rows, with values in the order of column_headers
+        :type rows: Table or iterable of sequence of str
         :param int padding: number of spaces to pad on right
         :param alignment: alignment for column headers
         :type alignment: dict of str * str {'<', '>', '^'}
+        :param widths: maximum width of the values in each column
+        :type widths: dict of str * int or NoneType
+        :param bool spill: whether to store rows in a temporary file
+
+        By default, all rows are held in memory in a Table, so that column
+        widths can be calculated before the header is printed.
+
+        If widths is specified, every row is printed as soon as it is
+        available; a column is at least as wide as its header, and values
+        that are too wide for their column are truncated.
+
+        Otherwise, if spill is True, rows are stored in a temporary file
+        while the column widths are calculated, and then read back.
+
+        In either case, no rows are held in memory here; whether the
+        memory used depends on the number of rows is up to the producer
+        of the rows, see PrintGraph.depth_first.
         """
-        column_widths = cls.calculate_widths(column_headers, lines, padding)
+        if widths is not None:
+            if isinstance(rows, Table):
+                rows = rows.rows(column_headers)
+            return cls._streamed_lines(
+               column_headers,
+               rows,
+               padding,
+               alignment,
+               widths
+            )
 
-        yield cls.header_str(column_widths, column_headers, alignment)
+        if isinstance(rows, Table):
+            table = rows
+        elif spill:
+            return cls._spilled_lines(column_headers, rows, padding, alignment)
+        else:
+            table = Table(column_headers)
+            for row in rows:
+                table.append(row)
+        return cls._table_lines(column_headers, table, padding, alignment)
 
-        fmt_str = cls.format_str(column_widths, column_headers, alignment)
-        for line in lines:
-            yield fmt_str.format(**line)
+    @classmethod
+    def lines( # pylint: disable=too-many-arguments
+       cls,
+       column_headers,
+       lines,
+       padding,
+       alignment,
+       widths=None,
+       spill=False
+    ):
+        """
+        Yield lines to be printed.
+
+        :param column_headers: column headers
+        :type column_headers: list of str
+        :param lines: line infos
+        :type lines: Table or iterable of dict
+        :param int padding: number of spaces to pad on right
+        :param alignment: alignment for column headers
+        :type alignment: dict of str * str {'<', '>', '^'}
+        :param widths: maximum width of the values in each column
+        :type widths: dict of str * int or NoneType
+        :param bool spill: whether to store rows in a temporary file
+
+        See row_lines for the meaning of widths and spill.
+        """
+        if not isinstance(lines, Table):
+            lines = ([l[k] for k in column_headers] for l in lines)
+        return cls.row_lines(
+           column_headers,
+           lines,
+           padding,
+           alignment,
+           widths=widths,
+           spill=spill
+        )
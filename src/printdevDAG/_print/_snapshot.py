@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._snapshot
+    ============================
+
+    Snapshots of a graph and the values extracted for its nodes.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+import networkx as nx
+
+import six
+
+
+class Snapshot(object):
+    """
+    A read-only, memory-mapped snapshot of a graph's structure, and of the
+    values extracted for every node, written by an earlier run.
+
+    Each node's values are stored with a fingerprint of the node's
+    attributes, so that the values of a node whose attributes are
+    unchanged can be reused instead of extracted again.
+
+    The file consists of a header, an offset for every distinct string,
+    the keys, a fixed size record for every node, the edges, and the
+    strings themselves. Integers are little endian, unsigned 32 bit. Each
+    node record is its name, its fingerprint and a value for every key,
+    each string or value being an index into the strings; a string is
+    decoded only when it is needed.
+
+    Values that are not None or ints are stored as their text.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    MAGIC = b'PDAGSNAP'
+    VERSION = 1
+
+    # the attribute that holds the fingerprint of a node of graph()
+    FINGERPRINT = 'SNAPSHOT_FINGERPRINT'
+
+    # magic, version, number of nodes, edges, keys and strings
+    _HEADER = struct.Struct(str('<8sIIIII'))
+    _INDEX = struct.Struct(str('<I'))
+    _SPAN = struct.Struct(str('<II'))
+    _EDGE = struct.Struct(str('<II'))
+    _FINGERPRINT_SIZE = hashlib.sha1().digest_size
+
+    # the index of the value None
+    NONE = 0xffffffff
+
+    _ENCODER = json.JSONEncoder(
+       check_circular=False,
+       sort_keys=True,
+       separators=(',', ':'),
+       default=repr
+    )
+
+    def __init__(self, data):
+        """
+        Initializer.
+
+        :param data: the contents of a snapshot file
+        :type data: mmap or bytes
+
+        :raises ValueError: if data is not a snapshot of this version
+        """
+        if len(data) < self._HEADER.size:
+            raise ValueError("not a snapshot")
+        (magic, version, num_nodes, num_edges, num_keys, num_strings) = \
+           self._HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("not a snapshot of version %d" % self.VERSION)
+
+        self._data = data
+        self._record = self._node_struct(num_keys)
+        self._num_nodes = num_nodes
+        self._num_edges = num_edges
+
+        self._offsets = self._HEADER.size
+        self._keys = self._offsets + (num_strings + 1) * self._INDEX.size
+        self._nodes = self._keys + num_keys * self._INDEX.size
+        self._edges = self._nodes + num_nodes * self._record.size
+        self._strings = self._edges + num_edges * self._EDGE.size
+        if len(data) < self._strings or \
+           len(data) < self._strings + self._offset(num_strings):
+            raise ValueError("snapshot is truncated")
+
+        # decoded strings, indexed by their index
+        self._decoded = {self.NONE: None}
+
+        # node records, indexed by node name, built when first needed
+        self._index = None
+
+        self.keys = [
+           self._value(self._index_at(self._keys, i)) for i in range(num_keys)
+        ]
+
+    @classmethod
+    def _node_struct(cls, num_keys):
+        """
+        The layout of a node record.
+
+        :param int num_keys: the number of keys
+        :rtype: struct.Struct
+        """
+        return struct.Struct(
+           str('<I%ds%dI' % (cls._FINGERPRINT_SIZE, num_keys))
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Map a snapshot file into memory.
+
+        :param str path: the file
+        :returns: the snapshot
+        :rtype: Snapshot
+
+        :raises EnvironmentError: if the file can not be read
+        :raises ValueError: if the file is not a snapshot of this version
+        """
+        with open(path, 'rb') as snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size == 0:
+                raise ValueError("not a snapshot")
+            data = mmap.mmap(
+               snapshot_file.fileno(),
+               0,
+               access=mmap.ACCESS_READ
+            )
+        try:
+            return cls(data)
+        except ValueError:
+            data.close()
+            raise
+
+    def close(self):
+        """
+        Unmap the snapshot. Values already obtained remain valid.
+        """
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._num_nodes
+
+    @staticmethod
+    def fingerprint(attrs):
+        """
+        The fingerprint of a node's attributes.
+
+        :param dict attrs: the attributes
+        :rtype: bytes
+
+        The attributes are encoded as JSON, with dict keys sorted and any
+        other values as their repr, so an attribute whose repr differs
+        between runs makes its node's values always appear changed.
+        A node of graph() has its fingerprint as an attribute.
+        """
+        fingerprint = attrs.get(Snapshot.FINGERPRINT)
+        if fingerprint is not None:
+            return fingerprint
+        encoded = Snapshot._ENCODER.encode(attrs)
+        return hashlib.sha1(encoded.encode('utf-8')).digest()
+
+    def _index_at(self, start, index):
+        """
+        The integer at ``index`` in the array at ``start``.
+
+        :param int start: the offset of the array
+        :param int index: the index in the array
+        :rtype: int
+        """
+        return self._INDEX.unpack_from(
+           self._data,
+           start + index * self._INDEX.size
+        )[0]
+
+    def _offset(self, index):
+        """
+        The offset of string ``index`` from the start of the strings.
+
+        :param int index: the index
+        :rtype: int
+        """
+        return self._index_at(self._offsets, index)
+
+    def _decode(self, index):
+        """
+        Decode the value at ``index`` in the strings.
+
+        :param int index: the index, not that of None
+        :rtype: int or str
+        """
+        (start, end) = self._SPAN.unpack_from(
+           self._data,
+           self._offsets + index * self._INDEX.size
+        )
+        encoded = self._data[self._strings + start:self._strings + end]
+        if encoded[:1] == b'i':
+            value = int(encoded[1:])
+        else:
+            value = encoded[1:].decode('utf-8')
+        self._decoded[index] = value
+        return value
+
+    def _node_record(self, index):
+        """
+        The record of node ``index``.
+
+        :param int index: the index
+        :returns: name, fingerprint, and the index of each value
+        :rtype: tuple
+        """
+        offset = self._nodes + index * self._record.size
+        return self._record.unpack_from(self._data, offset)
+
+    def _value(self, index):
+        """
+        The value at ``index`` in the strings.
+
+        :param int index: the index
+        :rtype: NoneType or int or str
+        """
+        try:
+            return self._decoded[index]
+        except KeyError:
+            return self._decode(index)
+
+    def _node_index(self):
+        """
+        The index of the record of every node, indexed by its name.
+
+        :rtype: dict of str * int
+        """
+        if self._index is None:
+            self._index = dict(
+               (self._value(self._node_record(i)[0]), i) \
+                  for i in range(self._num_nodes)
+            )
+        return self._index
+
+    def values(self, node, attrs):
+        """
+        The values of ``node``, if its attributes are unchanged.
+
+        :param `Node` node: the node
+        :param dict attrs: its current attributes
+
+        :returns: the values, indexed by key, or None
+        :rtype: dict of str * object or NoneType
+        """
+        index = self._node_index().get(six.text_type(node))
+        if index is None:
+            return None
+        fields = self._node_record(index)
+        if fields[1] != self.fingerprint(attrs):
+            return None
+        (decoded, decode) = (self._decoded, self._decode)
+        return dict(zip(
+           self.keys,
+           [decoded[i] if i in decoded else decode(i) for i in fields[2:]]
+        ))
+
+    def graph(self):
+        """
+        The graph that the snapshot was written for.
+
+        :returns: the graph, each node with only its fingerprint attribute
+        :rtype: `DiGraph`
+
+        The values of every node of the graph can be taken from the
+        snapshot, but a traversal which uses other attributes, e.g.,
+        layers, does not have them.
+        """
+        records = [self._node_record(i) for i in range(self._num_nodes)]
+        names = [self._value(r[0]) for r in records]
+        graph = nx.DiGraph()
+        graph.add_nodes_from(
+           (name, {self.FINGERPRINT: r[1]}) \
+              for (name, r) in zip(names, records)
+        )
+        edge = self._EDGE
+        graph.add_edges_from(
+           (names[s], names[t]) for (s, t) in (
+              edge.unpack_from(self._data, self._edges + i * edge.size) \
+                 for i in range(self._num_edges)
+           )
+        )
+        return graph
+
+    @classmethod
+    def _pack(cls, graph, line_info, keys):
+        """
+        The sections of a snapshot of ``graph``, see write().
+
+        :returns: the sections, in order
+        :rtype: list of bytes
+        """
+        strings = _StringTable()
+        key_indices = [strings.index(k) for k in keys]
+        nodes = list(graph)
+        node_indices = dict((n, i) for (i, n) in enumerate(nodes))
+        record = cls._node_struct(len(keys))
+        records = []
+        for node in nodes:
+            values = line_info.info(node, keys)
+            records.append(record.pack(
+               strings.index(six.text_type(node)),
+               cls.fingerprint(graph.node[node]),
+               *[strings.index(values[k]) for k in keys]
+            ))
+        edges = [
+           cls._EDGE.pack(node_indices[s], node_indices[t]) \
+              for (s, t) in graph.edges()
+        ]
+        (offsets, encoded) = strings.sections()
+
+        return [
+           cls._HEADER.pack(
+              cls.MAGIC,
+              cls.VERSION,
+              len(nodes),
+              len(edges),
+              len(keys),
+              len(strings)
+           ),
+           offsets,
+           struct.pack(str('<%dI' % len(keys)), *key_indices),
+           b''.join(records),
+           b''.join(edges),
+           encoded
+        ]
+
+    @classmethod
+    def write(cls, path, graph, line_info, keys):
+        """
+        Write a snapshot of ``graph`` and the values for ``keys`` of all
+        its nodes.
+
+        :param str path: the file, which is replaced atomically
+        :param `DiGraph` graph: the graph
+        :param GraphLineInfo line_info: calculates values not yet cached
+        :param keys: the keys
+        :type keys: list of str
+        """
+        sections = cls._pack(graph, line_info, keys)
+
+        (directory, name) = os.path.split(os.path.abspath(path))
+        (handle, temp_path) = tempfile.mkstemp(prefix=name, dir=directory)
+        try:
+            with os.fdopen(handle, 'wb') as snapshot_file:
+                for section in sections:
+                    snapshot_file.write(section)
+            getattr(os, 'replace', os.rename)(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class _StringTable(object):
+    """
+    The distinct strings of a snapshot being written, each encoded with
+    a tag for its type, in the order they were added.
+    """
+
+    def __init__(self):
+        # the index of every string, indexed by its encoding
+        self._indices = dict()
+
+    def __len__(self):
+        return len(self._indices)
+
+    @staticmethod
+    def _encode(value):
+        """
+        Encode a value.
+
+        :param object value: the value, not None
+        :rtype: bytes
+        """
+        if isinstance(value, six.integer_types):
+            return b'i' + str(int(value)).encode('ascii')
+        return b's' + six.text_type(value).encode('utf-8')
+
+    def index(self, value):
+        """
+        The index of ``value``, adding it if it is new.
+
+        :param value: the value
+        :type value: NoneType or int or str
+        :rtype: int
+        """
+        if value is None:
+            return Snapshot.NONE
+        indices = self._indices
+        return indices.setdefault(self._encode(value), len(indices))
+
+    def sections(self):
+        """
+        The offsets of the strings, and the strings themselves.
+
+        :returns: the offsets section and the strings section
+        :rtype: tuple of bytes * bytes
+        """
+        encoded = sorted(self._indices, key=self._indices.get)
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        return (
+           struct.pack(str('<%dI' % len(offsets)), *offsets),
+           b''.join(encoded)
+        )
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._spill
+    =========================
+
+    Temporary storage for rows of a table.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import tempfile
+
+
+class RowSpill(object):
+    """
+    Rows written to a temporary file, to be read back in order.
+
+    Each row is stored as a single line, a JSON list of its values, so
+    that only one row at a time need be in memory.
+    """
+
+    def __init__(self):
+        """
+        Initializer.
+        """
+        self._file = tempfile.TemporaryFile(mode='w+b')
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, row):
+        """
+        Write a row.
+
+        :param row: the values of the row
+        :type row: sequence of str
+        """
+        self._file.write((json.dumps(list(row)) + "\n").encode('utf-8'))
+        self.rows_written += 1
+
+    def rows(self):
+        """
+        Read back the rows written so far, in order.
+
+        :returns: the values of the rows
+        :rtype: generator of list of str
+        """
+        self._file.flush()
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line.decode('utf-8'))
+
+    def close(self):
+        """
+        Close and remove the temporary file.
+        """
+        self._file.close()
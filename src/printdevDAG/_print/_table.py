@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._table
+    =========================
+
+    A table of values, stored by column.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+from six.moves import zip # pylint: disable=redefined-builtin
+
+from ._widths import WidthTracker
+
+
+class Table(object):
+    """
+    A table of str values, stored as one list for each column.
+
+    Equal values are stored just once, so that a table with many rows but
+    relatively few distinct values, like most columns of a device table,
+    is compact.
+    """
+
+    def __init__(self, column_headers=None):
+        """
+        Initializer.
+
+        :param column_headers: the column headers, or None
+        :type column_headers: list of str or NoneType
+
+        If column_headers is None, the columns are those of the first row
+        appended with append_row.
+        """
+        self._columns = OrderedDict(
+           (k, []) for k in (column_headers or [])
+        )
+        self._strings = dict()
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    @property
+    def column_headers(self):
+        """
+        The column headers.
+
+        :rtype: list of str
+        """
+        return list(self._columns.keys())
+
+    def column(self, key):
+        """
+        The values in column ``key``.
+
+        :param str key: the column
+        :rtype: list of str
+        """
+        return self._columns[key]
+
+    def append(self, values):
+        """
+        Append a row.
+
+        :param values: the values, in the order of the column headers
+        :type values: sequence of str
+        """
+        strings = self._strings
+        for (column, value) in zip(self._columns.values(), values):
+            column.append(strings.setdefault(value, value))
+        self._len += 1
+
+    def append_row(self, row):
+        """
+        Append a row.
+
+        :param row: the values, indexed by column header
+        :type row: dict of str * str
+        """
+        if not self._columns:
+            self._columns = OrderedDict((k, []) for k in row)
+        self.append([row[k] for k in self._columns])
+
+    def widths(self, column_headers, padding=0):
+        """
+        The width of the widest value in each column, or of the column
+        header, if that is wider, with padding.
+
+        :param column_headers: the column headers
+        :type column_headers: list of str
+        :param int padding: number of spaces to pad on right
+        :rtype: dict of str * int
+        """
+        tracker = WidthTracker(column_headers)
+        for key in column_headers:
+            tracker.add_column(key, self._columns.get(key, []))
+        return tracker.widths(padding)
+
+    def rows(self, column_headers):
+        """
+        The rows of the table.
+
+        :param column_headers: the columns to include, in order
+        :type column_headers: list of str
+        :returns: the rows
+        :rtype: iterator of tuple of str
+        :raises KeyError: if the table has no column for some header
+        """
+        missing = [k for k in column_headers if k not in self._columns]
+        if missing:
+            raise KeyError("no columns %s in table" % ", ".join(missing))
+        return zip(*[self._columns[k] for k in column_headers])
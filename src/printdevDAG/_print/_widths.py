@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._widths
+    ==========================
+
+    Tracking the widths of the columns of a table.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import Counter
+
+from six.moves import zip # pylint: disable=redefined-builtin
+
+
+class WidthTracker(object):
+    """
+    Tracks the width of every column of a table as rows are added or
+    removed.
+
+    For each column, the tracker counts the values of each length, so
+    that a row can be removed as easily as added, and two trackers for the
+    same columns can be merged by adding their counts.
+    """
+
+    def __init__(self, column_headers):
+        """
+        Initializer.
+
+        :param column_headers: column headers
+        :type column_headers: list of str
+        """
+        self.column_headers = list(column_headers)
+        self._counts = [Counter() for _ in self.column_headers]
+
+    def add(self, values):
+        """
+        Add a row.
+
+        :param values: the values, in the order of the column headers
+        :type values: sequence of str
+        """
+        for (counts, value) in zip(self._counts, values):
+            counts[len(value)] += 1
+
+    def add_row(self, row):
+        """
+        Add a row.
+
+        :param row: the values, indexed by column header
+        :type row: dict of str * str
+        """
+        for (key, counts) in zip(self.column_headers, self._counts):
+            counts[len(row[key])] += 1
+
+    def add_column(self, key, values):
+        """
+        Add values to a single column.
+
+        :param str key: the column header
+        :param values: the values
+        :type values: iterable of str
+
+        Equal values are counted together, so that a column with few
+        distinct values is measured quickly.
+        """
+        counts = self._counts[self.column_headers.index(key)]
+        for (value, count) in Counter(values).items():
+            counts[len(value)] += count
+
+    def remove(self, values):
+        """
+        Remove a row that was previously added.
+
+        :param values: the values, in the order of the column headers
+        :type values: sequence of str
+        """
+        for (counts, value) in zip(self._counts, values):
+            width = len(value)
+            counts[width] -= 1
+            if counts[width] == 0:
+                del counts[width]
+
+    def merge(self, other):
+        """
+        Merge two trackers for the same columns.
+
+        :param WidthTracker other: the other tracker
+        :returns: a tracker for the rows of both
+        :rtype: WidthTracker
+        """
+        # pylint: disable=protected-access
+        if other.column_headers != self.column_headers:
+            raise ValueError("trackers must have the same column headers")
+        merged = WidthTracker(self.column_headers)
+        for (counts, mine, theirs) in \
+           zip(merged._counts, self._counts, other._counts):
+            counts.update(mine)
+            counts.update(theirs)
+        return merged
+
+    def widths(self, padding=0):
+        """
+        The width of each column, the width of its widest value or of its
+        header, if that is wider, with padding.
+
+        :param int padding: number of spaces to pad on right
+        :rtype: dict of str * int
+        """
+        return dict(
+           (k, max([len(k)] + list(counts.keys())) + padding) for \
+              (k, counts) in zip(self.column_headers, self._counts)
+        )
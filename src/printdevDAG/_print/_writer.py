@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._print._writer
+    ==========================
+
+    Writing lines in large chunks.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import os
+
+import six
+
+
+class LineWriter(object):
+    """
+    Writes lines to a sink, joining them into large chunks, so that the
+    sink is written to only once for many lines.
+
+    The sink may be a text file, a binary file, or a file descriptor. If
+    a file descriptor, several chunks are written with a single call to
+    os.writev, if available.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    # approximate number of characters in a chunk
+    CHUNK_SIZE = 2 ** 16
+
+    # number of chunks to write to a file descriptor at once
+    CHUNKS = 16
+
+    def __init__(self, out, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+        """
+        Initializer.
+
+        :param out: the sink
+        :type out: text file, binary file, or int
+        :param int chunk_size: approximate number of characters in a chunk
+        :param str encoding: the encoding for binary files and descriptors
+        """
+        self._out = out
+        self._chunk_size = chunk_size
+        self._encoding = encoding
+
+        # a text stream that wraps a binary one has a buffer attribute
+        if isinstance(out, six.integer_types):
+            self._kind = 'fd'
+        elif isinstance(out, io.TextIOBase) or hasattr(out, 'buffer'):
+            self._kind = 'text'
+        elif isinstance(out, (io.RawIOBase, io.BufferedIOBase)):
+            self._kind = 'binary'
+        else:
+            self._kind = 'text'
+
+        # lines in the current chunk, and their size
+        self._lines = []
+        self._size = 0
+
+        # encoded chunks not yet written to the file descriptor
+        self._chunks = []
+
+        self.lines_written = 0
+        self.bytes_written = 0
+        self.writes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def write_lines(self, lines):
+        """
+        Write lines.
+
+        :param lines: the lines, without line endings
+        :type lines: iterable of str
+        """
+        pending = self._lines
+        size = self._size
+        chunk_size = self._chunk_size
+        for line in lines:
+            pending.append(line)
+            size += len(line) + 1
+            if size >= chunk_size:
+                self._size = size
+                self._end_chunk()
+                pending = self._lines
+                size = 0
+        self._size = size
+
+    def _end_chunk(self):
+        """
+        Join the pending lines into a chunk, and write it or, for a file
+        descriptor, queue it to be written.
+        """
+        if not self._lines:
+            return
+
+        chunk = "\n".join(self._lines) + "\n"
+        self.lines_written += len(self._lines)
+        self._lines = []
+        self._size = 0
+
+        if self._kind == 'text':
+            self._out.write(chunk)
+            self.bytes_written += len(chunk)
+            self.writes += 1
+            return
+
+        data = chunk.encode(self._encoding)
+        self.bytes_written += len(data)
+        if self._kind == 'binary':
+            self._out.write(data)
+            self.writes += 1
+        else:
+            self._chunks.append(data)
+            if len(self._chunks) >= self.CHUNKS:
+                self._write_fd()
+
+    def _write_fd(self):
+        """
+        Write all queued chunks to the file descriptor, resuming after
+        partial writes.
+        """
+        buffers = self._chunks
+        self._chunks = []
+        writev = getattr(os, 'writev', None)
+        while buffers:
+            if writev is not None:
+                written = writev(self._out, buffers)
+            else: # pragma: no cover
+                written = os.write(self._out, buffers[0])
+            self.writes += 1
+
+            while buffers and written >= len(buffers[0]):
+                written -= len(buffers[0])
+                buffers.pop(0)
+            if written:
+                buffers[0] = buffers[0][written:]
+
+    def flush(self):
+        """
+        Write all pending lines.
+        """
+        self._end_chunk()
+        if self._kind == 'fd':
+            self._write_fd()
+
+    def report(self):
+        """
+        Report what has been written.
+
+        :returns: the number of lines, bytes, and writes to the sink
+        :rtype: dict of str * int
+
+        For a text file, the number of bytes is the number of characters.
+        """
+        return {
+           'lines' : self.lines_written,
+           'bytes' : self.bytes_written,
+           'writes' : self.writes
+        }
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._reach
+    ==================
+
+    Find the nodes reachable from a selection of nodes in a DAG.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+class GraphReachability(object):
+    """
+    An index of the descendants and ancestors of nodes in a DAG.
+
+    DOWN follows edges from a node to its successors, UP from a node to its
+    predecessors; which of these is up the storage stack depends on the
+    direction of the graph. BOTH is the union of the two.
+
+    The nodes reachable from a node are found by a search which stops
+    wherever it meets a node already in the index, and are remembered.
+    The cost of a selection is proportional to the part of the graph it
+    reaches, and the part already indexed is not searched again.
+
+    If the graph changes, call invalidate().
+    """
+
+    UP = 'up'
+    DOWN = 'down'
+    BOTH = 'both'
+    DIRECTIONS = (UP, DOWN, BOTH)
+
+    def __init__(self, graph):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        """
+        self.graph = graph
+        self._reached = {self.UP : dict(), self.DOWN : dict()}
+
+    def invalidate(self):
+        """
+        Discard the index.
+        """
+        for reached in self._reached.values():
+            reached.clear()
+
+    def reachable(self, node, direction):
+        """
+        The nodes reachable from ``node`` in ``direction``, UP or DOWN.
+
+        :param `Node` node: the node
+        :param str direction: UP or DOWN
+
+        :returns: the nodes, including node
+        :rtype: frozenset of `Node`
+        """
+        reached = self._reached[direction]
+        result = reached.get(node)
+        if result is not None:
+            return result
+
+        neighbors = self.graph.succ if direction == self.DOWN else \
+           self.graph.pred
+
+        result = set([node])
+        stack = [node]
+        while stack:
+            for neighbor in neighbors[stack.pop()]:
+                if neighbor in result:
+                    continue
+                known = reached.get(neighbor)
+                if known is not None:
+                    # includes everything reachable from neighbor
+                    result.update(known)
+                else:
+                    result.add(neighbor)
+                    stack.append(neighbor)
+
+        result = reached[node] = frozenset(result)
+        return result
+
+    def select(self, seeds, direction=DOWN):
+        """
+        The nodes reachable from any of ``seeds`` in ``direction``.
+
+        :param seeds: the nodes to start from
+        :type seeds: iterable of `Node`
+        :param str direction: UP, DOWN, or BOTH
+
+        :returns: the nodes, including the seeds
+        :rtype: set of `Node`
+
+        :raises ValueError: if direction is unknown or a seed is missing
+        """
+        if direction not in self.DIRECTIONS:
+            raise ValueError("unknown direction %s" % direction)
+        directions = (self.UP, self.DOWN) if direction == self.BOTH else \
+           (direction,)
+
+        selected = set()
+        for seed in seeds:
+            if seed not in self.graph:
+                raise ValueError("node %s is not in the graph" % seed)
+            for seed_direction in directions:
+                selected.update(self.reachable(seed, seed_direction))
+        return selected
+
+    def subgraph(self, seeds, direction=DOWN):
+        """
+        The subgraph of the nodes reachable from any of ``seeds``.
+
+        :param seeds: the nodes to start from
+        :type seeds: iterable of `Node`
+        :param str direction: UP, DOWN, or BOTH
+
+        :returns: the subgraph, sharing the graph's node attributes
+        :rtype: `DiGraph`
+        """
+        return self.graph.subgraph(self.select(seeds, direction))
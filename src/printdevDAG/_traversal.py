@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._traversal
+    ======================
+
+    Traverse a DAG depth first, with an explicit stack.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+from printdevDAG._utils import GraphUtils
+
+
+class ChildOrder(object):
+    """
+    The children of each node of a graph, in order, calculated once and
+    cached until invalidated.
+
+    Each node's sort key is also calculated just once.
+
+    If a node filter is given, the order is of the graph in which every
+    node that the filter rejects is removed and replaced by its children,
+    i.e., the children of a node are the accepted nodes that can be reached
+    from it through only rejected nodes, and the roots are those that can
+    be reached from a root through only rejected nodes.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, graph, key_func, node_filter=None, cache_size=None):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param key_func: key function to allow sorting of nodes
+        :type key_func: `Node` -> object
+        :param node_filter: whether to accept a node, None accepts all
+        :type node_filter: (`Node` -> bool) or NoneType
+        :param cache_size: maximum number of nodes to cache each value for
+        :type cache_size: int or NoneType
+
+        If cache_size is None, the caches are unbounded, if 0, nothing is
+        cached. If a cache is full, the least recently used node's value is
+        evicted, so that it is calculated again if it is needed again.
+        """
+        self.graph = graph
+        self.key_func = key_func
+        self.node_filter = node_filter
+        self._cache_size = cache_size
+        self._keys = OrderedDict()
+        self._children = OrderedDict()
+
+        # whether each node is accepted by the filter
+        self._accepted = OrderedDict()
+
+        # accepted nodes reachable through only rejected nodes, indexed by
+        # rejected node
+        self._frontiers = OrderedDict()
+
+    def _recall(self, cache, node):
+        """
+        The cached value for ``node``, or None.
+
+        :param OrderedDict cache: the cache
+        :param `Node` node: the node
+        :rtype: object or NoneType
+        """
+        if self._cache_size is None:
+            return cache.get(node)
+        value = cache.pop(node, None)
+        if value is not None:
+            cache[node] = value
+        return value
+
+    def _remember(self, cache, node, value):
+        """
+        Cache ``value`` for ``node``, evicting the least recently used value
+        if the cache is full.
+
+        :param OrderedDict cache: the cache
+        :param `Node` node: the node
+        :param object value: the value, not None
+        :returns: the value
+        :rtype: object
+        """
+        cache_size = self._cache_size
+        if cache_size != 0:
+            if cache_size is not None and len(cache) >= cache_size:
+                cache.popitem(last=False)
+            cache[node] = value
+        return value
+
+    def key(self, node):
+        """
+        The sort key of ``node``.
+
+        :param `Node` node: the node
+        :rtype: object
+        """
+        key = self._recall(self._keys, node)
+        if key is None:
+            key = self._remember(self._keys, node, self.key_func(node))
+        return key
+
+    def _ordered(self, nodes):
+        """
+        Order ``nodes``.
+
+        :param nodes: the nodes
+        :type nodes: iterable of `Node`
+
+        :returns: the nodes, with whether each is the last
+        :rtype: tuple of (tuple of `Node` * bool)
+        """
+        nodes = list(nodes)
+        if not nodes:
+            return ()
+        if len(nodes) > 1:
+            nodes.sort(key=self.key)
+        ordered = [(n, False) for n in nodes]
+        ordered[-1] = (nodes[-1], True)
+        return tuple(ordered)
+
+    def _accepts(self, node):
+        """
+        Whether the filter accepts ``node``.
+
+        :param `Node` node: the node
+        :rtype: bool
+        """
+        accepted = self._recall(self._accepted, node)
+        if accepted is None:
+            accepted = self._remember(
+               self._accepted,
+               node,
+               bool(self.node_filter(node))
+            )
+        return accepted
+
+    def _frontier(self, node):
+        """
+        The accepted nodes reachable from the rejected node ``node`` through
+        only rejected nodes.
+
+        :param `Node` node: the node
+        :rtype: tuple of `Node`
+        """
+        succ = self.graph.succ
+
+        # the frontiers found so far, which the cache may not keep
+        frontiers = dict()
+
+        # post order, so that the frontiers of successors are done first
+        stack = [node]
+        while stack:
+            top = stack[-1]
+            if top in frontiers:
+                stack.pop()
+                continue
+            frontier = self._recall(self._frontiers, top)
+            if frontier is not None:
+                frontiers[top] = frontier
+                stack.pop()
+                continue
+            pending = [
+               s for s in succ[top] if s not in frontiers and \
+                  not self._accepts(s)
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            frontiers[top] = self._remember(
+               self._frontiers,
+               top,
+               self._visible(succ[top], frontiers)
+            )
+            stack.pop()
+
+        return frontiers[node]
+
+    def _visible(self, nodes, frontiers=None):
+        """
+        The accepted nodes among ``nodes``, with every rejected node
+        replaced by its frontier.
+
+        :param nodes: the nodes
+        :type nodes: iterable of `Node`
+        :param frontiers: frontiers already found, indexed by node, or None
+        :type frontiers: dict of `Node` * (tuple of `Node`) or NoneType
+
+        :returns: the visible nodes, or nodes, if there is no filter
+        :rtype: iterable of `Node`
+        """
+        if self.node_filter is None:
+            return nodes
+
+        visible = []
+        seen = set()
+        for node in nodes:
+            if self._accepts(node):
+                reached = (node,)
+            elif frontiers is not None and node in frontiers:
+                reached = frontiers[node]
+            else:
+                reached = self._frontier(node)
+            for visible_node in reached:
+                if visible_node not in seen:
+                    seen.add(visible_node)
+                    visible.append(visible_node)
+        return tuple(visible)
+
+    def roots(self, roots=None):
+        """
+        The roots, in order.
+
+        :param roots: the nodes to start from, if None, the graph's roots
+        :type roots: list of `Node` or NoneType
+
+        :returns: the roots, with whether each is the last
+        :rtype: tuple of (tuple of `Node` * bool)
+        """
+        return self._ordered(self._visible(
+           GraphUtils.get_roots(self.graph) if roots is None else roots
+        ))
+
+    def children(self, node):
+        """
+        The children of ``node``, in order.
+
+        :param `Node` node: the node
+
+        :returns: the children, with whether each is the last
+        :rtype: tuple of (tuple of `Node` * bool)
+        """
+        children = self._recall(self._children, node)
+        if children is None:
+            children = self._remember(
+               self._children,
+               node,
+               self._ordered(self._visible(self.graph.succ[node]))
+            )
+        return children
+
+    def invalidate(self, nodes=None):
+        """
+        Discard cached values for ``nodes``, or for all nodes.
+
+        :param nodes: the nodes, which need not be in the graph, or None
+        :type nodes: iterable of `Node` or NoneType
+
+        The children of a node, and its position among the children of its
+        parents, are discarded. If the graph is being modified, discard
+        both before and after the modification, so that the node's former
+        and current parents are both found.
+
+        If there is a node filter, a change to any node may change the
+        children of many others, so that everything is discarded.
+        """
+        if nodes is None or self.node_filter is not None:
+            self._keys.clear()
+            self._children.clear()
+            self._accepted.clear()
+            self._frontiers.clear()
+            return
+
+        pred = self.graph.pred
+        for node in nodes:
+            self._keys.pop(node, None)
+            self._children.pop(node, None)
+            for parent in pred.get(node, ()):
+                self._children.pop(parent, None)
+
+
+class DepthFirst(object):
+    """
+    A depth first traversal, with an explicit stack, so that the depth of
+    the graph is not limited by the recursion limit.
+    """
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def nodes(order, roots=None, expand=None):
+        """
+        Yield the nodes in depth first order.
+
+        :param ChildOrder order: the order of the children of each node
+        :param roots: the nodes to start from, if None, the graph's roots
+        :type roots: list of `Node` or NoneType
+        :param expand: whether to visit the children of a visited node
+        :type expand: (int * `Node` -> bool) or NoneType
+
+        :returns: the depth, the node, whether it is the last child of its
+           parent, and whether its children are visited
+        :rtype: generator of tuple of int * `Node` * bool * bool
+
+        expand is called once for each visit, in order, before the visit
+        is yielded. If expand is None, every node is expanded at every
+        visit.
+        """
+        children = order.children
+        stack = [(0, iter(order.roots(roots)))]
+        push = stack.append
+        while stack:
+            (depth, siblings) = stack[-1]
+            visit = next(siblings, None)
+            if visit is None:
+                stack.pop()
+                continue
+
+            (node, last) = visit
+            expanded = True if expand is None else expand(depth, node)
+            yield (depth, node, last, expanded)
+
+            if expanded:
+                node_children = children(node)
+                if node_children:
+                    push((depth + 1, iter(node_children)))
@@ -33,6 +33,10 @@ from __future__ import unicode_literals
 
 import functools
 
+from collections import OrderedDict
+
+import six
+
 
 class GeneralUtils(object):
     """
@@ -73,7 +77,12 @@ class GeneralUtils(object):
 
         :returns: a function to find a value for a node
         :rtype: * -> (str or NoneType)
+
+        The composed function returns the first value that is not None,
+        without calling the remaining functions.
         """
+        funcs = list(funcs)
+
         def the_func(node):
             """
             Returns a value for the node.
@@ -81,13 +90,55 @@ class GeneralUtils(object):
             :returns: a value
             :rtype: str or NoneType
             """
-            return functools.reduce(
-               lambda v, f: v if v is not None else f(node),
-               funcs,
-               None
-            )
+            for func in funcs:
+                value = func(node)
+                if value is not None:
+                    return value
+            return None
         return the_func
 
+    @staticmethod
+    def extractor(keys, funcs):
+        """
+        Compiles a single function that extracts a value for every key.
+
+        :param keys: the keys to extract values for
+        :type keys: list of str
+        :param funcs: fallback functions for each key, indexed by key
+        :type funcs: dict of str * (list of (* -> (str or NoneType)))
+
+        :returns: a function that returns a mapping of keys to values
+        :rtype: * -> (dict of str * (str or NoneType))
+
+        The value for each key is the first value that is not None in the
+        list of functions for the key. The value for a key that has no
+        functions is None.
+
+        The source of the function is generated for this particular list
+        of keys, with the functions unrolled, so that there are no loops
+        or intermediate function calls.
+        """
+        namespace = dict()
+        body = []
+        for (i, key) in enumerate(keys):
+            namespace['k_%d' % i] = key
+            body.append("    v_%d = None" % i)
+            for (j, func) in enumerate(funcs.get(key, [])):
+                name = 'f_%d_%d' % (i, j)
+                namespace[name] = func
+                if j == 0:
+                    body.append("    v_%d = %s(node)" % (i, name))
+                else:
+                    body.append("    if v_%d is None:" % i)
+                    body.append("        v_%d = %s(node)" % (i, name))
+
+        items = ", ".join("k_%d: v_%d" % (i, i) for i in range(len(keys)))
+        source = "\n".join(
+           ["def extract(node):"] + body + ["    return {%s}" % items]
+        )
+        six.exec_(compile(source, "<extractor>", "exec"), namespace)
+        return namespace['extract']
+
     @staticmethod
     def minimize_mapping(mapping):
         """
@@ -101,3 +152,97 @@ class GeneralUtils(object):
         are missing.
         """
         return dict((k, v) for (k, v) in mapping.items() if k != v)
+
+
+class GraphUtils(object):
+    """
+    Utilities that operate on networkx graphs.
+    """
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def get_roots(graph):
+        """
+        Get the roots of a DAG.
+
+        :param `DiGraph` graph: the graph
+
+        :returns: the roots of the graph
+        :rtype: list of `Node`
+
+        Since the graph is acyclic, the roots are just the nodes without
+        predecessors, so this is linear in the number of nodes, unlike
+        pydevDAG.GraphUtils.get_roots.
+        """
+        return [n for n in graph if not graph.pred[n]]
+
+
+class Memo(object):
+    """
+    A memo of the results of a function of a single hashable argument,
+    with a bound on its size.
+
+    If the memo is full, the least recently used result is evicted.
+    """
+
+    def __init__(self, func, cache_size):
+        """
+        Initializer.
+
+        :param func: the function
+        :type func: object -> object
+        :param cache_size: maximum number of results to remember
+        :type cache_size: int or NoneType
+
+        If cache_size is None, the memo is unbounded, if 0, nothing is
+        remembered.
+        """
+        self._func = func
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(self, arg):
+        """
+        Get the result of the function for ``arg``.
+
+        :param object arg: the argument
+        :returns: the result
+        :rtype: object
+        """
+        cache = self._cache
+        try:
+            result = cache.pop(arg)
+            self._hits += 1
+        except KeyError:
+            result = self._func(arg)
+            self._misses += 1
+            if self._cache_size is not None and \
+               len(cache) >= self._cache_size > 0:
+                cache.popitem(last=False)
+        if self._cache_size != 0:
+            cache[arg] = result
+        return result
+
+    def cache_info(self):
+        """
+        Get statistics about the memo.
+
+        :returns: hits, misses, current and maximum size of the memo
+        :rtype: dict of str * (int or NoneType)
+        """
+        return {
+           'hits' : self._hits,
+           'misses' : self._misses,
+           'size' : len(self._cache),
+           'maxsize' : self._cache_size
+        }
+
+    def clear(self):
+        """
+        Forget all results and reset the statistics.
+        """
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
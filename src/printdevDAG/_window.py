@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    printdevDAG._window
+    ===================
+
+    Render a window of the rows of the depth first view of a DAG.
+
+    .. moduleauthor::  mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import itertools
+
+from . import _depth
+from . import _print
+from ._graph import PrintGraph
+from ._levels import GraphLevels
+from ._traversal import ChildOrder
+from ._utils import GeneralUtils
+
+
+class DepthFirstWindow(object):
+    """
+    The rows of PrintGraph.depth_first output, without back references,
+    a window at a time.
+
+    The number of rows in the fully expanded subtree of every node is
+    calculated once for a snapshot of the graph, so that the traversal
+    can start directly at the first row of a window. Only the rows in the
+    window are extracted and formatted.
+
+    If the graph changes, call invalidate().
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    _PADDING = 2
+
+    def __init__(self, graph, line_info, widths=None):
+        """
+        Initializer.
+
+        :param `DiGraph` graph: the graph
+        :param GraphLineInfo line_info: the line info object
+        :param widths: maximum width of the values in each column
+        :type widths: dict of str * int or NoneType
+
+        If widths is None, the columns are exactly as wide as in the whole
+        output, which requires extracting the values for every node once.
+        Otherwise, values are truncated, as by Print.row_lines.
+        """
+        self.graph = graph
+        self.line_info = line_info
+        self.widths = widths
+        sort_key = PrintGraph.SORT_KEY
+        self.order = ChildOrder(
+           graph,
+           GeneralUtils.str_key_func_gen(
+              lambda n: line_info.info(n, [sort_key])[sort_key]
+           )
+        )
+
+        # rows in the subtree of each node, and in all
+        self._sizes = None
+        self._length = None
+
+        # position of each child relative to its parent's first child,
+        # indexed by parent, the roots are indexed by None
+        self._offsets = dict()
+
+        self._formatter = None
+
+    def invalidate(self):
+        """
+        Discard everything calculated for the graph.
+        """
+        self.order.invalidate()
+        self._sizes = None
+        self._length = None
+        self._offsets.clear()
+        self._formatter = None
+
+    def _size_index(self):
+        """
+        The number of rows in the subtree of every node.
+
+        :rtype: dict of `Node` * int
+
+        Time is O(V + E), since children precede parents in the reversed
+        longest path levels.
+        """
+        if self._sizes is None:
+            sizes = dict()
+            succ = self.graph.succ
+            levels = GraphLevels.levels(self.graph, GraphLevels.LONGEST)
+            for level_nodes in reversed(levels):
+                for node in level_nodes:
+                    sizes[node] = 1 + sum(sizes[c] for c in succ[node])
+            self._sizes = sizes
+        return self._sizes
+
+    def _children(self, node):
+        """
+        The children of ``node``, or the roots, if node is None, with their
+        offsets.
+
+        :param node: the node
+        :type node: `Node` or NoneType
+
+        :returns: the children and the offset of each
+        :rtype: tuple of (tuple of (tuple of `Node` * bool)) * list of int
+        """
+        children = self.order.roots() if node is None else \
+           self.order.children(node)
+        offsets = self._offsets.get(node)
+        if offsets is None:
+            sizes = self._size_index()
+            offsets = self._offsets[node] = []
+            total = 0
+            for (child, _) in children:
+                offsets.append(total)
+                total += sizes[child]
+        return (children, offsets)
+
+    def __len__(self):
+        if self._length is None:
+            sizes = self._size_index()
+            self._length = sum(sizes[r] for (r, _) in self.order.roots())
+        return self._length
+
+    def _nodes(self, start):
+        """
+        Yield the nodes in depth first order, beginning with row ``start``.
+
+        :param int start: the first row, less than the number of rows
+
+        :returns: the depth, the node, and whether it is the last child
+        :rtype: generator of tuple of int * `Node` * bool
+        """
+        stack = []
+        (parent, depth, remaining) = (None, 0, start)
+        while True:
+            (children, offsets) = self._children(parent)
+            index = bisect.bisect_right(offsets, remaining) - 1
+            (node, last) = children[index]
+            stack.append((depth, iter(children[index + 1:])))
+            remaining -= offsets[index]
+            if remaining == 0:
+                break
+            (parent, depth, remaining) = (node, depth + 1, remaining - 1)
+
+        yield (depth, node, last)
+        stack.append((depth + 1, iter(self.order.children(node))))
+        while stack:
+            (depth, siblings) = stack[-1]
+            visit = next(siblings, None)
+            if visit is None:
+                stack.pop()
+                continue
+            (node, last) = visit
+            yield (depth, node, last)
+            stack.append((depth + 1, iter(self.order.children(node))))
+
+    def _get_formatter(self):
+        """
+        The formatter for the rows.
+
+        :rtype: RowFormatter
+        """
+        if self._formatter is not None:
+            return self._formatter
+
+        keys = self.line_info.keys
+        alignment = self.line_info.alignment
+        if self.widths is not None:
+            max_widths = dict(
+               (k, max(self.widths[k], len(k))) for k in keys
+            )
+            self._formatter = _print.RowFormatter.get(
+               keys,
+               dict((k, max_widths[k] + self._PADDING) for k in keys),
+               alignment,
+               max_widths
+            )
+            return self._formatter
+
+        # every node's widest first column is at its greatest depth
+        tracker = _print.WidthTracker(keys)
+        indentation = _depth.GraphXformLines.indentation()
+        levels = GraphLevels.levels(self.graph, GraphLevels.LONGEST)
+        for (depth, level_nodes) in enumerate(levels):
+            prefix = " " * (depth * indentation)
+            for node in level_nodes:
+                row = self.line_info.info(node, conv=lambda k, v: str(v))
+                tracker.add(
+                   [prefix + row[keys[0]]] + [row[k] for k in keys[1:]]
+                )
+        self._formatter = _print.RowFormatter.get(
+           keys,
+           tracker.widths(self._PADDING),
+           alignment
+        )
+        return self._formatter
+
+    def header(self):
+        """
+        The header line.
+
+        :rtype: str
+        """
+        return self._get_formatter().header
+
+    def lines(self, start, stop):
+        """
+        The lines for rows ``start`` to ``stop``, not including the header.
+
+        :param int start: the first row
+        :param int stop: the row after the last row
+
+        :returns: the lines
+        :rtype: list of str
+
+        Rows are numbered from 0, and as for a slice, stop may be larger
+        than the number of rows.
+
+        :raises ValueError: if start or stop is negative
+        """
+        if start < 0 or stop < 0:
+            raise ValueError("rows are numbered from 0")
+        if start >= min(stop, len(self)):
+            return []
+
+        info = self.line_info.info
+        lines = (
+           {
+              'indent' : depth,
+              'last' : last,
+              'node' : info(node, keys=None, conv=lambda k, v: str(v)),
+              'orphan' : depth == 0,
+              'reference' : None
+           } for (depth, node, last) in \
+              itertools.islice(self._nodes(start), stop - start)
+        )
+        format_row = self._get_formatter().format_row
+        return [
+           format_row(row) for row in \
+              _depth.GraphXformLines.rows(self.line_info.keys, lines)
+        ]
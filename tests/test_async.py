@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_async
+    ================
+
+    Tests rendering graphs from asyncio code.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+import asyncio
+
+import pytest
+
+import printdevDAG
+
+from benchmarks import DAGGenerator
+
+
+class _Writer(object):
+    """
+    Stands in for an asyncio.StreamWriter, draining slowly.
+    """
+
+    def __init__(self, delay=0):
+        """
+        Initializer.
+
+        :param float delay: seconds to wait in every drain
+        """
+        self.data = []
+        self.drains = 0
+        self.delay = delay
+
+    def write(self, data):
+        """
+        Write ``data``.
+        """
+        self.data.append(data)
+
+    async def drain(self):
+        """
+        Wait for the writer to drain.
+        """
+        self.drains += 1
+        await asyncio.sleep(self.delay)
+
+
+class _GatedWriter(_Writer):
+    """
+    Stands in for an asyncio.StreamWriter, which drains its second write
+    only once a gate is opened.
+    """
+
+    def __init__(self, gate, log):
+        """
+        Initializer.
+
+        :param `asyncio.Event` gate: the gate
+        :param log: a log of the completed drains
+        :type log: list
+        """
+        super().__init__()
+        self.gate = gate
+        self.log = log
+
+    async def drain(self):
+        """
+        Wait for the writer to drain, and for the gate, if the second.
+        """
+        await super().drain()
+        if self.drains == 2:
+            await asyncio.wait_for(self.gate.wait(), 10)
+        self.log.append(('slow', self.drains))
+
+
+def _run(coro):
+    """
+    Run ``coro`` in a new event loop.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _collect(agen):
+    """
+    Collect the items of an async generator.
+    """
+    return [x async for x in agen]
+
+
+class TestAsyncPrintGraph(object):
+    """
+    Test that asynchronous rendering agrees with synchronous rendering.
+    """
+
+    _GRAPH = DAGGenerator().graph(300)
+
+    def _expected(self, traversal):
+        """
+        Render with the synchronous ``traversal``.
+        """
+        line_info = printdevDAG.PrintGraph.line_info(self._GRAPH)
+        return list(getattr(printdevDAG.PrintGraph, traversal)(
+           self._GRAPH,
+           line_info
+        ))
+
+    @pytest.mark.parametrize(
+       'traversal',
+       ['depth_first', 'breadth_first', 'layers']
+    )
+    def test_lines(self, traversal):
+        """
+        Verify that the lines are the lines of the synchronous traversal.
+        """
+        renderer = printdevDAG.AsyncPrintGraph(batch_size=50)
+        lines = _run(_collect(getattr(renderer, traversal)(self._GRAPH)))
+        assert lines == self._expected(traversal)
+
+    def test_batches(self):
+        """
+        Verify that batches are no larger than the batch size.
+        """
+        renderer = printdevDAG.AsyncPrintGraph(batch_size=50)
+        batches = _run(_collect(renderer.batches(self._GRAPH, 'depth_first')))
+        assert all(len(b) <= 50 for b in batches)
+        assert len(batches) > 1
+
+    def test_shared(self, monkeypatch):
+        """
+        Verify that concurrent renderings share work, and that a slow
+        writer does not hold up a fast one: the fast writer finishes before
+        the slow writer's second batch has drained.
+        """
+        renderer = printdevDAG.AsyncPrintGraph(batch_size=50)
+        calls = []
+        log = []
+        line_info = printdevDAG.PrintGraph.line_info
+
+        def counting(*args):
+            calls.append(args)
+            return line_info(*args)
+
+        async def both():
+            gate = asyncio.Event()
+            (fast, slow) = (_Writer(), _GatedWriter(gate, log))
+
+            async def write_fast():
+                report = await renderer.write(fast, self._GRAPH, 'depth_first')
+                log.append('fast')
+                gate.set()
+                return report
+
+            reports = await asyncio.gather(
+               write_fast(),
+               renderer.write(slow, self._GRAPH, 'depth_first')
+            )
+            return (fast, slow) + tuple(reports)
+
+        monkeypatch.setattr(printdevDAG.PrintGraph, 'line_info', counting)
+        (fast, slow, fast_report, slow_report) = _run(both())
+
+        assert len(calls) == 1
+        assert log.index('fast') < log.index(('slow', 2))
+        assert fast_report == slow_report
+        assert fast.drains == fast_report['writes'] > 2
+        expected = "".join(l + "\n" for l in self._expected('depth_first'))
+        assert b"".join(fast.data).decode('utf-8') == expected
+        assert b"".join(slow.data) == b"".join(fast.data)
+        assert not renderer._renderings # pylint: disable=protected-access
+
+    def test_cancel(self):
+        """
+        Verify that rendering stops once its only reader stops reading,
+        and that a later reader gets the whole rendering.
+        """
+        renderer = printdevDAG.AsyncPrintGraph(batch_size=50)
+
+        async def partial():
+            batches = renderer.batches(self._GRAPH, 'depth_first')
+            first = await batches.__anext__()
+            # pylint: disable=protected-access
+            assert len(renderer._renderings) == 1
+            shared = next(iter(renderer._renderings.values()))
+            await batches.aclose()
+            with pytest.raises(asyncio.CancelledError):
+                await shared.task
+            assert not renderer._renderings
+            return (first, shared)
+
+        (first, shared) = _run(partial())
+        expected = self._expected('depth_first')
+        assert first == expected[:50]
+        assert shared.task.cancelled()
+        assert sum(len(b) for b in shared.batches) < len(expected)
+
+        lines = _run(_collect(renderer.lines(self._GRAPH, 'depth_first')))
+        assert lines == expected
+
+    def test_error(self):
+        """
+        Verify that an unknown traversal is an error.
+        """
+        renderer = printdevDAG.AsyncPrintGraph()
+        with pytest.raises(ValueError):
+            _run(_collect(renderer.lines(self._GRAPH, 'sideways')))
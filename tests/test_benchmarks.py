@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_benchmarks
+    =====================
+
+    Tests the synthetic graphs used for benchmarking.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import networkx as nx
+
+import printdevDAG
+
+from benchmarks import DAGGenerator
+from benchmarks import StackConfig
+from benchmarks import TraversalPhases
+
+class TestDAGGenerator(object):
+    """
+    Test the generated graphs.
+    """
+
+    def test_size(self):
+        """
+        Verify that graphs are made of whole stacks of at least the size.
+        """
+        config = StackConfig(luns=3, paths=8)
+        graph = DAGGenerator(config=config).graph(500)
+        assert len(graph) >= 500
+        assert len(graph) % config.size == 0
+        assert nx.is_directed_acyclic_graph(graph)
+
+    def test_deterministic(self):
+        """
+        Verify that the same seed yields the same graph.
+        """
+        graph1 = DAGGenerator(seed=3).graph(100)
+        graph2 = DAGGenerator(seed=3).graph(100)
+        assert sorted(graph1.edges()) == sorted(graph2.edges())
+
+    def test_subsystems(self):
+        """
+        Verify that every kind of device-mapper device is present.
+        """
+        graph = DAGGenerator().graph(1)
+        subsystems = set(
+           printdevDAG.NodeGetters.DMUUIDSUBSYSTEM.getter(graph.node[n]) \
+              for n in graph
+        )
+        assert subsystems == set([None, 'mpath', 'part', 'CRYPT', 'LVM'])
+
+    def test_print(self):
+        """
+        Verify that every traversal prints every node.
+        """
+        graph = DAGGenerator().graph(1)
+        line_info = printdevDAG.PrintGraph.line_info(graph)
+        for traversal in TraversalPhases.TRAVERSALS:
+            lines = list(
+               getattr(printdevDAG.PrintGraph, traversal)(graph, line_info)
+            )
+            assert len(lines) > len(graph)
+
+
+class TestTraversalPhases(object):
+    """
+    Test measuring the phases.
+    """
+    # pylint: disable=too-few-public-methods
+
+    def test_phases(self):
+        """
+        Verify that every phase is measured and counts some lines.
+        """
+        graph = DAGGenerator().graph(1)
+        phases = TraversalPhases(graph, memory=False)
+        for traversal in TraversalPhases.TRAVERSALS:
+            measurements = phases.measure(traversal)
+            assert [m.name for m in measurements] == \
+               ['traversal', 'info', 'widths', 'format', 'total']
+            assert all(m.lines > 0 for m in measurements)
+            assert all(m.peak is None for m in measurements)
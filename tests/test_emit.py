@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_emit
+    ===============
+
+    Tests records for other programs.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import csv
+import io
+import json
+import os
+
+import pytest
+
+import printdevDAG
+
+from printdevDAG import _item_str
+
+from benchmarks import DAGGenerator
+
+
+class TestRecords(object):
+    """
+    Test records for other programs.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    @staticmethod
+    def _emit(traversal, fmt, **kwargs):
+        """
+        The lines emitted for ``traversal`` in ``fmt``.
+        """
+        out = io.StringIO()
+        report = printdevDAG.PrintGraph.emit(
+           out,
+           TestRecords._GRAPH,
+           traversal,
+           fmt,
+           **kwargs
+        )
+        lines = out.getvalue().splitlines()
+        assert report['lines'] == len(lines)
+        return lines
+
+    @pytest.mark.parametrize(
+       'traversal',
+       ['depth_first', 'breadth_first', 'layers']
+    )
+    def test_formats(self, traversal):
+        """
+        Verify that every format has the same records, with a record for
+        every row of the text output.
+        """
+        objects = [
+           json.loads(l) for l in self._emit(traversal, 'jsonl')
+        ]
+        out = io.StringIO()
+        printdevDAG.PrintGraph.print_graph(out, self._GRAPH, traversal)
+        text = out.getvalue().splitlines()
+        # depth first has one header, other traversals a blank line, a
+        # title and a header for every table
+        headers = 1 if traversal == 'depth_first' else 3 * text.count('')
+        assert len(objects) == len(text) - headers
+
+        # pylint: disable=protected-access
+        expected = [
+           [printdevDAG.RecordFormat._text(v) for v in o.values()] \
+              for o in objects
+        ]
+        for (fmt, delimiter) in (('csv', ','), ('tsv', '\t')):
+            lines = self._emit(traversal, fmt)
+            rows = list(csv.reader(lines, delimiter=delimiter))
+            assert rows[0] == list(objects[0].keys())
+            assert rows[1:] == expected
+
+    def test_depth_first(self):
+        """
+        Verify that the parent of every record is the nearest earlier
+        record with a smaller depth, and that back references are records.
+        """
+        for back_references in (False, True):
+            records = [
+               json.loads(l) for l in self._emit(
+                  'depth_first',
+                  'jsonl',
+                  back_references=back_references
+               )
+            ]
+            names = []
+            for record in records:
+                depth = record['depth']
+                assert record['parent'] == \
+                   (names[depth - 1] if depth > 0 else None)
+                names[depth:] = \
+                   [record['NAME'] if record['reference'] is None else \
+                   record['reference']]
+            references = [r for r in records if r['reference'] is not None]
+            assert bool(references) == back_references
+            assert all(r['NAME'] is None for r in references)
+
+    def test_memory(self, monkeypatch):
+        """
+        Verify that the peak memory used to emit depth first records does
+        not grow with the size of the graph.
+        """
+        tracemalloc = pytest.importorskip("tracemalloc")
+
+        # do not let the process-wide DM UUID memo fill up during the test
+        monkeypatch.setattr(
+           _item_str.DmUuidSubsystem,
+           'DM_UUIDS',
+           _item_str.DMUUIDs(cache_size=0)
+        )
+        monkeypatch.setattr(printdevDAG.PrintGraph, 'STREAM_CACHE_SIZE', 64)
+
+        graphs = [DAGGenerator().graph(n) for n in (1000, 4000)]
+
+        def peak(graph):
+            """
+            Get the peak memory used to emit records for the graph.
+            """
+            with io.open(os.devnull, 'w', encoding='utf-8') as out:
+                tracemalloc.start()
+                try:
+                    printdevDAG.PrintGraph.emit(out, graph, 'depth_first')
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        # warm up interpreter free lists on the larger graph
+        peak(graphs[-1])
+        (small, large) = [peak(g) for g in graphs]
+        assert large < 1.25 * small
+
+    def test_fields(self):
+        """
+        Verify quoting and escaping of values.
+        """
+        fields = ['a', 'b', 'c']
+        records = [['x,"y"', 'tab\there\\', None], [True, 3, 'line\nend']]
+        lines = list(printdevDAG.RecordFormat.lines('csv', fields, records))
+        assert lines[1:] == ['"x,""y""",tab\there\\,', 'true,3,"line\nend"']
+
+        lines = list(printdevDAG.RecordFormat.lines('tsv', fields, records))
+        assert lines[1:] == \
+           ['x,"y"\ttab\\there\\\\\t', 'true\t3\tline\\nend']
+
+        lines = list(printdevDAG.RecordFormat.lines('jsonl', fields, records))
+        assert [json.loads(l) for l in lines] == \
+           [dict(zip(fields, r)) for r in records]
+
+    def test_unknown(self):
+        """
+        Verify that unknown formats and traversals are errors.
+        """
+        with pytest.raises(ValueError):
+            printdevDAG.RecordFormat.lines('xml', [], [])
+        with pytest.raises(ValueError):
+            self._emit('depth_first', 'xml')
+        with pytest.raises(ValueError):
+            self._emit('preorder', 'csv')
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_filter
+    =================
+
+    Tests filtering rows.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import defaultdict
+
+import networkx as nx
+import pytest
+
+import printdevDAG
+
+from printdevDAG._traversal import ChildOrder
+
+from benchmarks import DAGGenerator
+
+from ._getters import CountingGetter
+
+
+class TestRowFilter(object):
+    """
+    Test filtering rows before calculating their values.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    @staticmethod
+    def _names(lines, names):
+        """
+        The names in the first column of some lines, without prefixes.
+        """
+        return set(l.split()[0].lstrip('|`-') for l in lines if l) & names
+
+    def test_cheapest_first(self):
+        """
+        Verify that a rejected row's expensive values are not calculated.
+        """
+        counter = CountingGetter()
+        line_info = printdevDAG.GraphLineInfo(
+           self._GRAPH,
+           ['EXPENSIVE', 'DEVNAME'],
+           defaultdict(lambda: '<'),
+           {
+              'EXPENSIVE' : [counter],
+              'DEVNAME' : [printdevDAG.NodeGetters.DEVNAME]
+           }
+        )
+        assert line_info.cost('EXPENSIVE') > line_info.cost('DEVNAME')
+
+        accepts = line_info.selector(
+           printdevDAG.RowFilter()
+              .add('EXPENSIVE', lambda v: True)
+              .add('DEVNAME', lambda v: False)
+        )
+        assert not any(accepts(n) for n in self._GRAPH)
+        assert counter.calls == 0
+
+    def test_reattach(self):
+        """
+        Verify that the children of a rejected node take its place.
+        """
+        graph = nx.DiGraph()
+        graph.add_edges_from([
+           ('a', 'b'), ('b', 'c'), ('a', 'd'), ('b', 'e'),
+           ('a', 'x'), ('a', 'y'), ('x', 'z'), ('y', 'z'), ('r', 'b')
+        ])
+        rejected = set(['b', 'x', 'y', 'r'])
+        order = ChildOrder(graph, str, lambda n: n not in rejected)
+        assert order.roots() == (('a', False), ('c', False), ('e', True))
+        assert order.children('a') == \
+           (('c', False), ('d', False), ('e', False), ('z', True))
+
+    @pytest.mark.parametrize(
+       'traversal',
+       ['depth_first', 'breadth_first', 'layers']
+    )
+    def test_print(self, traversal):
+        """
+        Verify that every accepted node, and only accepted nodes, are shown.
+        """
+        graph = self._GRAPH
+        line_info = printdevDAG.PrintGraph.line_info(graph)
+        row_filter = printdevDAG.RowFilter.equal({'DM_SUBSYSTEM' : 'None'})
+        names = set(line_info.info(n, ['NAME'])['NAME'] for n in graph)
+        accepted = set(
+           line_info.info(n, ['NAME'])['NAME'] for n in graph if \
+              line_info.info(n, ['DM_SUBSYSTEM'])['DM_SUBSYSTEM'] is None
+        )
+        assert 0 < len(accepted) < len(names)
+
+        lines = list(getattr(printdevDAG.PrintGraph, traversal)(
+           graph,
+           line_info,
+           row_filter=row_filter
+        ))
+        assert self._names(lines, names) == accepted
+
+        unfiltered = list(getattr(printdevDAG.PrintGraph, traversal)(
+           graph,
+           line_info
+        ))
+        everything = list(getattr(printdevDAG.PrintGraph, traversal)(
+           graph,
+           line_info,
+           row_filter=printdevDAG.RowFilter([('NAME', lambda v: True)])
+        ))
+        assert everything == unfiltered
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_incremental
+    ======================
+
+    Tests incremental rendering of changing graphs.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+
+import pytest
+
+import printdevDAG
+
+from benchmarks import DAGGenerator
+from benchmarks import EventFeed
+
+
+def _patch(lines, diff):
+    """
+    Apply a unified diff without context to ``lines``.
+
+    :param lines: the lines
+    :type lines: list of str
+    :param diff: the diff
+    :type diff: list of str
+    :returns: the patched lines
+    :rtype: list of str
+    """
+    result = list(lines)
+    offset = 0
+    for line in diff[2:]:
+        match = re.match(r'@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@$', line)
+        if match is not None:
+            (start, length) = (int(match.group(1)), match.group(2))
+            length = 1 if length is None else int(length)
+            index = (start if length == 0 else start - 1) + offset
+            offset -= length
+        elif line.startswith('-'):
+            del result[index]
+        else:
+            result.insert(index, line[1:])
+            index += 1
+            offset += 1
+    return result
+
+
+class TestIncrementalRenderer(object):
+    """
+    Test that incremental rendering agrees with rendering from scratch.
+    """
+
+    _GRAPH = DAGGenerator().graph(100)
+
+    @staticmethod
+    def _expected(graph, traversal):
+        """
+        Render ``graph`` from scratch.
+        """
+        line_info = printdevDAG.PrintGraph.line_info(graph)
+        return list(getattr(printdevDAG.PrintGraph, traversal)(graph, line_info))
+
+    @pytest.mark.parametrize(
+       'traversal',
+       ['depth_first', 'breadth_first', 'layers']
+    )
+    def test_feed(self, traversal):
+        """
+        Verify that after every burst of events the rendering is the same
+        as a rendering from scratch.
+        """
+        renderer = printdevDAG.IncrementalRenderer(
+           self._GRAPH.copy(),
+           traversal
+        )
+        assert renderer.render() == self._expected(self._GRAPH, traversal)
+
+        events = list(EventFeed(self._GRAPH, seed=3).events(60))
+        for start in range(0, len(events), 4):
+            renderer.extend(events[start:start + 4])
+            assert renderer.render() == \
+               self._expected(renderer.graph, traversal)
+
+    def test_diff(self):
+        """
+        Verify that a change to a single device yields a small diff.
+        """
+        renderer = printdevDAG.IncrementalRenderer(self._GRAPH.copy())
+        lines = renderer.render()
+        assert renderer.diff() == []
+
+        feed = EventFeed(self._GRAPH, seed=0)
+        event = feed.change()[0]
+        renderer.push(event)
+        diff = renderer.diff()
+        removed = [l for l in diff if l.startswith('-') and l != '--- before']
+        added = [l for l in diff if l.startswith('+') and l != '+++ after']
+        assert removed != [] and len(removed) == len(added)
+        assert len(removed) < len(lines)
+
+    def test_patch(self):
+        """
+        Verify that every diff transforms one rendering into the next.
+        """
+        renderer = printdevDAG.IncrementalRenderer(self._GRAPH.copy())
+        lines = renderer.render()
+        events = list(EventFeed(self._GRAPH, seed=5).events(40))
+        for start in range(0, len(events), 2):
+            renderer.extend(events[start:start + 2])
+            diff = renderer.diff()
+            new_lines = self._expected(renderer.graph, 'depth_first')
+            assert _patch(lines, diff) == new_lines
+            lines = new_lines
+
+    def test_coalesce(self):
+        """
+        Verify that events which cancel out leave the rendering unchanged.
+        """
+        renderer = printdevDAG.IncrementalRenderer(self._GRAPH.copy())
+        renderer.render()
+        feed = EventFeed(self._GRAPH, seed=0)
+        events = feed.add()
+        renderer.extend(events)
+        renderer.push(printdevDAG.GraphEvent.remove_node(events[0].node))
+        assert renderer.diff() == []
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_item_str
+    ===================
+
+    Tests getters for node values.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from hypothesis import given
+from hypothesis import strategies
+
+import justbytes
+
+import pydevDAG
+
+import printdevDAG
+
+from printdevDAG._item_str import DMUUIDs
+from printdevDAG._item_str import Lookup
+from printdevDAG._item_str import Sizes
+
+from benchmarks import DAGGenerator
+
+from ._constants import DECORATED
+
+_GRAPH = DAGGenerator().graph(1)
+
+_KEYS = strategies.sampled_from(['a', 'b', 'c'])
+
+_TREES = strategies.recursive(
+   strategies.one_of(strategies.none(), strategies.integers()),
+   lambda children: strategies.dictionaries(_KEYS, children)
+)
+
+_PATHS = strategies.lists(
+   strategies.lists(_KEYS, min_size=1, max_size=4).map(tuple)
+)
+
+
+class TestLookup(object):
+    """
+    Test looking up values in node attributes.
+    """
+
+    def test_get_value(self):
+        """
+        Verify that missing values are None.
+        """
+        tree = {'UDEV' : {'DEVNAME' : '/dev/sda'}, 'SYSNAME' : 'sda'}
+        assert Lookup.get_value(tree, ('UDEV', 'DEVNAME')) == '/dev/sda'
+        assert Lookup.get_value(tree, ('UDEV', 'DM_UUID')) is None
+        assert Lookup.get_value(tree, ('SYSFS', 'size')) is None
+        assert Lookup.get_value(tree, ('SYSNAME', 'size')) is None
+
+    @given(_TREES, _PATHS)
+    def test_get_values(self, tree, paths):
+        """
+        Verify that a batch lookup yields the same values as single lookups.
+        """
+        values = Lookup.get_values(tree, tuple(paths))
+        assert values == dict((p, Lookup.get_value(tree, p)) for p in paths)
+
+
+class TestNodeGetters(object):
+    """
+    Test that getters agree with pydevDAG's getters.
+    """
+
+    _NAMES = [
+       'DEVNAME',
+       'DEVPATH',
+       'DEVTYPE',
+       'DMNAME',
+       'DMUUIDSUBSYSTEM',
+       'IDENTIFIER',
+       'IDPATH',
+       'IDSASPATH',
+       'MAJOR',
+       'NODETYPE',
+       'SIZE',
+       'SUBSYSTEM',
+       'SYSNAME'
+    ]
+
+    def test_getters(self):
+        """
+        Verify that every getter yields the same value as pydevDAG's.
+        """
+        for graph in (_GRAPH, DECORATED):
+            for node in graph:
+                attrs = graph.node[node]
+                for name in self._NAMES:
+                    getter = getattr(printdevDAG.NodeGetters, name)
+                    expected = getattr(pydevDAG.NodeGetters, name)
+                    assert getter.getter(attrs) == expected.getter(attrs)
+
+    def test_extractor(self):
+        """
+        Verify that a batch extractor agrees with the individual getters.
+        """
+        getters = printdevDAG.PrintGraph.getters()
+        keys = list(getters.keys())
+        extract = printdevDAG.NodeGetters.extractor(keys, getters)
+        for node in _GRAPH:
+            attrs = _GRAPH.node[node]
+            row = extract(attrs)
+            for key in keys:
+                expected = next(
+                   (
+                      v for v in (g.getter(attrs) for g in getters[key]) \
+                         if v is not None
+                   ),
+                   None
+                )
+                assert row[key] == expected
+
+
+class TestDMUUIDs(object):
+    """
+    Test memoized parsing of DM_UUIDs.
+    """
+
+    def test_counters(self):
+        """
+        Verify that repeated DM_UUIDs are parsed once.
+        """
+        dm_uuids = DMUUIDs()
+        for node in _GRAPH:
+            value = Lookup.get_value(_GRAPH.node[node], ('UDEV', 'DM_UUID'))
+            if value is not None:
+                dm_uuids.parse(value)
+                dm_uuids.parse(value)
+        info = dm_uuids.cache_info()
+        assert info['misses'] == info['size']
+        assert info['hits'] == info['misses']
+
+        dm_uuids.clear()
+        assert dm_uuids.cache_info()['size'] == 0
+
+    def test_eviction(self):
+        """
+        Verify that the cache is bounded.
+        """
+        dm_uuids = DMUUIDs(cache_size=1)
+        dm_uuids.parse('LVM-a')
+        dm_uuids.parse('CRYPT-b')
+        dm_uuids.parse('LVM-a')
+        assert dm_uuids.cache_info()['misses'] == 3
+        assert dm_uuids.cache_info()['size'] == 1
+
+    def test_fields(self):
+        """
+        Verify parsing of unusual DM_UUIDs.
+        """
+        dm_uuids = DMUUIDs()
+        assert dm_uuids.parse('mpath-3600a')['subsystem'] == 'mpath'
+        assert dm_uuids.parse('LVM') == {'subsystem' : 'LVM', 'rest' : ''}
+        assert dm_uuids.parse('-abc') is None
+
+
+class TestSizes(object):
+    """
+    Test formatting sizes.
+    """
+
+    def test_sweep(self):
+        """
+        Verify that integer arithmetic agrees with justbytes for every size
+        up to 8 MiB, and near every power of two.
+        """
+        sizes = list(range(2 ** 14)) + \
+           [2 ** e + d for e in range(16, 100) for d in range(-3, 4)]
+        for size in sizes:
+            assert Sizes.fast_str(size) == Sizes.justbytes_str(size)
+
+    @given(strategies.integers(min_value=0, max_value=2 ** 90))
+    def test_fast(self, size):
+        """
+        Verify that integer arithmetic agrees with justbytes.
+        """
+        assert Sizes.fast_str(size) == Sizes.justbytes_str(size)
+
+    def test_format(self):
+        """
+        Verify that sizes are formatted once, and that unusual values are
+        formatted by justbytes.
+        """
+        sizes = Sizes()
+        for value in ['0', '2048', '2048', 7, '1.5', ' 12']:
+            assert sizes.format(value) == Sizes.justbytes_str(value)
+        info = sizes.cache_info()
+        assert info['misses'] == 5
+        assert info['hits'] == 1
+
+        sizes.clear()
+        assert sizes.cache_info()['size'] == 0
+
+    def test_config(self):
+        """
+        Verify that a change in justbytes' configuration is respected.
+        """
+        sizes = Sizes()
+        assert sizes.format('3000') == '> 1.46 MiB'
+        config = justbytes.Config.STRING_CONFIG
+        try:
+            justbytes.Config.set_value_config(
+               justbytes.ValueConfig(base=16)
+            )
+            assert sizes.format('3000') == Sizes.justbytes_str('3000')
+            assert sizes.format('3000') != '> 1.46 MiB'
+        finally:
+            justbytes.Config.STRING_CONFIG = config
+        assert sizes.format('3000') == '> 1.46 MiB'
@@ -32,13 +32,32 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import io
+import itertools
+import os
+import tempfile
+import threading
+
 from collections import defaultdict
 
+from hypothesis import given
+from hypothesis import strategies
+
+import networkx as nx
+import pytest
+
 import pydevDAG
 
 import printdevDAG
 
+from printdevDAG import _item_str
+from printdevDAG import _layers
+from printdevDAG._utils import GeneralUtils
+
+from benchmarks import DAGGenerator
+
 from ._constants import GRAPH
+from ._getters import CountingGetter
 
 class TestGraphPrint(object):
     """
@@ -66,3 +85,905 @@ class TestGraphPrint(object):
            GRAPH
         )
         assert len(list(lines)) >= len(GRAPH)
+
+
+class TestDepthFirst(object):
+    """
+    Test depth first arrangements of synthetic graphs.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    def _lines(self, back_references):
+        """
+        Get the lines for the graph.
+
+        :param bool back_references: whether to use back references
+        """
+        line_info = printdevDAG.PrintGraph.line_info(self._GRAPH)
+        return list(
+           printdevDAG.GraphLineArrangements.node_strings_from_graph(
+              printdevDAG.GraphLineArrangementsConfig(
+                 line_info.info,
+                 lambda k, v: str(v),
+                 'NAME',
+                 back_references=back_references
+              ),
+              self._GRAPH
+           )
+        )
+
+    def test_back_references(self):
+        """
+        Verify that with back references every edge yields a single line.
+        """
+        graph = self._GRAPH
+        lines = self._lines(True)
+        roots = [n for n in graph if graph.in_degree(n) == 0]
+        assert len(lines) == len(roots) + graph.number_of_edges()
+
+        expanded = [l for l in lines if l['reference'] is None]
+        assert len(expanded) == len(graph)
+
+    def test_back_references_prefix(self):
+        """
+        Verify that the expanded lines are the first lines of the full
+        expansion, in the same order, until the first back reference.
+        """
+        full = self._lines(False)
+        once = self._lines(True)
+        for (full_line, once_line) in zip(full, once):
+            if once_line['reference'] is not None:
+                break
+            assert full_line == once_line
+
+    def test_full_expansion(self):
+        """
+        Verify that replaying shared subtrees yields the same lines as the
+        pydevDAG depth first traversal.
+        """
+        line_info = printdevDAG.PrintGraph.line_info(self._GRAPH)
+        nodes = pydevDAG.DepthFirst.nodes(
+           self._GRAPH,
+           lambda n: str(line_info.info(n, ['NAME'])['NAME'])
+        )
+        expected = [
+           (depth, last, line_info.info(node, conv=lambda k, v: str(v))) \
+              for (depth, node, last) in nodes
+        ]
+        lines = self._lines(False)
+        assert [(l['indent'], l['last'], l['node']) for l in lines] == \
+           expected
+
+    def test_xform(self):
+        """
+        Verify that transforming lines leaves the rows of shared subtrees
+        unchanged.
+        """
+        keys = printdevDAG.PrintGraph.line_info(self._GRAPH).keys
+        lines = self._lines(False)
+        nodes = [dict(l['node']) for l in lines]
+        rows = list(printdevDAG.GraphXformLines.xform(keys, lines))
+        assert [l['node'] for l in lines] == nodes
+        assert [r['NAME'].endswith(n['NAME']) for (r, n) in \
+           zip(rows, nodes)] == [True] * len(rows)
+
+    def test_xform_references(self):
+        """
+        Verify that back references are transformed to a full row.
+        """
+        keys = printdevDAG.PrintGraph.line_info(self._GRAPH).keys
+        rows = printdevDAG.GraphXformLines.xform(keys, self._lines(True))
+        assert all(sorted(row.keys()) == sorted(keys) for row in rows)
+
+
+def _reference_layers(config, graph):
+    """
+    The layers of graph, as calculated before the single pass engine.
+
+    :param GraphLineArrangementsConfig config: the config
+    :param `DiGraph` graph: the graph
+    :returns: the layers
+    :rtype: generator of tuple * Table
+    """
+    node_key_func = GeneralUtils.str_key_func_gen(
+       lambda n: config.info_func(n, [config.sort_key])[config.sort_key]
+    )
+    nodes = pydevDAG.BreadthFirst.nodes(graph, key_func=node_key_func)
+
+    def key_func(node):
+        """
+        The key for each node.
+        """
+        attrs = graph.node[node]
+        return (
+           printdevDAG.NodeGetters.NODETYPE.getter(attrs),
+           printdevDAG.NodeGetters.DEVTYPE.getter(attrs),
+           printdevDAG.NodeGetters.DMUUIDSUBSYSTEM.getter(attrs),
+           printdevDAG.NodeGetters.MAJOR.getter(attrs)
+        )
+
+    def sort_key_func(node):
+        """
+        The key for sorting each node.
+        """
+        return tuple((v is not None, v) for v in key_func(node))
+
+    for (_, level_nodes) in itertools.groupby(nodes, lambda x: x[0]):
+        level_node_names = \
+           sorted(set(x[1] for x in level_nodes), key=sort_key_func)
+        for (desig, node_group) in \
+           itertools.groupby(level_node_names, key_func):
+            table = printdevDAG.Table()
+            for node in sorted(node_group, key=node_key_func):
+                table.append_row(
+                   config.info_func(node, keys=None, conv=config.conversion_func)
+                )
+            yield (desig, table)
+
+
+class TestGraphLevels(object):
+    """
+    Test assigning each node to a single level.
+    """
+
+    _GRAPH = DAGGenerator().graph(5)
+
+    @staticmethod
+    def _path_lengths(graph):
+        """
+        The lengths of all paths to each node from any root.
+
+        :param `DiGraph` graph: the graph
+        :rtype: dict of str * (set of int)
+        """
+        lengths = defaultdict(set)
+        roots = [n for n in graph if graph.in_degree(n) == 0]
+        for (depth, node, _) in pydevDAG.BreadthFirst.nodes(graph, str):
+            lengths[node].add(depth)
+        assert all(lengths[r] == set([0]) for r in roots)
+        return lengths
+
+    @pytest.mark.parametrize('semantics', printdevDAG.GraphLevels.SEMANTICS)
+    def test_levels(self, semantics):
+        """
+        Verify that every node is yielded once, at the shortest or longest
+        path to it, and that nodes are ordered by level and key.
+        """
+        graph = self._GRAPH
+        lengths = self._path_lengths(graph)
+        choose = min if semantics == printdevDAG.GraphLevels.SHORTEST else max
+
+        nodes = list(printdevDAG.GraphLevels.nodes(graph, str, semantics))
+        assert sorted(n for (_, n) in nodes) == sorted(graph.nodes())
+        assert all(level == choose(lengths[n]) for (level, n) in nodes)
+        assert nodes == sorted(nodes)
+
+    def test_longest(self):
+        """
+        Verify that with longest path semantics every node is below all its
+        parents.
+        """
+        graph = self._GRAPH
+        level = dict(
+           (n, l) for (l, n) in printdevDAG.GraphLevels.nodes(
+              graph,
+              str,
+              printdevDAG.GraphLevels.LONGEST
+           )
+        )
+        assert all(level[u] < level[v] for (u, v) in graph.edges())
+
+    def test_errors(self):
+        """
+        Verify that cycles and unknown semantics are errors.
+        """
+        graph = nx.DiGraph()
+        graph.add_edges_from([('a', 'b'), ('b', 'c'), ('c', 'b')])
+        with pytest.raises(ValueError):
+            printdevDAG.GraphLevels.levels(graph)
+        with pytest.raises(ValueError):
+            printdevDAG.GraphLevels.levels(self._GRAPH, 'widest')
+
+    def test_breadth_first(self):
+        """
+        Verify that breadth first output shows every node once, in the same
+        order whatever the order of the nodes in the graph.
+        """
+        graph = self._GRAPH
+        reordered = nx.DiGraph()
+        reordered.add_nodes_from(
+           sorted(graph.nodes(data=True), reverse=True)
+        )
+        reordered.add_edges_from(graph.edges())
+
+        lines = [
+           list(printdevDAG.PrintGraph.breadth_first(
+              g,
+              printdevDAG.PrintGraph.line_info(g),
+              levels=printdevDAG.GraphLevels.SHORTEST
+           )) for g in (graph, reordered)
+        ]
+        assert lines[0] == lines[1]
+        levels = max(l for (l, _) in printdevDAG.GraphLevels.nodes(graph, str))
+        # each level has a blank line, a title, and a header
+        assert len(lines[0]) == len(graph) + 3 * (levels + 1)
+
+
+class TestLayers(object):
+    """
+    Test the layered arrangement of graphs.
+    """
+    # pylint: disable=too-few-public-methods
+
+    @pytest.mark.parametrize('graph', [GRAPH] + \
+       [DAGGenerator(seed).graph(n) for (seed, n) in [(0, 1), (1, 5), (2, 20)]])
+    def test_reference(self, graph):
+        """
+        Verify that the layers are the same as those of the reference
+        implementation, in the same order.
+        """
+        line_info = printdevDAG.PrintGraph.line_info(graph)
+        config = _layers.GraphLineArrangementsConfig(
+           line_info.info,
+           lambda k, v: str(v),
+           'NAME'
+        )
+        keys = line_info.keys
+        assert [
+           (desig, list(table.rows(keys))) for (desig, table) in \
+              _layers.GraphLineArrangements.node_strings_from_graph(
+                 config,
+                 graph
+              )
+        ] == [
+           (desig, list(table.rows(keys))) for (desig, table) in \
+              _reference_layers(config, graph)
+        ]
+
+
+class TestDepthFirstWindow(object):
+    """
+    Test rendering windows of the depth first view.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    def _full(self, graph, widths=None):
+        """
+        The whole depth first output.
+        """
+        line_info = printdevDAG.PrintGraph.line_info(graph)
+        return list(
+           printdevDAG.PrintGraph.depth_first(graph, line_info, widths=widths)
+        )
+
+    @pytest.mark.parametrize('widths', [None, 12])
+    def test_windows(self, widths):
+        """
+        Verify that every window is the same as a slice of the output.
+        """
+        if widths is not None:
+            widths = dict((k, widths) for k in printdevDAG.PrintGraph.KEYS)
+        full = self._full(self._GRAPH, widths)
+        window = printdevDAG.DepthFirstWindow(
+           self._GRAPH,
+           printdevDAG.PrintGraph.line_info(self._GRAPH),
+           widths
+        )
+        assert len(window) == len(full) - 1
+        assert window.header() == full[0]
+        for start in range(0, len(full) + 3, 7):
+            assert window.lines(start, start + 10) == \
+               full[1 + start:1 + start + 10]
+
+    def test_invalidate(self):
+        """
+        Verify that after invalidation windows reflect a changed graph.
+        """
+        graph = self._GRAPH.copy()
+        window = printdevDAG.DepthFirstWindow(
+           graph,
+           printdevDAG.PrintGraph.line_info(graph)
+        )
+        window.lines(0, 10)
+
+        leaf = next(n for n in graph if graph.out_degree(n) == 0)
+        parent = next(n for n in graph if graph.in_degree(n) == 0)
+        graph.add_edge(parent, leaf)
+        window.invalidate()
+
+        full = self._full(graph)
+        assert len(window) == len(full) - 1
+        assert window.lines(0, len(window)) == full[1:]
+
+    def test_negative(self):
+        """
+        Verify that negative rows are an error.
+        """
+        window = printdevDAG.DepthFirstWindow(
+           self._GRAPH,
+           printdevDAG.PrintGraph.line_info(self._GRAPH)
+        )
+        with pytest.raises(ValueError):
+            window.lines(-1, 10)
+
+
+class TestGraphReachability(object):
+    """
+    Test selecting the part of a graph reachable from some nodes.
+    """
+
+    _GRAPH = DAGGenerator().graph(5)
+
+    def _seeds(self):
+        """
+        Some nodes in the middle of the graph.
+        """
+        return sorted(
+           n for n in self._GRAPH if self._GRAPH.in_degree(n) > 0 and \
+              self._GRAPH.out_degree(n) > 0
+        )[:3]
+
+    def test_select(self):
+        """
+        Verify selections in every direction.
+        """
+        graph = self._GRAPH
+        seeds = self._seeds()
+        reachability = printdevDAG.GraphReachability(graph)
+        down = set(seeds).union(*(nx.descendants(graph, s) for s in seeds))
+        up = set(seeds).union(*(nx.ancestors(graph, s) for s in seeds))
+
+        for _ in range(2):
+            assert reachability.select(seeds, 'down') == down
+            assert reachability.select(seeds, 'up') == up
+            assert reachability.select(seeds, 'both') == down | up
+
+        assert all(
+           reachability.select([n], 'down') == \
+              set([n]) | nx.descendants(graph, n) for n in graph
+        )
+
+    def test_errors(self):
+        """
+        Verify that unknown directions and nodes are errors.
+        """
+        reachability = printdevDAG.GraphReachability(self._GRAPH)
+        with pytest.raises(ValueError):
+            reachability.select(self._seeds(), 'sideways')
+        with pytest.raises(ValueError):
+            reachability.select(['no such node'])
+
+    @pytest.mark.parametrize(
+       'traversal',
+       ['depth_first', 'breadth_first', 'layers']
+    )
+    def test_print(self, traversal):
+        """
+        Verify that printing a selection prints its subgraph.
+        """
+        graph = self._GRAPH
+        seeds = self._seeds()
+        selected = set(seeds).union(*(nx.ancestors(graph, s) for s in seeds))
+        subgraph = graph.subgraph(selected)
+
+        out = io.StringIO()
+        printdevDAG.PrintGraph.print_graph(
+           out,
+           graph,
+           traversal,
+           seeds=seeds,
+           direction='up'
+        )
+        expected = getattr(printdevDAG.PrintGraph, traversal)(
+           subgraph,
+           printdevDAG.PrintGraph.line_info(subgraph)
+        )
+        assert out.getvalue() == "".join(l + "\n" for l in expected)
+
+    def test_find(self):
+        """
+        Verify finding nodes by their whole name, or its last component.
+        """
+        graph = self._GRAPH
+        line_info = printdevDAG.PrintGraph.line_info(graph)
+        node = self._seeds()[0]
+        name = line_info.info(node, ['NAME'])['NAME']
+        short = name.rsplit('/', 1)[-1]
+        found = printdevDAG.PrintGraph.find(graph, [name, short, 'no such'])
+        assert node in found[name] or node in found[short]
+        assert 'no such' not in found
+
+
+class TestStreaming(object):
+    """
+    Test streaming output of tables.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    def _lines(self, **kwargs):
+        """
+        Get the depth first output for the graph.
+
+        :param kwargs: keyword arguments for the traversal
+        """
+        line_info = printdevDAG.PrintGraph.line_info(self._GRAPH)
+        return list(
+           printdevDAG.PrintGraph.depth_first(self._GRAPH, line_info, **kwargs)
+        )
+
+    def test_spill(self):
+        """
+        Verify that spilling rows does not change the output.
+        """
+        assert self._lines(spill=True) == self._lines()
+
+    def test_widths(self):
+        """
+        Verify that sufficient widths do not change the output, and that
+        insufficient widths truncate values.
+        """
+        lines = self._lines()
+        widths = dict(
+           (k, max(len(l[k]) for l in self._rows())) \
+              for k in printdevDAG.PrintGraph.KEYS
+        )
+        assert self._lines(widths=widths) == lines
+
+        narrow = self._lines(widths=dict((k, 1) for k in widths))
+        assert len(narrow) == len(lines)
+        assert narrow[0].split() == printdevDAG.PrintGraph.KEYS
+        assert len(set(len(l) for l in narrow)) == 1
+
+    def test_memory(self, monkeypatch):
+        """
+        Verify that the peak memory used to stream a graph does not grow
+        with the size of the graph.
+        """
+        tracemalloc = pytest.importorskip("tracemalloc")
+
+        # do not let the process-wide DM UUID memo fill up during the test
+        monkeypatch.setattr(
+           _item_str.DmUuidSubsystem,
+           'DM_UUIDS',
+           _item_str.DMUUIDs(cache_size=0)
+        )
+        monkeypatch.setattr(printdevDAG.PrintGraph, 'STREAM_CACHE_SIZE', 64)
+
+        graphs = [DAGGenerator().graph(n) for n in (1000, 4000)]
+        widths = dict((k, 20) for k in printdevDAG.PrintGraph.KEYS)
+
+        def peak(graph, **kwargs):
+            """
+            Get the peak memory used to print the graph.
+            """
+            with io.open(os.devnull, 'w', encoding='utf-8') as out:
+                tracemalloc.start()
+                try:
+                    printdevDAG.PrintGraph.print_graph(
+                       out,
+                       graph,
+                       'depth_first',
+                       **kwargs
+                    )
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        for kwargs in (dict(widths=widths), dict(spill=True)):
+            # warm up interpreter free lists on the larger graph
+            peak(graphs[-1], **kwargs)
+            (small, large) = [peak(g, **kwargs) for g in graphs]
+            assert large < 1.25 * small
+
+    def _rows(self):
+        """
+        Get the rows of the depth first output.
+        """
+        line_info = printdevDAG.PrintGraph.line_info(self._GRAPH)
+        return list(
+           printdevDAG.GraphXformLines.xform(
+              line_info.keys,
+              printdevDAG.GraphLineArrangements.node_strings_from_graph(
+                 printdevDAG.GraphLineArrangementsConfig(
+                    line_info.info,
+                    lambda k, v: str(v),
+                    'NAME'
+                 ),
+                 self._GRAPH
+              )
+           )
+        )
+
+
+class TestTable(object):
+    """
+    Test storing rows by column.
+    """
+
+    def test_table(self):
+        """
+        Verify that rows are stored by column, and equal values just once.
+        """
+        keys = ['NAME', 'SIZE']
+        table = printdevDAG.Table(keys)
+        table.append(['sda', '1' + ' GiB'])
+        table.append_row({'SIZE' : '1' + ' GiB', 'NAME' : 'sdb'})
+        assert len(table) == 2
+        assert table.column('NAME') == ['sda', 'sdb']
+        assert table.column('SIZE')[0] is table.column('SIZE')[1]
+        assert list(table.rows(['SIZE', 'NAME'])) == \
+           [('1 GiB', 'sda'), ('1 GiB', 'sdb')]
+        assert table.widths(keys) == {'NAME' : 4, 'SIZE' : 5}
+        with pytest.raises(KeyError):
+            table.rows(['NAME', 'TYPE'])
+
+    def test_lines(self):
+        """
+        Verify that a table prints the same as its rows.
+        """
+        keys = ['NAME', 'SIZE']
+        rows = [{'NAME' : 'sda', 'SIZE' : '1 GiB'}, {'NAME' : 'b', 'SIZE' : ''}]
+        table = printdevDAG.Table()
+        for row in rows:
+            table.append_row(row)
+        alignment = {'NAME' : '<', 'SIZE' : '>'}
+        assert list(printdevDAG.Print.lines(keys, table, 2, alignment)) == \
+           list(printdevDAG.Print.lines(keys, rows, 2, alignment))
+
+
+_ROWS = strategies.lists(
+   strategies.tuples(strategies.text(), strategies.text()),
+   max_size=20
+)
+
+
+class TestWidthTracker(object):
+    """
+    Test tracking column widths.
+    """
+
+    _KEYS = ['NAME', 'SIZE']
+
+    def _widths(self, rows):
+        """
+        Calculate the widths of rows directly.
+        """
+        return dict(
+           (k, max([len(k)] + [len(r[i]) for r in rows])) for \
+              (i, k) in enumerate(self._KEYS)
+        )
+
+    @given(_ROWS, _ROWS)
+    def test_merge(self, rows1, rows2):
+        """
+        Verify that merged trackers agree with a single tracker.
+        """
+        (tracker1, tracker2) = \
+           (printdevDAG.WidthTracker(self._KEYS) for _ in range(2))
+        for row in rows1:
+            tracker1.add(row)
+        for (i, key) in enumerate(self._KEYS):
+            tracker2.add_column(key, [r[i] for r in rows2])
+        assert tracker1.merge(tracker2).widths() == \
+           self._widths(rows1 + rows2)
+
+    @given(_ROWS, _ROWS)
+    def test_remove(self, rows1, rows2):
+        """
+        Verify that removing rows restores the widths of the others.
+        """
+        tracker = printdevDAG.WidthTracker(self._KEYS)
+        for row in rows1 + rows2:
+            tracker.add(row)
+        for row in rows2:
+            tracker.remove(row)
+        assert tracker.widths(2) == \
+           dict((k, w + 2) for (k, w) in self._widths(rows1).items())
+
+    def test_headers(self):
+        """
+        Verify that only the columns in the column headers are measured.
+        """
+        rows = [{'NAME' : 'sda', 'SIZE' : '1 GiB', 'OTHER' : 'x' * 10}]
+        assert printdevDAG.Print.calculate_widths(self._KEYS, rows, 0) == \
+           {'NAME' : 4, 'SIZE' : 5}
+
+
+class TestRowFormatter(object):
+    """
+    Test formatting rows with a formatter for the layout.
+    """
+
+    _KEYS = ['NAME', 'SIZE', 'MAJOR']
+
+    @given(
+       strategies.lists(strategies.text(), min_size=3, max_size=3),
+       strategies.sampled_from(['<', '>', '^']),
+       strategies.booleans()
+    )
+    def test_format(self, row, align, truncate):
+        """
+        Verify that the formatter agrees with str.format.
+        """
+        widths = {'NAME' : 6, 'SIZE' : 4, 'MAJOR' : 0}
+        alignment = {'NAME' : '<', 'SIZE' : '>', 'MAJOR' : align}
+        max_widths = dict((k, 3) for k in self._KEYS) if truncate else None
+        formatter = printdevDAG.RowFormatter.get(
+           self._KEYS,
+           widths,
+           alignment,
+           max_widths
+        )
+        fmt_str = printdevDAG.Print.row_format_str(
+           widths,
+           self._KEYS,
+           alignment,
+           max_widths
+        )
+        assert formatter.format_row(row) == fmt_str.format(*row)
+        assert formatter.header == \
+           printdevDAG.Print.header_str(widths, self._KEYS, alignment)
+
+    def test_cache(self):
+        """
+        Verify that a formatter is compiled once for a layout.
+        """
+        alignment = defaultdict(lambda: '<')
+        formatters = [
+           printdevDAG.RowFormatter.get(
+              self._KEYS,
+              dict((k, 5) for k in self._KEYS),
+              alignment
+           ) for _ in range(2)
+        ]
+        assert formatters[0] is formatters[1]
+
+
+class TestLineWriter(object):
+    """
+    Test writing lines in chunks.
+    """
+
+    _GRAPH = DAGGenerator().graph(1000)
+
+    def _expected(self):
+        """
+        The output, written a line at a time.
+        """
+        out = io.StringIO()
+        line_info = printdevDAG.PrintGraph.line_info(self._GRAPH)
+        for line in printdevDAG.PrintGraph.depth_first(self._GRAPH, line_info):
+            print(line, end="\n", file=out)
+        return out.getvalue()
+
+    def test_sinks(self):
+        """
+        Verify that text files, binary files, and file descriptors all get
+        the same output, in a few writes.
+        """
+        expected = self._expected()
+        encoded = expected.encode('utf-8')
+        lines = expected.count("\n")
+
+        text = io.StringIO()
+        report = printdevDAG.PrintGraph.print_graph(
+           text,
+           self._GRAPH,
+           'depth_first'
+        )
+        assert text.getvalue() == expected
+        assert report['lines'] == lines
+        assert report['bytes'] == len(expected)
+        assert report['writes'] <= \
+           len(expected) // printdevDAG.LineWriter.CHUNK_SIZE + 1
+
+        binary = io.BytesIO()
+        report = printdevDAG.PrintGraph.print_graph(
+           binary,
+           self._GRAPH,
+           'depth_first'
+        )
+        assert binary.getvalue() == encoded
+        assert report['bytes'] == len(encoded)
+
+        with tempfile.TemporaryFile() as tmp:
+            report = printdevDAG.PrintGraph.print_graph(
+               tmp.fileno(),
+               self._GRAPH,
+               'depth_first'
+            )
+            os.lseek(tmp.fileno(), 0, os.SEEK_SET)
+            assert tmp.read() == encoded
+        assert report['lines'] == lines
+        assert report['writes'] <= len(encoded) // \
+           (printdevDAG.LineWriter.CHUNK_SIZE * printdevDAG.LineWriter.CHUNKS) \
+           + 1
+
+    def test_wrapper(self):
+        """
+        Verify that a text stream which is not an io.TextIOBase, and whose
+        mode is not a str, gets text.
+        """
+
+        class Wrapper(object):
+            """
+            A text stream wrapping a binary one, with an int mode.
+            """
+            # pylint: disable=too-few-public-methods
+            mode = 0o644
+
+            def __init__(self):
+                self.buffer = io.BytesIO()
+                self.text = io.StringIO()
+
+            def write(self, text):
+                """
+                Write text.
+                """
+                self.text.write(text)
+
+        out = Wrapper()
+        printdevDAG.PrintGraph.print_graph(out, self._GRAPH, 'depth_first')
+        assert out.text.getvalue() == self._expected()
+        assert out.buffer.getvalue() == b""
+
+
+class TestParallelExtraction(object):
+    """
+    Test extracting values in a pool of processes.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    def test_extract(self):
+        """
+        Verify that parallel and serial extraction agree, in order.
+        """
+        attrs = [self._GRAPH.node[n] for n in self._GRAPH]
+        keys = printdevDAG.PrintGraph.KEYS
+        getters = printdevDAG.PrintGraph.getters()
+        parallel = printdevDAG.ParallelExtraction(
+           workers=2,
+           chunk_size=7,
+           threshold=0
+        )
+        serial = printdevDAG.ParallelExtraction(workers=1)
+        assert parallel.parallel(len(attrs))
+        assert not serial.parallel(len(attrs))
+        assert parallel.extract(attrs, keys, getters) == \
+           serial.extract(attrs, keys, getters)
+
+    def test_threads(self):
+        """
+        Verify that extractions in concurrent threads each extract the
+        values of their own nodes.
+        """
+        keys = printdevDAG.PrintGraph.KEYS
+        getters = printdevDAG.PrintGraph.getters()
+        parallel = printdevDAG.ParallelExtraction(
+           workers=2,
+           chunk_size=7,
+           threshold=0
+        )
+        serial = printdevDAG.ParallelExtraction(workers=1)
+        graphs = [DAGGenerator(seed=s).graph(1) for s in range(4)]
+        attrs = [[g.node[n] for n in g] for g in graphs]
+        results = dict()
+
+        def extract(index):
+            """
+            Extract the values of graph ``index`` several times.
+            """
+            results[index] = [
+               parallel.extract(attrs[index], keys, getters) for _ in range(3)
+            ]
+
+        threads = [
+           threading.Thread(target=extract, args=(i,)) \
+              for i in range(len(graphs))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for (index, node_attrs) in enumerate(attrs):
+            expected = serial.extract(node_attrs, keys, getters)
+            assert results[index] == [expected] * 3
+
+    def test_print(self):
+        """
+        Verify that extracting values in advance does not change output.
+        """
+        extraction = printdevDAG.ParallelExtraction(workers=2, threshold=0)
+        for traversal in ('depth_first', 'breadth_first', 'layers'):
+            lines = [
+               list(getattr(printdevDAG.PrintGraph, traversal)(
+                  self._GRAPH,
+                  printdevDAG.PrintGraph.line_info(self._GRAPH, e)
+               )) for e in (None, extraction)
+            ]
+            assert lines[0] == lines[1]
+
+
+class TestGraphLineInfo(object):
+    """
+    Test caching of values in GraphLineInfo.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    def _line_info(self, cache_size=printdevDAG.GraphLineInfo.CACHE_SIZE):
+        """
+        A line info with a single counted column.
+        """
+        counter = CountingGetter()
+        line_info = printdevDAG.GraphLineInfo(
+           self._GRAPH,
+           ['NAME'],
+           defaultdict(lambda: '<'),
+           {'NAME' : [counter]},
+           cache_size=cache_size
+        )
+        return (line_info, counter)
+
+    def test_all_views(self):
+        """
+        Verify that every getter is called once per node for all views.
+        """
+        (line_info, counter) = self._line_info()
+        for traversal in ('depth_first', 'breadth_first', 'layers'):
+            lines = getattr(printdevDAG.PrintGraph, traversal)(
+               self._GRAPH,
+               line_info
+            )
+            assert list(lines) != []
+        assert counter.calls == len(self._GRAPH)
+
+    def test_invalidate(self):
+        """
+        Verify that invalidation causes values to be recalculated.
+        """
+        (line_info, counter) = self._line_info()
+        node = next(iter(self._GRAPH))
+        line_info.info(node)
+        line_info.info(node)
+        assert counter.calls == 1
+
+        line_info.invalidate(node)
+        line_info.info(node)
+        assert counter.calls == 2
+
+        line_info.invalidate()
+        line_info.info(node)
+        assert counter.calls == 3
+
+    def test_eviction(self):
+        """
+        Verify that the least recently used node is evicted.
+        """
+        (line_info, counter) = self._line_info(cache_size=2)
+        (node1, node2, node3) = list(self._GRAPH)[:3]
+        line_info.info(node1)
+        line_info.info(node2)
+        line_info.info(node1)
+        line_info.info(node3)
+        assert counter.calls == 3
+
+        line_info.info(node1)
+        assert counter.calls == 3
+        line_info.info(node2)
+        assert counter.calls == 4
+
+    def test_no_cache(self):
+        """
+        Verify that a cache size of 0 disables caching.
+        """
+        (line_info, counter) = self._line_info(cache_size=0)
+        node = next(iter(self._GRAPH))
+        line_info.info(node)
+        line_info.info(node)
+        assert counter.calls == 2
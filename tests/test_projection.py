@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_projection
+    =====================
+
+    Tests calculating only some columns.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+import printdevDAG
+
+from benchmarks import DAGGenerator
+
+
+class TestProjection(object):
+    """
+    Test calculating only some columns.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    @staticmethod
+    def _cached_keys(line_info):
+        """
+        The keys of all values cached by ``line_info``.
+        """
+        # pylint: disable=protected-access
+        return set(k for v in line_info._cache.values() for k in v)
+
+    @pytest.mark.parametrize(
+       'traversal',
+       ['depth_first', 'breadth_first', 'layers']
+    )
+    def test_columns(self, traversal):
+        """
+        Verify that only the columns and the sort key are calculated, and
+        that their values are the same as for all columns.
+        """
+        line_info = printdevDAG.PrintGraph.line_info(
+           self._GRAPH,
+           columns=['DEVNAME', 'SIZE']
+        )
+        lines = list(getattr(printdevDAG.PrintGraph, traversal)(
+           self._GRAPH,
+           line_info
+        ))
+        assert self._cached_keys(line_info) == set(['SIZE', 'DEVNAME', 'NAME'])
+        assert lines[0 if traversal == 'depth_first' else 2].split() == \
+           ['DEVNAME', 'SIZE']
+
+        full = list(getattr(printdevDAG.PrintGraph, traversal)(
+           self._GRAPH,
+           printdevDAG.PrintGraph.line_info(self._GRAPH)
+        ))
+        assert len(lines) == len(full)
+
+        columns = self._cells(traversal, ['DEVNAME', 'SIZE'])
+        all_columns = self._cells(traversal, printdevDAG.PrintGraph.KEYS)
+        assert len(columns) == len(all_columns)
+        assert len([r for r in columns if isinstance(r, dict)]) > len(full) // 2
+        for (row, full_row) in zip(columns, all_columns):
+            if isinstance(row, dict):
+                # the first column is indented in depth first output
+                assert row['DEVNAME'].lstrip(' |`-') == full_row['DEVNAME']
+                assert row['SIZE'] == full_row['SIZE']
+            else:
+                assert row == full_row
+
+    def _cells(self, traversal, columns):
+        """
+        The cells of every row of ``traversal`` showing ``columns``.
+
+        :returns: each row's cells, indexed by column, or any other line
+        :rtype: list of (dict of str * str) or str
+
+        Every column has the same width, so that each cell is at a known
+        position.
+        """
+        width = 30
+        slot = width + 2
+        line_info = \
+           printdevDAG.PrintGraph.line_info(self._GRAPH, columns=columns)
+        lines = getattr(printdevDAG.PrintGraph, traversal)(
+           self._GRAPH,
+           line_info,
+           widths=dict((k, width) for k in columns)
+        )
+        return [
+           dict(
+              (c, line[i * slot:(i + 1) * slot].strip()) \
+                 for (i, c) in enumerate(columns)
+           ) if len(line) == slot * len(columns) else line for line in lines
+        ]
+
+    def test_unknown(self):
+        """
+        Verify that unknown columns are an error.
+        """
+        with pytest.raises(ValueError):
+            printdevDAG.PrintGraph.line_info(self._GRAPH, columns=['NAMES'])
+
+    def test_lazy(self):
+        """
+        Verify that lazy columns are not extracted in advance, and are only
+        calculated for rows which are shown.
+        """
+        graph = self._GRAPH
+        line_info = printdevDAG.PrintGraph.line_info(
+           graph,
+           printdevDAG.ParallelExtraction(workers=1),
+           lazy=['SIZE']
+        )
+        assert 'SIZE' not in self._cached_keys(line_info)
+        assert 'NAME' in self._cached_keys(line_info)
+
+        window = printdevDAG.DepthFirstWindow(graph, line_info, widths=dict(
+           (k, 20) for k in printdevDAG.PrintGraph.KEYS
+        ))
+        window.lines(0, 3)
+        # pylint: disable=protected-access
+        assert len([
+           v for v in line_info._cache.values() if 'SIZE' in v
+        ]) <= 3
+
+        assert list(printdevDAG.PrintGraph.depth_first(graph, line_info)) == \
+           list(printdevDAG.PrintGraph.depth_first(
+              graph,
+              printdevDAG.PrintGraph.line_info(graph)
+           ))
+
+    def test_lazy_unextracted(self):
+        """
+        Verify that without extraction, lazy columns are calculated just
+        like any other, i.e., for the rows which are shown.
+        """
+        graph = self._GRAPH
+        widths = dict((k, 20) for k in printdevDAG.PrintGraph.KEYS)
+
+        cached = []
+        for lazy in ([], ['SIZE']):
+            line_info = printdevDAG.PrintGraph.line_info(graph, lazy=lazy)
+            assert self._cached_keys(line_info) == set()
+
+            window = printdevDAG.DepthFirstWindow(graph, line_info, widths)
+            window.lines(0, 3)
+            # pylint: disable=protected-access
+            cached.append(dict(
+               (n, set(v)) for (n, v) in line_info._cache.items()
+            ))
+
+        assert cached[0] == cached[1]
+        assert len([v for v in cached[1].values() if 'SIZE' in v]) <= 3
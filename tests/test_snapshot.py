@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_snapshot
+    ===================
+
+    Tests snapshots of graphs and their values.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+import pytest
+
+import pydevDAG
+
+import printdevDAG
+
+from benchmarks import DAGGenerator
+
+
+class TestSnapshot(object):
+    """
+    Test snapshots of graphs and their values.
+    """
+
+    @staticmethod
+    def _print(graph, traversal, **kwargs):
+        """
+        The output of print_graph.
+        """
+        out = io.StringIO()
+        printdevDAG.PrintGraph.print_graph(out, graph, traversal, **kwargs)
+        return out.getvalue()
+
+    @staticmethod
+    def _write(graph, path):
+        """
+        Write a snapshot of graph and all its values.
+        """
+        printdevDAG.Snapshot.write(
+           path,
+           graph,
+           printdevDAG.PrintGraph.line_info(graph),
+           printdevDAG.PrintGraph.KEYS
+        )
+
+    def test_graph(self, tmpdir):
+        """
+        Verify that the graph of a snapshot can be printed from the
+        snapshot alone.
+        """
+        graph = DAGGenerator().graph(1)
+        path = str(tmpdir.join('snapshot'))
+        self._write(graph, path)
+
+        with printdevDAG.Snapshot.load(path) as snapshot:
+            assert len(snapshot) == len(graph)
+            assert snapshot.keys == printdevDAG.PrintGraph.KEYS
+            restored = snapshot.graph()
+            assert sorted(restored.nodes()) == sorted(graph.nodes())
+            assert sorted(restored.edges()) == sorted(graph.edges())
+
+            line_info = printdevDAG.PrintGraph.line_info(graph)
+            restored_info = printdevDAG.PrintGraph.line_info(
+               restored,
+               snapshot=snapshot
+            )
+            for node in graph:
+                assert restored_info.info(node) == line_info.info(node)
+
+        for traversal in ('depth_first', 'breadth_first'):
+            assert self._print(restored, traversal, snapshot=path) == \
+               self._print(graph, traversal)
+
+    def test_changed(self, tmpdir):
+        """
+        Verify that only the values of nodes whose attributes have changed
+        are extracted again.
+        """
+        graph = DAGGenerator().graph(1)
+        path = str(tmpdir.join('snapshot'))
+        self._write(graph, path)
+
+        changed = [n for n in graph if 'UDEV' in graph.node[n]][0]
+        graph.node[changed]['UDEV'] = \
+           dict(graph.node[changed]['UDEV'], DEVNAME='/dev/changed')
+        added = 'added'
+        graph.add_node(added, nodetype=pydevDAG.NodeTypes.WWN)
+
+        with printdevDAG.Snapshot.load(path) as snapshot:
+            line_info = printdevDAG.PrintGraph.line_info(
+               graph,
+               columns=['DEVNAME'],
+               snapshot=snapshot
+            )
+            assert sorted(line_info.restore(snapshot)) == \
+               sorted([changed, added])
+        assert line_info.info(changed)['DEVNAME'] == '/dev/changed'
+
+        for traversal in ('depth_first', 'breadth_first', 'layers'):
+            assert self._print(graph, traversal, snapshot=path) == \
+               self._print(graph, traversal)
+            with printdevDAG.Snapshot.load(path) as snapshot:
+                assert line_info.restore(snapshot) == []
+
+    def test_seeds(self, tmpdir):
+        """
+        Verify that printing only the part of a graph reachable from some
+        seeds leaves the snapshot of the whole graph as it is.
+        """
+        graph = DAGGenerator().graph(2)
+        path = tmpdir.join('snapshot')
+        self._write(graph, str(path))
+        contents = path.read_binary()
+
+        seeds = [n for n in graph if graph.in_degree(n) == 0][:1]
+        output = self._print(
+           graph,
+           'depth_first',
+           seeds=seeds,
+           snapshot=str(path)
+        )
+        assert output == self._print(graph, 'depth_first', seeds=seeds)
+        assert path.read_binary() == contents
+
+        out = io.StringIO()
+        printdevDAG.PrintGraph.emit(
+           out,
+           graph,
+           'depth_first',
+           seeds=seeds,
+           snapshot=str(path)
+        )
+        assert path.read_binary() == contents
+
+    def test_invalid(self, tmpdir):
+        """
+        Verify that a file which is not a snapshot is rejected when loaded,
+        and replaced when printing.
+        """
+        graph = DAGGenerator().graph(1)
+        path = tmpdir.join('snapshot')
+        for contents in (b'', b'not a snapshot' * 10):
+            path.write_binary(contents)
+            with pytest.raises(ValueError):
+                printdevDAG.Snapshot.load(str(path))
+            assert self._print(graph, 'depth_first', snapshot=str(path)) == \
+               self._print(graph, 'depth_first')
+            printdevDAG.Snapshot.load(str(path)).close()
+
+        self._write(graph, str(path))
+        path.write_binary(path.read_binary()[:-1])
+        with pytest.raises(ValueError):
+            printdevDAG.Snapshot.load(str(path))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
+
+"""
+    tests.test_traversal
+    ====================
+
+    Tests the depth first engine.
+
+    .. moduleauthor:: mulhern <amulhern@redhat.com>
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+
+import networkx as nx
+
+import pydevDAG
+
+from printdevDAG._traversal import ChildOrder
+from printdevDAG._traversal import DepthFirst
+
+from benchmarks import DAGGenerator
+
+
+class TestDepthFirstEngine(object):
+    """
+    Test the explicit stack depth first traversal.
+    """
+
+    _GRAPH = DAGGenerator().graph(1)
+
+    def test_nodes(self):
+        """
+        Verify that the traversal agrees with pydevDAG's.
+        """
+        order = ChildOrder(self._GRAPH, str)
+        nodes = DepthFirst.nodes(order)
+        assert [(d, n, l) for (d, n, l, _) in nodes] == \
+           list(pydevDAG.DepthFirst.nodes(self._GRAPH, str))
+
+    def test_deep(self):
+        """
+        Verify that depth is not limited by the recursion limit.
+        """
+        depth = 3 * sys.getrecursionlimit()
+        graph = nx.DiGraph()
+        graph.add_edges_from((i, i + 1) for i in range(depth))
+        nodes = list(DepthFirst.nodes(ChildOrder(graph, str)))
+        assert [(d, n) for (d, n, _, _) in nodes] == \
+           [(i, i) for i in range(depth + 1)]
+
+    def test_order(self):
+        """
+        Verify that children are sorted once, and that invalidating a node
+        reorders its parents' children.
+        """
+        calls = []
+
+        def key_func(node):
+            """
+            Count calls.
+            """
+            calls.append(node)
+            return keys[node]
+
+        keys = {'a' : 'a', 'b' : 'b', 'c' : 'c', 'd' : 'd'}
+        graph = nx.DiGraph()
+        graph.add_edges_from([('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd')])
+        order = ChildOrder(graph, key_func)
+
+        for _ in range(2):
+            assert [n for (_, n, _, _) in DepthFirst.nodes(order)] == \
+               ['a', 'b', 'd', 'c', 'd']
+        assert sorted(calls) == ['b', 'c']
+
+        keys['b'] = 'e'
+        order.invalidate(['b'])
+        assert [n for (_, n, _, _) in DepthFirst.nodes(order)] == \
+           ['a', 'c', 'd', 'b', 'd']
+
+        graph.remove_edge('a', 'c')
+        order.invalidate(['a'])
+        assert order.children('a') == (('b', True),)
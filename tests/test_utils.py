@@ -32,8 +32,14 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from hypothesis import assume
+from hypothesis import given
+from hypothesis import strategies
+
 import pydevDAG
 
+from printdevDAG._utils import GeneralUtils
+
 from ._constants import GRAPH
 
 class TestGraphUtils(object):
@@ -68,3 +74,48 @@ class TestGraphUtils(object):
            copy=False
         )
         assert graph.graph['reversed']
+
+
+class TestGeneralUtils(object):
+    """
+    Test general purpose utilities.
+    """
+
+    def test_composer(self):
+        """
+        Verify that the composer stops at the first value that is not None.
+        """
+        def fail(_):
+            """
+            Fail if called.
+            """
+            assert False
+
+        func = GeneralUtils.composer([lambda n: None, lambda n: n, fail])
+        assert func(2) == 2
+        assert GeneralUtils.composer([])(2) is None
+
+    @given(
+       strategies.dictionaries(
+          strategies.text(),
+          strategies.lists(
+             strategies.one_of(strategies.none(), strategies.integers())
+          )
+       )
+    )
+    def test_extractor(self, table):
+        """
+        Verify that an extractor yields the same values as the composer.
+        """
+        assume('missing' not in table)
+        funcs = dict(
+           (k, [(lambda n, v=v: v) for v in values]) \
+              for (k, values) in table.items()
+        )
+        keys = list(table.keys()) + ['missing']
+        row = GeneralUtils.extractor(keys, funcs)(None)
+        assert sorted(row.keys()) == sorted(keys)
+        assert row['missing'] is None
+        assert all(
+           row[k] == GeneralUtils.composer(funcs[k])(None) for k in funcs
+        )